@@ -0,0 +1,102 @@
+"""
+Markdown渲染性能对比
+比较原来的多次正则替换实现与单遍渲染器在大段回答上的耗时：
+- 一次性渲染完整回答
+- 流式渲染：原实现只能在每个块到达后重新渲染已收到的全部文本，单遍渲染器只渲染新完成的行
+
+用法: python benchmarks/markdown_bench.py [--size 64000] [--repeat 20] [--chunk 64]
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.markdown import MarkdownRenderer, render_markdown
+
+
+def legacy_process_markdown(text):
+    """原来的实现：六次正则替换"""
+    result = text
+    result = re.sub(r'^### (.+)$', r'<h3><strong>\1</strong></h3>', result, flags=re.MULTILINE)
+    result = re.sub(r'^## (.+)$', r'<h2><strong>\1</strong></h2>', result, flags=re.MULTILINE)
+    result = re.sub(r'^# (.+)$', r'<h1><strong>\1</strong></h1>', result, flags=re.MULTILINE)
+    result = re.sub(r'\*\*\[([^\]]+)\]\(([^)]+)\)\*\*', r'<strong><a href="\2" target="_blank">\1</a></strong>', result)
+    result = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2" target="_blank">\1</a>', result)
+    result = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', result)
+    result = result.replace('\n', '<br>')
+    return result
+
+
+def build_answer(size):
+    """生成与模型回答结构相近的Markdown文本（标题、仓库列表、链接、粗体、代码块）"""
+    section = (
+        "### 🔥 热门仓库推荐\n"
+        "\n"
+        "1. **[owner/project](https://github.com/owner/project)** - ⭐ 12,345 stars\n"
+        "   - 描述：一个用于构建 <Web> 应用的高性能框架 & 工具集\n"
+        "   - 语言：**Python**，最近更新：2024-05-01\n"
+        "2. **[another/repo](https://github.com/another/repo)** - ⭐ 6,789 stars\n"
+        "\n"
+        "安装示例：\n"
+        "```bash\n"
+        "pip install project && project --help\n"
+        "```\n"
+        "这些仓库都适合入门，可以先阅读 `README.md` 再查看 [文档](https://example.com/docs)。\n"
+        "\n"
+    )
+    return section * (size // len(section.encode("utf-8")) + 1)
+
+
+def legacy_streaming(text, chunk_size):
+    html = ""
+    for i in range(0, len(text), chunk_size):
+        html = legacy_process_markdown(text[:i + chunk_size])
+    return html
+
+
+def render_streaming(text, chunk_size):
+    renderer = MarkdownRenderer()
+    parts = [renderer.feed(text[i:i + chunk_size]) for i in range(0, len(text), chunk_size)]
+    parts.append(renderer.close())
+    return "".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Markdown渲染性能对比")
+    parser.add_argument("--size", type=int, default=64_000, help="回答大小（字节）")
+    parser.add_argument("--repeat", type=int, default=20, help="每种实现的重复次数")
+    parser.add_argument("--chunk", type=int, default=64, help="流式渲染时每块的字符数")
+    args = parser.parse_args()
+
+    text = build_answer(args.size)
+    print(f"回答大小: {len(text.encode('utf-8')) / 1024:.1f} KB, {text.count(chr(10))} 行")
+
+    # 流式渲染与一次性渲染的结果必须一致
+    assert render_streaming(text, args.chunk) == render_markdown(text)
+
+    groups = [
+        ("一次性渲染", [
+            ("regex chain (legacy)", lambda: legacy_process_markdown(text), args.repeat),
+            ("single pass", lambda: render_markdown(text), args.repeat),
+        ]),
+        (f"流式渲染（每块{args.chunk}字符）", [
+            # 原实现每块都要重新渲染全部文本，耗时随长度平方增长，只跑少量次数
+            ("regex chain, re-render (legacy)", lambda: legacy_streaming(text, args.chunk), 3),
+            ("incremental", lambda: render_streaming(text, args.chunk), args.repeat),
+        ]),
+    ]
+    for title, cases in groups:
+        print(title)
+        baseline = None
+        for name, func, repeat in cases:
+            best = min(timeit.repeat(func, number=1, repeat=repeat))
+            baseline = baseline or best
+            print(f"  {name:<34} {best * 1000:9.2f} ms  ({best / baseline:.3f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+仓库记录内存对比
+比较缓存原始dict与紧凑记录（Repository）时每个仓库占用的内存和解析耗时。
+测试数据按GitHub搜索API的真实结构生成（约100个字段，其中大部分是URL模板）。
+
+用法: python benchmarks/models_bench.py [--repos 10000] [--per-page 100]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models import parse_payload
+
+_URL_FIELDS = (
+    "forks", "keys", "collaborators", "teams", "hooks", "issue_events", "events", "assignees", "branches",
+    "tags", "blobs", "git_tags", "git_refs", "trees", "statuses", "languages", "stargazers", "contributors",
+    "subscribers", "subscription", "commits", "git_commits", "comments", "issue_comment", "contents",
+    "compare", "merges", "archive", "downloads", "issues", "pulls", "milestones", "notifications", "labels",
+    "releases", "deployments",
+)
+_OWNER_URL_FIELDS = (
+    "followers", "following", "gists", "starred", "subscriptions", "organizations", "repos", "events",
+    "received_events",
+)
+
+
+def build_repository(index: int) -> dict:
+    """生成一条与 search/repositories 结果结构相同的仓库"""
+    owner, name = f"owner{index % 997}", f"project-{index}"
+    api_url = f"https://api.github.com/repos/{owner}/{name}"
+    repo = {
+        "id": 100000 + index, "node_id": f"R_kgDO{index:08d}", "name": name, "full_name": f"{owner}/{name}",
+        "private": False,
+        "owner": {
+            "login": owner, "id": index % 997, "node_id": f"U_kgDO{index % 997:08d}",
+            "avatar_url": f"https://avatars.githubusercontent.com/u/{index % 997}?v=4", "gravatar_id": "",
+            "url": f"https://api.github.com/users/{owner}", "html_url": f"https://github.com/{owner}",
+            **{f"{field}_url": f"https://api.github.com/users/{owner}/{field}" for field in _OWNER_URL_FIELDS},
+            "type": "User", "user_view_type": "public", "site_admin": False,
+        },
+        "html_url": f"https://github.com/{owner}/{name}",
+        "description": f"Project {index}: a fast, extensible toolkit for building web services",
+        "fork": False, "url": api_url,
+    }
+    repo.update({f"{field}_url": f"{api_url}/{field}{{/id}}" for field in _URL_FIELDS})
+    repo.update({
+        "created_at": "2019-03-01T08:00:00Z", "updated_at": "2026-09-30T12:00:00Z",
+        "pushed_at": "2026-09-30T11:00:00Z", "git_url": f"git://github.com/{owner}/{name}.git",
+        "ssh_url": f"git@github.com:{owner}/{name}.git", "clone_url": f"https://github.com/{owner}/{name}.git",
+        "svn_url": f"https://github.com/{owner}/{name}", "homepage": f"https://{name}.dev", "size": index * 7,
+        "stargazers_count": index * 13 % 50000, "watchers_count": index * 13 % 50000, "language": "Python",
+        "has_issues": True, "has_projects": True, "has_downloads": True, "has_wiki": True, "has_pages": False,
+        "has_discussions": False, "forks_count": index % 500, "mirror_url": None, "archived": False,
+        "disabled": False, "open_issues_count": index % 40,
+        "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT",
+                    "url": "https://api.github.com/licenses/mit", "node_id": "MDc6TGljZW5zZTEz"},
+        "allow_forking": True, "is_template": False, "web_commit_signoff_required": False,
+        "topics": ["python", "web", f"topic{index % 50}"], "visibility": "public", "forks": index % 500,
+        "open_issues": index % 40, "watchers": index * 13 % 50000, "default_branch": "main", "score": 1.0,
+    })
+    return repo
+
+
+def measure(bodies, parse):
+    """返回 (每个仓库占用的字节数, 每个仓库的解析耗时)"""
+    started = time.perf_counter()
+    tracemalloc.start()
+    kept = [parse(body) for body in bodies]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    elapsed = time.perf_counter() - started
+
+    # tracemalloc会拖慢解析，耗时单独再测一次
+    started = time.perf_counter()
+    kept = [parse(body) for body in bodies]
+    elapsed = min(elapsed, time.perf_counter() - started)
+    return size, elapsed, kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=10000, help="仓库总数")
+    parser.add_argument("--per-page", type=int, default=100, help="每个搜索响应包含的仓库数")
+    args = parser.parse_args()
+
+    pages = max(1, args.repos // args.per_page)
+    bodies = [
+        json.dumps({"total_count": args.repos, "incomplete_results": False,
+                    "items": [build_repository(page * args.per_page + i) for i in range(args.per_page)]}).encode()
+        for page in range(pages)
+    ]
+    count = pages * args.per_page
+    print(f"{count} 个仓库, 每个约 {len(bodies[0]) / args.per_page / 1024:.1f} KB JSON")
+
+    cases = [
+        ("raw dict (legacy)", json.loads),
+        ("Repository records", lambda body: parse_payload("search/repositories", json.loads(body))),
+    ]
+    baseline = None
+    results = []
+    for name, parse in cases:
+        size, elapsed, kept = measure(bodies, parse)
+        results.append(kept)
+        baseline = baseline or size
+        print(f"  {name:<20} {size / count:8.0f} B/仓库  ({baseline / size:.1f}x)  "
+              f"解析 {elapsed / count * 1e6:6.1f} us/仓库")
+
+    # 原始数据必须可以无损取回
+    original, records = results
+    assert all(record.raw == item for page, parsed in zip(original, records)
+               for item, record in zip(page["items"], parsed["items"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,31 +7,57 @@ FastMCP GitHub Assistant - 使用FastMCP框架的智能GitHub助手
 
 import sys
 import json
-import re
+import asyncio
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI, Form
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Form, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 import uvicorn
-import aiohttp
-from typing import Optional
+from typing import List, Optional
 
 # 添加src目录到Python路径
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
 from fastmcp import FastMCP
+from src.completion_cache import CompletionCache
+from src.compression import CompressionMiddleware
+from src.deepseek_client import DeepseekClient
 from src.github_client import GitHubClient
+from src.http_cache import REVALIDATE, asset_response
+from src.tool_cache import ErrorResult, cached_tool
+from src.trending import TRENDING_PERIODS, TrendingStore
 from src.config import config
 from src.utils.logger import app_logger
-
-# 创建FastMCP实例
-mcp = FastMCP("GitHub智能助手")
+from src.utils.markdown import MarkdownRenderer, render_markdown
+from src.utils.templates import StaticAsset
 
 # 创建GitHub客户端实例
 github_client = GitHubClient()
 
+# 热门趋势快照（后台定时刷新）
+trending_store = TrendingStore(github_client)
+
+@asynccontextmanager
+async def mcp_lifespan(server):
+    """MCP模式生命周期 - 启动趋势快照刷新，退出时释放连接池"""
+    trending_store.start()
+    try:
+        yield {}
+    finally:
+        await trending_store.stop()
+        await github_client.close()
+
+# 创建FastMCP实例
+mcp = FastMCP("GitHub智能助手", lifespan=mcp_lifespan)
+
+# 创建Deepseek客户端实例（所有对话共享连接池和并发上限）
+deepseek_client = DeepseekClient()
+
 # ============ GitHub工具函数定义 ============
 
+@cached_tool(ttl=config.TOOL_CACHE_TTL_SEARCH)
 async def search_github_repositories_impl(query: str, language: Optional[str] = None, 
                               sort: str = "stars", limit: int = 8) -> str:
     """搜索GitHub仓库工具
@@ -50,11 +76,11 @@ async def search_github_repositories_impl(query: str, language: Optional[str] =
     try:
         # 输入验证
         if not query or not query.strip():
-            return "❌ 搜索关键词不能为空"
+            return ErrorResult("❌ 搜索关键词不能为空")
         
         query = query.strip()
         if len(query) > 256:
-            return "❌ 搜索关键词过长，请限制在256字符以内"
+            return ErrorResult("❌ 搜索关键词过长，请限制在256字符以内")
         
         app_logger.info(f"🔍 搜索GitHub仓库: {query}")
         
@@ -67,7 +93,7 @@ async def search_github_repositories_impl(query: str, language: Optional[str] =
         )
         
         if not repositories:
-            return f"❌ 未找到与 '{query}' 匹配的仓库"
+            return ErrorResult(f"❌ 未找到与 '{query}' 匹配的仓库")
         
         # 格式化搜索结果
         result_lines = [f"🔍 找到 {len(repositories)} 个相关仓库:\n"]
@@ -89,8 +115,9 @@ async def search_github_repositories_impl(query: str, language: Optional[str] =
         
     except Exception as e:
         app_logger.error(f"❌ 搜索仓库失败: {str(e)}")
-        return f"❌ 搜索失败: {str(e)}"
+        return ErrorResult(f"❌ 搜索失败: {str(e)}")
 
+@cached_tool(ttl=config.TOOL_CACHE_TTL_REPO)
 async def get_repository_details_impl(owner: str, repo: str) -> str:
     """获取仓库详细信息工具
     
@@ -106,16 +133,16 @@ async def get_repository_details_impl(owner: str, repo: str) -> str:
     try:
         # 输入验证
         if not owner or not owner.strip():
-            return "❌ 仓库所有者不能为空"
+            return ErrorResult("❌ 仓库所有者不能为空")
         if not repo or not repo.strip():
-            return "❌ 仓库名称不能为空"
+            return ErrorResult("❌ 仓库名称不能为空")
         
         owner = owner.strip()
         repo = repo.strip()
         
         # GitHub用户名和仓库名的基本限制
         if len(owner) > 39 or len(repo) > 100:
-            return "❌ 用户名或仓库名过长"
+            return ErrorResult("❌ 用户名或仓库名过长")
         
         app_logger.info(f"📦 获取仓库详情: {owner}/{repo}")
         
@@ -142,8 +169,9 @@ async def get_repository_details_impl(owner: str, repo: str) -> str:
         
     except Exception as e:
         app_logger.error(f"❌ 获取仓库详情失败: {str(e)}")
-        return f"❌ 获取仓库 {owner}/{repo} 的详情失败: {str(e)}"
+        return ErrorResult(f"❌ 获取仓库 {owner}/{repo} 的详情失败: {str(e)}")
 
+@cached_tool(ttl=config.TOOL_CACHE_TTL_USERS)
 async def search_github_users_impl(query: str, user_type: Optional[str] = None) -> str:
     """搜索GitHub用户工具
     
@@ -159,11 +187,11 @@ async def search_github_users_impl(query: str, user_type: Optional[str] = None)
     try:
         # 输入验证
         if not query or not query.strip():
-            return "❌ 用户名搜索关键词不能为空"
+            return ErrorResult("❌ 用户名搜索关键词不能为空")
         
         query = query.strip()
         if len(query) > 256:
-            return "❌ 搜索关键词过长，请限制在256字符以内"
+            return ErrorResult("❌ 搜索关键词过长，请限制在256字符以内")
         
         app_logger.info(f"👤 搜索GitHub用户: {query}")
         
@@ -205,7 +233,7 @@ async def search_github_users_impl(query: str, user_type: Optional[str] = None)
         users = await github_client.search_users(query=query, type=user_type)
         
         if not users:
-            return f"❌ 未找到与 '{query}' 匹配的用户"
+            return ErrorResult(f"❌ 未找到与 '{query}' 匹配的用户")
         
         # 格式化搜索结果
         result_lines = [f"👥 找到 {len(users)} 个相关用户:\n"]
@@ -224,8 +252,9 @@ async def search_github_users_impl(query: str, user_type: Optional[str] = None)
         
     except Exception as e:
         app_logger.error(f"❌ 搜索用户失败: {str(e)}")
-        return f"❌ 搜索用户失败: {str(e)}"
+        return ErrorResult(f"❌ 搜索用户失败: {str(e)}")
 
+@cached_tool(ttl=config.TOOL_CACHE_TTL_TRENDING)
 async def get_trending_repositories_impl(language: Optional[str] = None, period: str = "daily") -> str:
     """获取GitHub热门趋势仓库工具
     
@@ -241,49 +270,26 @@ async def get_trending_repositories_impl(language: Optional[str] = None, period:
     try:
         # 输入验证
         if language and len(language.strip()) > 50:
-            return "❌ 编程语言名称过长"
+            return ErrorResult("❌ 编程语言名称过长")
         
         if period not in ["daily", "weekly", "monthly"]:
-            return "❌ 时间周期只能是 daily、weekly 或 monthly"
+            return ErrorResult("❌ 时间周期只能是 daily、weekly 或 monthly")
         
         app_logger.info(f"🔥 获取热门仓库: language={language}, period={period}")
         
-        # 根据时间范围构造更合理的趋势查询
-        import datetime
-        
-        # 构造查询：获取最近一段时间内有一定活跃度的高星仓库
-        if period == "daily":
-            # 今日趋势：最近7天更新过且星数较高的仓库
-            date_filter = (datetime.datetime.now() - datetime.timedelta(days=7)).strftime('%Y-%m-%d')
-            query = f"pushed:>{date_filter} stars:>50"
-            period_desc = "最近7天活跃"
-        elif period == "weekly":
-            # 周趋势：最近30天创建或更新的高星仓库
-            date_filter = (datetime.datetime.now() - datetime.timedelta(days=30)).strftime('%Y-%m-%d')
-            query = f"created:>{date_filter} stars:>10"
-            period_desc = "最近30天"
-        else:  # monthly
-            # 月趋势：最近90天创建的热门仓库
-            date_filter = (datetime.datetime.now() - datetime.timedelta(days=90)).strftime('%Y-%m-%d')
-            query = f"created:>{date_filter} stars:>5"
-            period_desc = "最近90天"
-        
-        app_logger.info(f"趋势查询: {query}")
-        
-        # 调用搜索仓库功能
-        repositories = await github_client.search_repositories(
-            query=query,
-            language=language,
-            sort="stars",
-            order="desc",
-            per_page=10
-        )
+        # 优先读取后台预计算的快照，缺失或过期时才发起搜索
+        snapshot = await trending_store.fetch(language, period)
+        repositories = snapshot.repositories
+        period_desc = TRENDING_PERIODS[period][3]
         
         if not repositories:
-            return f"❌ 未找到 {language or '所有语言'} 的{period_desc}热门仓库"
+            return ErrorResult(f"❌ 未找到 {language or '所有语言'} 的{period_desc}热门仓库")
         
         # 格式化趋势仓库结果
-        result_lines = [f"🔥 找到 {len(repositories)} 个{language or '全部语言'}{period_desc}热门仓库:\n"]
+        result_lines = [
+            f"🔥 找到 {len(repositories)} 个{language or '全部语言'}{period_desc}热门仓库"
+            f"（数据更新于 {snapshot.updated_at()}）:\n"
+        ]
         
         for i, repo in enumerate(repositories, 1):
             stars = repo.get('stargazers_count', 0)
@@ -305,7 +311,62 @@ async def get_trending_repositories_impl(language: Optional[str] = None, period:
         
     except Exception as e:
         app_logger.error(f"❌ 获取热门仓库失败: {str(e)}")
-        return f"❌ 获取热门仓库失败: {str(e)}"
+        return ErrorResult(f"❌ 获取热门仓库失败: {str(e)}")
+
+@cached_tool(ttl=config.TOOL_CACHE_TTL_REPO)
+async def compare_repositories_impl(repositories: List[str]) -> str:
+    """对比多个GitHub仓库工具
+    
+    批量获取多个仓库的关键指标，按星标数排序后对比展示。
+    
+    Args:
+        repositories: 仓库列表，格式为 owner/repo
+    
+    Returns:
+        仓库对比结果
+    """
+    try:
+        # 输入验证
+        if not repositories:
+            return ErrorResult("❌ 仓库列表不能为空")
+        if len(repositories) > 50:
+            return ErrorResult("❌ 一次最多对比50个仓库")
+        
+        app_logger.info(f"📊 对比仓库: {len(repositories)} 个")
+        
+        # 批量获取：缓存命中的立即返回，其余通过GraphQL批量或有限并发获取
+        found = []
+        failed = []
+        async for item in github_client.get_repositories_info(repositories):
+            if item["data"]:
+                found.append(item["data"])
+            else:
+                failed.append(f"{item['repo']}（{item['error']}）")
+        
+        if not found:
+            return ErrorResult(f"❌ 未能获取任何仓库信息: {'; '.join(failed)}")
+        
+        found.sort(key=lambda repo: repo.get('stargazers_count', 0), reverse=True)
+        result_lines = [f"📊 对比 {len(found)} 个仓库（按星标排序）:\n"]
+        
+        for i, repo in enumerate(found, 1):
+            license_info = repo.get('license') or {}
+            pushed = (repo.get('pushed_at') or '')[:10] or '未知'
+            result_lines.append(
+                f"**{i}. {repo['full_name']}** ⭐ {repo.get('stargazers_count', 0):,}\n"
+                f"   🍴 {repo.get('forks_count', 0):,} forks | 🐛 {repo.get('open_issues_count', 0):,} 开放议题\n"
+                f"   💻 {repo.get('language') or '未知'} | 📄 {license_info.get('name') or '无许可证'} | 📅 最近推送: {pushed}\n"
+                f"   📝 {repo.get('description') or '无描述'}\n"
+            )
+        
+        if failed:
+            result_lines.append(f"⚠️ 以下仓库获取失败: {'; '.join(failed)}")
+        
+        return "\n".join(result_lines)
+        
+    except Exception as e:
+        app_logger.error(f"❌ 对比仓库失败: {str(e)}")
+        return ErrorResult(f"❌ 对比仓库失败: {str(e)}")
 
 # ============ FastMCP 工具装饰器版本 ============
 
@@ -330,6 +391,11 @@ async def get_trending_repositories(language: Optional[str] = None, period: str
     """获取GitHub热门趋势仓库工具 - FastMCP版本"""
     return await get_trending_repositories_impl(language, period)
 
+@mcp.tool()
+async def compare_repositories(repositories: List[str]) -> str:
+    """对比多个GitHub仓库工具 - FastMCP版本"""
+    return await compare_repositories_impl(repositories)
+
 # ============ AI助手类（集成Deepseek AI） ============
 
 class FastMCPGitHubAssistant:
@@ -434,52 +500,96 @@ class FastMCPGitHubAssistant:
                         "required": []
                     }
                 }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "compare_repositories",
+                    "description": "对比多个GitHub仓库工具。一次获取多个仓库的星标、分叉、议题、语言、许可证和最近推送时间，适合项目选型对比。",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "repositories": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "要对比的仓库列表，格式为 owner/repo，如 ['pallets/flask', 'django/django']"
+                            }
+                        },
+                        "required": ["repositories"]
+                    }
+                }
             }
         ]
+
+        # 模型参数（参与回答缓存的键计算）
+        self.model_params = {
+            "model": "deepseek-chat",
+            "max_tokens": 2000,
+            "temperature": 0.7
+        }
+
+        # AI回答缓存：相同（或足够相似）的提问直接复用之前的回答，跳过模型和工具调用
+        self.completion_cache = CompletionCache()
     
     def process_markdown(self, text):
-        """在Python端处理Markdown格式"""
-        result = text
-        
-        # 处理标题
-        result = re.sub(r'^### (.+)$', r'<h3><strong>\1</strong></h3>', result, flags=re.MULTILINE)
-        result = re.sub(r'^## (.+)$', r'<h2><strong>\1</strong></h2>', result, flags=re.MULTILINE)
-        result = re.sub(r'^# (.+)$', r'<h1><strong>\1</strong></h1>', result, flags=re.MULTILINE)
-        
-        # 处理粗体链接 **[text](url)**
-        result = re.sub(r'\*\*\[([^\]]+)\]\(([^)]+)\)\*\*', r'<strong><a href="\2" target="_blank">\1</a></strong>', result)
-        
-        # 处理普通链接 [text](url)
-        result = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2" target="_blank">\1</a>', result)
-        
-        # 处理粗体文本 **text**
-        result = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', result)
-        
-        # 处理换行
-        result = result.replace('\n', '<br>')
-        
-        return result
+        """在Python端处理Markdown格式（单遍渲染，内置HTML转义）"""
+        return render_markdown(text)
     
-    async def call_deepseek_with_tools(self, messages):
-        """调用Deepseek API，包含FastMCP工具定义"""
-        headers = config.get_deepseek_headers()
+    async def call_deepseek_with_tools(self, messages, tool_choice="auto"):
+        """调用Deepseek API，包含FastMCP工具定义（tool_choice为none时强制直接回答）"""
+        data = {
+            **self.model_params,
+            "messages": messages,
+            "tools": self.tools,
+            "tool_choice": tool_choice
+        }
+
+        return await deepseek_client.complete(data)
 
+    async def stream_deepseek_with_tools(self, messages, tool_choice="auto"):
+        """以流式方式调用Deepseek API，逐个产出SSE数据块（最后一个数据块包含usage）"""
         data = {
-            "model": "deepseek-chat",
+            **self.model_params,
             "messages": messages,
             "tools": self.tools,
-            "tool_choice": "auto",
-            "max_tokens": 2000,
-            "temperature": 0.7
+            "tool_choice": tool_choice,
+            "stream_options": {"include_usage": True}
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(config.DEEPSEEK_API_URL, headers=headers, json=data) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"Deepseek API调用失败: {response.status} - {error_text}")
+        async for chunk in deepseek_client.stream(data):
+            yield chunk
+
+    async def _stream_round(self, messages, tool_choice, usage):
+        """流式执行一轮模型调用：转发文本增量，并按index拼接工具调用的增量片段
+        
+        产出 ("token", 文本) 事件，最后产出 ("message", 完整的assistant消息)。
+        """
+        content = []
+        tool_calls = {}
+        async for chunk in self.stream_deepseek_with_tools(messages, tool_choice):
+            if chunk.get("usage"):
+                usage["total_tokens"] = chunk["usage"].get("total_tokens", 0)
+            for choice in chunk.get("choices") or []:
+                delta = choice.get("delta") or {}
+                if delta.get("content"):
+                    content.append(delta["content"])
+                    yield "token", delta["content"]
+                for part in delta.get("tool_calls") or []:
+                    call = tool_calls.setdefault(part.get("index", 0), {
+                        "id": "",
+                        "type": "function",
+                        "function": {"name": "", "arguments": ""}
+                    })
+                    if part.get("id"):
+                        call["id"] = part["id"]
+                    function = part.get("function") or {}
+                    call["function"]["name"] += function.get("name") or ""
+                    call["function"]["arguments"] += function.get("arguments") or ""
+
+        message = {"role": "assistant", "content": "".join(content)}
+        if tool_calls:
+            message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+        yield "message", message
 
     async def execute_fastmcp_tool_call(self, tool_call):
         """执行FastMCP工具调用 - 桥接到FastMCP装饰器函数"""
@@ -532,6 +642,15 @@ class FastMCPGitHubAssistant:
                     "success": True,
                     "data": result
                 }
+                
+            elif function_name == "compare_repositories":
+                result = await compare_repositories_impl(
+                    repositories=arguments["repositories"]
+                )
+                return {
+                    "success": True,
+                    "data": result
+                }
             else:
                 return {
                     "success": False,
@@ -545,8 +664,57 @@ class FastMCPGitHubAssistant:
                 "error": str(e)
             }
 
+    async def execute_tool_calls(self, tool_calls, timeout=None, on_result=None):
+        """并行执行多个工具调用 - 限制并发数和单个工具耗时，结果保持原始顺序
+        
+        on_result(index, tool_call, result, elapsed) 在每个工具完成时回调，用于推送进度。
+        """
+        semaphore = asyncio.Semaphore(config.AI_TOOL_CONCURRENCY)
+        if timeout is None:
+            timeout = config.AI_TOOL_TIMEOUT
+        
+        async def run_tool(index, tool_call):
+            async with semaphore:
+                app_logger.info(f"🔨 执行FastMCP工具: {tool_call['function']['name']}")
+                tool_started = time.monotonic()
+                try:
+                    tool_result = await asyncio.wait_for(
+                        self.execute_fastmcp_tool_call(tool_call),
+                        timeout=timeout
+                    )
+                except asyncio.TimeoutError:
+                    app_logger.error(f"❌ FastMCP工具执行超时: {tool_call['function']['name']}")
+                    tool_result = {
+                        "success": False,
+                        "error": f"工具执行超时（{timeout:.0f}秒）"
+                    }
+                except Exception as e:
+                    app_logger.error(f"❌ FastMCP工具执行失败: {str(e)}")
+                    tool_result = {
+                        "success": False,
+                        "error": str(e)
+                    }
+                app_logger.info(f"✅ FastMCP工具执行完成，结果长度: {len(str(tool_result))}")
+                if on_result is not None:
+                    on_result(index, tool_call, tool_result, time.monotonic() - tool_started)
+                return tool_result
+        
+        return await asyncio.gather(*[run_tool(i, tool_call) for i, tool_call in enumerate(tool_calls)])
+
     async def chat(self, user_message):
-        """处理聊天请求 - 使用FastMCP工具的AI对话"""
+        """处理聊天请求 - 使用FastMCP工具的AI对话，返回完整结果"""
+        result = None
+        async for event, data in self.converse(user_message):
+            if event == "done":
+                result = data
+        return result
+
+    async def converse(self, user_message, stream=False):
+        """多轮工具调用对话，以 (事件名, 数据) 的形式产出进度
+        
+        事件包括 token（文本增量，仅流式模式）、tool_start、tool_end、round 和最终的 done。
+        stream为True时使用Deepseek流式接口，逐个转发模型生成的文本。
+        """
         # 初始消息
         messages = [
             {
@@ -557,16 +725,19 @@ class FastMCPGitHubAssistant:
 2. get_repository_details - 获取仓库详细信息（需要用户名和仓库名）
 3. search_github_users - 搜索GitHub用户和组织
 4. get_trending_repositories - 获取热门趋势仓库
+5. compare_repositories - 一次性对比多个仓库的关键指标（需要 owner/repo 列表）
 
 处理用户查询的策略：
 - 如果用户询问特定用户的特定项目，优先使用get_repository_details工具
 - 如果用户询问某类项目的推荐，使用search_github_repositories
 - 如果用户询问某个用户的信息，使用search_github_users
 - 如果用户询问热门或趋势项目，使用get_trending_repositories
+- 如果用户要对比多个项目，使用compare_repositories一次获取全部仓库，不要逐个调用get_repository_details
 
 重要提示：
 - 搜索时使用英文关键词效果更好
 - 可以根据用户需求调用多个工具获得更全面的结果
+- 可以根据上一轮工具结果继续调用工具（如先搜索仓库，再获取排名第一的仓库详情）
 - 必须先获取数据，再基于实际数据回答用户问题
 - 如果没有找到结果，要明确告知用户
 
@@ -575,64 +746,188 @@ class FastMCPGitHubAssistant:
             {"role": "user", "content": user_message}
         ]
 
-        # 第一次API调用
         app_logger.info(f"💬 用户消息: {user_message}")
-        response = await self.call_deepseek_with_tools(messages)
-        assistant_message = response["choices"][0]["message"]
 
-        # 检查是否有工具调用
-        tool_calls = assistant_message.get("tool_calls", [])
-        messages.append(assistant_message)
+        cached, match = self.completion_cache.get(messages, self.tools, self.model_params)
+        if cached is not None:
+            app_logger.info(f"♻️ 命中AI回答缓存（{match}）")
+            yield "done", {**cached, "stats": {**cached["stats"], "cached": match}}
+            return
+        initial_messages = list(messages)
 
-        # 执行FastMCP工具调用
-        if tool_calls:
-            app_logger.info(f"🔧 检测到 {len(tool_calls)} 个FastMCP工具调用")
-            
+        started = time.monotonic()
+        deadline = started + config.AI_CHAT_DEADLINE
+        all_tool_calls = []
+        rounds = []
+        tokens_used = 0
+        tool_rounds = 0
+        tool_failures = 0
+        stop_reason = "answered"
+
+        # 多轮工具调用：模型可以根据上一轮结果继续调用工具，直到不再需要工具或预算耗尽
+        while True:
+            budget_left = (
+                tool_rounds < config.AI_MAX_TOOL_ROUNDS
+                and tokens_used < config.AI_TOKEN_BUDGET
+                and time.monotonic() < deadline
+            )
+            if not budget_left and stop_reason == "answered":
+                if tool_rounds >= config.AI_MAX_TOOL_ROUNDS:
+                    stop_reason = "max_rounds"
+                elif tokens_used >= config.AI_TOKEN_BUDGET:
+                    stop_reason = "token_budget"
+                else:
+                    stop_reason = "deadline"
+                app_logger.info(f"⏹️ 工具调用预算耗尽（{stop_reason}），生成最终回答")
+
+            round_started = time.monotonic()
+            tool_choice = "auto" if budget_left else "none"
+            try:
+                if stream:
+                    usage = {}
+                    # 增量渲染：每个token事件附带新渲染部分的HTML和尚未渲染的字符数
+                    renderer = MarkdownRenderer()
+                    streamed_html = []
+                    async for kind, value in self._stream_round(messages, tool_choice, usage):
+                        if kind == "token":
+                            html = renderer.feed(value)
+                            streamed_html.append(html)
+                            yield "token", {"content": value, "html": html, "pending": renderer.pending_length}
+                        else:
+                            assistant_message = value
+                    tokens_used += usage.get("total_tokens", 0)
+                else:
+                    response = await self.call_deepseek_with_tools(messages, tool_choice=tool_choice)
+                    tokens_used += (response.get("usage") or {}).get("total_tokens", 0)
+                    assistant_message = response["choices"][0]["message"]
+            except Exception as e:
+                if not all_tool_calls:
+                    raise
+                app_logger.error(f"❌ 生成最终回答时出错: {str(e)}")
+                self._log_chat_stats(rounds, tokens_used, started, "error")
+                yield "done", {
+                    "message": f"FastMCP工具调用成功，但生成最终回答时出错: {str(e)}",
+                    "tool_calls": all_tool_calls,
+                    "conversation": messages,
+                    "stats": self._chat_stats(rounds, tokens_used, started, "error")
+                }
+                return
+
+            tool_calls = assistant_message.get("tool_calls") or []
+            messages.append(assistant_message)
+
+            # 没有工具调用（或预算已耗尽）时结束循环
+            if not tool_calls or not budget_left:
+                break
+
+            tool_rounds += 1
+            app_logger.info(f"🔧 第 {tool_rounds} 轮检测到 {len(tool_calls)} 个FastMCP工具调用")
             for tool_call in tool_calls:
-                app_logger.info(f"🔨 执行FastMCP工具: {tool_call['function']['name']}")
-                tool_result = await self.execute_fastmcp_tool_call(tool_call)
-                app_logger.info(f"✅ FastMCP工具执行完成，结果长度: {len(str(tool_result))}")
-                
+                yield "tool_start", {
+                    "round": tool_rounds,
+                    "name": tool_call["function"]["name"],
+                    "arguments": tool_call["function"]["arguments"]
+                }
+
+            # 相互独立的工具调用并行执行，耗时取决于最慢的一个；单个工具不会超出整体时限
+            # 每个工具完成时通过队列推送进度事件
+            progress = asyncio.Queue()
+            remaining = max(deadline - time.monotonic(), 1.0)
+            tools_task = asyncio.ensure_future(self.execute_tool_calls(
+                tool_calls,
+                timeout=min(config.AI_TOOL_TIMEOUT, remaining),
+                on_result=lambda index, tool_call, result, elapsed: progress.put_nowait({
+                    "round": tool_rounds,
+                    "name": tool_call["function"]["name"],
+                    "success": result.get("success", False),
+                    "elapsed": round(elapsed, 3)
+                })
+            ))
+            try:
+                while not tools_task.done() or not progress.empty():
+                    getter = asyncio.ensure_future(progress.get())
+                    await asyncio.wait({getter, tools_task}, return_when=asyncio.FIRST_COMPLETED)
+                    if getter.done():
+                        yield "tool_end", getter.result()
+                    else:
+                        getter.cancel()
+                tool_results = tools_task.result()
+            finally:
+                if not tools_task.done():
+                    tools_task.cancel()
+
+            for tool_call, tool_result in zip(tool_calls, tool_results):
+                if not tool_result.get("success"):
+                    tool_failures += 1
                 # 添加工具结果到消息历史
                 messages.append({
                     "role": "tool",
                     "tool_call_id": tool_call["id"],
                     "content": json.dumps(tool_result, ensure_ascii=False)
                 })
+            all_tool_calls.extend(tool_calls)
+            rounds.append({
+                "tools": [tool_call["function"]["name"] for tool_call in tool_calls],
+                "elapsed": round(time.monotonic() - round_started, 3)
+            })
+            yield "round", {"round": tool_rounds, **rounds[-1]}
+            app_logger.info("🤖 正在生成回答...")
 
-            # 再次调用API获取最终回答
-            app_logger.info("🤖 正在生成最终回答...")
-            try:
-                final_response = await self.call_deepseek_with_tools(messages)
-                final_message = final_response["choices"][0]["message"]["content"]
-                app_logger.info(f"✅ 最终回答生成成功，长度: {len(final_message)}")
-             
-                if not final_message or final_message.strip() == "":
-                    app_logger.info("❌ 警告：最终回答为空")
-                    final_message = "抱歉，我无法生成回答。请稍后重试。"
+        final_message = assistant_message.get("content") or ""
+        answered = bool(final_message.strip())
+        if not answered:
+            app_logger.info("❌ 警告：最终回答为空")
+            final_message = "抱歉，我无法生成回答。请稍后重试。"
+        else:
+            app_logger.info(f"✅ 最终回答生成成功，长度: {len(final_message)}")
 
-                return {
-                    "message": self.process_markdown(final_message),
-                    "tool_calls": tool_calls,
-                    "conversation": messages
-                }
-            except Exception as e:
-                app_logger.error(f"❌ 生成最终回答时出错: {str(e)}")
-                return {
-                    "message": f"FastMCP工具调用成功，但生成最终回答时出错: {str(e)}",
-                    "tool_calls": tool_calls,
-                    "conversation": messages
-                }
+        self._log_chat_stats(rounds, tokens_used, started, stop_reason)
+        if stream and answered and final_message == (assistant_message.get("content") or ""):
+            # 流式输出时最终回答已经逐行渲染过，只需渲染剩余部分
+            rendered = "".join(streamed_html) + renderer.close()
         else:
-            return {
-                "message": self.process_markdown(assistant_message["content"]),
-                "tool_calls": None,
-                "conversation": messages
-            }
+            rendered = self.process_markdown(final_message)
+        result = {
+            "message": rendered,
+            "tool_calls": all_tool_calls or None,
+            "conversation": messages,
+            "stats": self._chat_stats(rounds, tokens_used, started, stop_reason)
+        }
+        # 工具失败（如限流）时的回答不可靠，不写入缓存
+        if answered and not tool_failures:
+            self.completion_cache.set(initial_messages, self.tools, self.model_params, result)
+        yield "done", result
+
+    def _chat_stats(self, rounds, tokens_used, started, stop_reason):
+        """汇总一次对话的工具轮数、token用量和耗时"""
+        return {
+            "tool_rounds": len(rounds),
+            "rounds": rounds,
+            "tokens": tokens_used,
+            "elapsed": round(time.monotonic() - started, 3),
+            "stop_reason": stop_reason
+        }
+
+    def _log_chat_stats(self, rounds, tokens_used, started, stop_reason):
+        app_logger.info(
+            f"📊 对话完成: {len(rounds)} 轮工具调用, {tokens_used} tokens, "
+            f"耗时 {time.monotonic() - started:.2f}s, 结束原因: {stop_reason}"
+        )
 
 # ============ FastAPI Web界面（AI对话版） ============
 
-app = FastAPI(title="FastMCP GitHub Assistant")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期 - 启动趋势快照刷新，关闭时释放GitHub和Deepseek客户端的连接池"""
+    trending_store.start()
+    yield
+    await trending_store.stop()
+    await github_client.close()
+    await deepseek_client.close()
+
+app = FastAPI(title="FastMCP GitHub Assistant", lifespan=lifespan)
+# 压缩HTML和JSON响应（SSE流不压缩）
+app.add_middleware(CompressionMiddleware)
 
 def get_web_interface():
     """生成AI对话Web界面HTML"""
@@ -754,6 +1049,16 @@ def get_web_interface():
                 border-bottom-left-radius: 5px;
             }
             
+            .stream-text {
+                white-space: pre-wrap;
+            }
+            
+            .tool-progress {
+                color: #667eea;
+                font-size: 0.85em;
+                margin-top: 6px;
+            }
+            
             .tools-used {
                 background: rgba(102, 126, 234, 0.05);
                 margin-top: 10px;
@@ -1139,18 +1444,84 @@ async function submitMessage() {
     input.value = '';
     showLoading(true);
 
+    let messageDiv = null;
+    let text = '';
+    let html = '';
+    let finished = false;
+
+    // 流式接收回答：已渲染的部分显示服务端增量渲染的HTML，其余部分按纯文本显示，
+    // done事件替换为渲染后的完整回答
+    function ensureMessage() {
+        if (!messageDiv) {
+            showLoading(false);
+            messageDiv = addMessage('', 'assistant');
+            messageDiv.innerHTML = '<div class="stream-text"></div><div class="tool-progress"></div>';
+        }
+        return messageDiv;
+    }
+
+    function handleEvent(event, data) {
+        const messages = document.getElementById('messages');
+        if (event === 'token') {
+            text += data.content;
+            html += data.html || '';
+            const streamText = ensureMessage().querySelector('.stream-text');
+            streamText.innerHTML = html;
+            streamText.appendChild(document.createTextNode(lastCodePoints(text, data.pending || 0)));
+        } else if (event === 'tool_start') {
+            const line = document.createElement('div');
+            line.textContent = `🔨 正在执行 ${data.name}...`;
+            ensureMessage().querySelector('.tool-progress').appendChild(line);
+        } else if (event === 'tool_end') {
+            const line = document.createElement('div');
+            line.textContent = `${data.success ? '✅' : '❌'} ${data.name} 完成 (${data.elapsed}s)`;
+            ensureMessage().querySelector('.tool-progress').appendChild(line);
+            text = '';
+            html = '';
+        } else if (event === 'done') {
+            finished = true;
+            renderMessage(ensureMessage(), data.message, data.tool_calls);
+        } else if (event === 'error') {
+            finished = true;
+            renderMessage(ensureMessage(), data.message);
+        }
+        messages.scrollTop = messages.scrollHeight;
+    }
+
     try {
-        const response = await fetch('/chat', {
+        const response = await fetch('/chat/stream', {
             method: 'POST',
             headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
             body: 'message=' + encodeURIComponent(message)
         });
 
-        if (response.ok) {
-            const result = await response.json();
-            addMessage(result.message, 'assistant', result.tool_calls);
-        } else {
+        if (!response.ok || !response.body) {
             addMessage('抱歉，发生了错误，请稍后重试。', 'assistant');
+            return;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\\n\\n')) !== -1) {
+                const block = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                let event = 'message';
+                let data = '';
+                for (const line of block.split('\\n')) {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                }
+                if (data) handleEvent(event, JSON.parse(data));
+            }
+        }
+        if (!finished) {
+            renderMessage(ensureMessage(), html || '抱歉，连接意外中断，请稍后重试。');
         }
     } catch (error) {
         console.error('Error:', error);
@@ -1160,11 +1531,28 @@ async function submitMessage() {
     }
 }
 
+// 取字符串末尾的n个字符（按码点计数，与服务端的字符数一致）
+function lastCodePoints(str, n) {
+    let i = str.length;
+    while (n > 0 && i > 0) {
+        const code = str.charCodeAt(i - 1);
+        i -= (code >= 0xDC00 && code <= 0xDFFF && i > 1) ? 2 : 1;
+        n--;
+    }
+    return str.slice(i);
+}
+
 function addMessage(content, sender, toolCalls) {
     const messages = document.getElementById('messages');
     const messageDiv = document.createElement('div');
     messageDiv.className = `message ${sender}-message`;
-    
+    renderMessage(messageDiv, content, toolCalls);
+    messages.appendChild(messageDiv);
+    messages.scrollTop = messages.scrollHeight;
+    return messageDiv;
+}
+
+function renderMessage(messageDiv, content, toolCalls) {
     let html = `<div>${content}</div>`;
     
     if (toolCalls && toolCalls.length > 0) {
@@ -1194,8 +1582,6 @@ function addMessage(content, sender, toolCalls) {
     }
     
     messageDiv.innerHTML = html;
-    messages.appendChild(messageDiv);
-    messages.scrollTop = messages.scrollHeight;
 }
 
 function toggleTools(toolsId) {
@@ -1231,10 +1617,13 @@ function showLoading(show) {
     """
     return html_content
 
+# 对话界面内容固定，启动时生成并压缩一次
+WEB_INTERFACE = StaticAsset("index.html", get_web_interface(), "text/html; charset=utf-8")
+
 @app.get("/", response_class=HTMLResponse)
-async def index():
+async def index(request: Request):
     """主页面 - AI对话界面"""
-    return get_web_interface()
+    return asset_response(WEB_INTERFACE, request, REVALIDATE)
 
 @app.post("/chat")
 async def chat(message: str = Form(...)):
@@ -1244,7 +1633,8 @@ async def chat(message: str = Form(...)):
         return {
             "success": True,
             "message": result["message"],
-            "tool_calls": result["tool_calls"]
+            "tool_calls": result["tool_calls"],
+            "stats": result["stats"]
         }
     except Exception as e:
         app_logger.error(f"❌ FastMCP聊天处理失败: {str(e)}")
@@ -1254,6 +1644,31 @@ async def chat(message: str = Form(...)):
             "tool_calls": None
         }
 
+def format_sse(event, data):
+    """编码一条Server-Sent Events消息"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream(message: str = Form(...)):
+    """流式聊天 - 通过SSE推送模型生成的文本和工具执行进度"""
+    async def event_source():
+        # 立即发送首个事件，浏览器无需等待模型响应即可收到数据
+        yield format_sse("start", {})
+        try:
+            async for event, data in assistant.converse(message, stream=True):
+                if event == "done":
+                    data = {key: value for key, value in data.items() if key != "conversation"}
+                yield format_sse(event, data)
+        except Exception as e:
+            app_logger.error(f"❌ FastMCP流式聊天处理失败: {str(e)}")
+            yield format_sse("error", {"message": f"抱歉，处理您的请求时出现错误: {str(e)}"})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # 创建全局AI助手实例
 assistant = FastMCPGitHubAssistant()
 
@@ -1278,6 +1693,7 @@ def main():
         print("   - get_repository_details") 
         print("   - search_github_users")
         print("   - get_trending_repositories")
+        print("   - compare_repositories")
         print("[READY] 等待AI连接...")
         
         # 启动FastMCP服务器
@@ -1301,6 +1717,7 @@ def main():
         print("   - @mcp.tool() get_repository_details")
         print("   - @mcp.tool() search_github_users")  
         print("   - @mcp.tool() get_trending_repositories")
+        print("   - @mcp.tool() compare_repositories")
         print("[URL] 访问地址: http://localhost:3000")
         print("[INFO] 基于FastMCP框架 + Deepseek AI智能对话")
         print()
@@ -8,222 +8,332 @@ GitHub Search Web Interface - 简单的GitHub搜索界面
 import sys
 import os
 import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Optional, Tuple
 
 # 添加src目录到Python路径
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, Form, Query
+from fastapi.responses import HTMLResponse, Response
 import uvicorn
 
-from src.github_client import GitHubClient
-
-app = FastAPI(title="GitHub Search Web - 简单搜索界面")
+from src.compression import CompressionMiddleware
+from src.github_client import SEARCH_RESULT_CAP, GitHubClient
+from src.http_cache import IMMUTABLE, REVALIDATE, asset_response, html_response
+from src.json_api import (
+    BadRequestError, decode_cursor, encode_cursor, json_response, parse_fields, project, project_many, top_level_fields
+)
+from src.rate_limiter import RateLimitError
+from src.utils.templates import Markup, StaticAsset, Template, minify_css
 
 # 全局GitHub客户端
 github_client = GitHubClient()
 
-@app.get("/", response_class=HTMLResponse)
-async def index():
-    """主页面"""
-    html_content = """
+# ---- 样式表（启动时生成一次，作为带哈希的静态资源长期缓存） ----
+
+SEARCH_CSS = """
+    * { margin: 0; padding: 0; box-sizing: border-box; }
+    body { 
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        min-height: 100vh;
+        padding: 20px;
+    }
+    .container { 
+        max-width: 1200px; 
+        margin: 0 auto; 
+        background: white;
+        border-radius: 15px;
+        box-shadow: 0 20px 40px rgba(0,0,0,0.1);
+        overflow: hidden;
+    }
+    .header {
+        background: linear-gradient(45deg, #2d3748, #4a5568);
+        color: white;
+        padding: 30px;
+        text-align: center;
+    }
+    .header h1 { font-size: 2.5em; margin-bottom: 10px; }
+    .header p { font-size: 1.2em; opacity: 0.9; }
+    .content { padding: 40px; }
+    .search-form {
+        background: #f8f9fa;
+        border-radius: 10px;
+        padding: 30px;
+        margin-bottom: 30px;
+    }
+    .form-group { margin-bottom: 20px; }
+    label { 
+        display: block; 
+        margin-bottom: 8px; 
+        font-weight: 600;
+        color: #2d3748;
+    }
+    input, select, button {
+        width: 100%;
+        padding: 12px;
+        border: 2px solid #e2e8f0;
+        border-radius: 8px;
+        font-size: 16px;
+        transition: all 0.3s;
+    }
+    input:focus, select:focus {
+        outline: none;
+        border-color: #667eea;
+        box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
+    }
+    .button-group {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+        gap: 15px;
+        margin-top: 20px;
+    }
+    button {
+        background: linear-gradient(45deg, #667eea, #764ba2);
+        color: white;
+        border: none;
+        cursor: pointer;
+        font-weight: 600;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+    button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 10px 20px rgba(102, 126, 234, 0.3);
+    }
+    .results {
+        margin-top: 30px;
+        padding: 30px;
+        background: #f8f9fa;
+        border-radius: 10px;
+        border-left: 5px solid #667eea;
+    }
+    .repo-item {
+        background: white;
+        border-radius: 8px;
+        padding: 20px;
+        margin-bottom: 20px;
+        box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+        transition: transform 0.3s;
+    }
+    .repo-item:hover {
+        transform: translateY(-3px);
+    }
+    .repo-name {
+        font-size: 1.3em;
+        font-weight: bold;
+        color: #2d3748;
+        margin-bottom: 10px;
+    }
+    .repo-stats {
+        display: flex;
+        gap: 20px;
+        margin: 10px 0;
+        font-size: 0.9em;
+        color: #666;
+    }
+    .repo-link {
+        color: #667eea;
+        text-decoration: none;
+        font-weight: 600;
+    }
+    .repo-link:hover { text-decoration: underline; }
+"""
+
+STYLESHEET = StaticAsset("search.css", minify_css(SEARCH_CSS), "text/css; charset=utf-8")
+
+# ---- 预编译模板 ----
+
+PAGE_TEMPLATE = Template("""
     <!DOCTYPE html>
     <html lang="zh-CN">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>GitHub搜索器</title>
-        <style>
-            * { margin: 0; padding: 0; box-sizing: border-box; }
-            body { 
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-                padding: 20px;
-            }
-            .container { 
-                max-width: 1200px; 
-                margin: 0 auto; 
-                background: white;
-                border-radius: 15px;
-                box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-                overflow: hidden;
-            }
-            .header {
-                background: linear-gradient(45deg, #2d3748, #4a5568);
-                color: white;
-                padding: 30px;
-                text-align: center;
-            }
-            .header h1 { font-size: 2.5em; margin-bottom: 10px; }
-            .header p { font-size: 1.2em; opacity: 0.9; }
-            .content { padding: 40px; }
-            .search-form {
-                background: #f8f9fa;
-                border-radius: 10px;
-                padding: 30px;
-                margin-bottom: 30px;
-            }
-            .form-group { margin-bottom: 20px; }
-            label { 
-                display: block; 
-                margin-bottom: 8px; 
-                font-weight: 600;
-                color: #2d3748;
-            }
-            input, select, button {
-                width: 100%;
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 8px;
-                font-size: 16px;
-                transition: all 0.3s;
-            }
-            input:focus, select:focus {
-                outline: none;
-                border-color: #667eea;
-                box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-            }
-            .button-group {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 15px;
-                margin-top: 20px;
-            }
-            button {
-                background: linear-gradient(45deg, #667eea, #764ba2);
-                color: white;
-                border: none;
-                cursor: pointer;
-                font-weight: 600;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }
-            button:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 10px 20px rgba(102, 126, 234, 0.3);
-            }
-            .results {
-                margin-top: 30px;
-                padding: 30px;
-                background: #f8f9fa;
-                border-radius: 10px;
-                border-left: 5px solid #667eea;
-            }
-            .repo-item {
-                background: white;
-                border-radius: 8px;
-                padding: 20px;
-                margin-bottom: 20px;
-                box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                transition: transform 0.3s;
-            }
-            .repo-item:hover {
-                transform: translateY(-3px);
-            }
-            .repo-name {
-                font-size: 1.3em;
-                font-weight: bold;
-                color: #2d3748;
-                margin-bottom: 10px;
-            }
-            .repo-stats {
-                display: flex;
-                gap: 20px;
-                margin: 10px 0;
-                font-size: 0.9em;
-                color: #666;
-            }
-            .repo-link {
-                color: #667eea;
-                text-decoration: none;
-                font-weight: 600;
-            }
-            .repo-link:hover { text-decoration: underline; }
-        </style>
+        <title>{{ title }}</title>
+        <link rel="stylesheet" href="{{ stylesheet }}">
     </head>
     <body>
         <div class="container">
             <div class="header">
-                <h1>🔍 GitHub搜索器</h1>
-                <p>简单的GitHub仓库搜索工具 - 无AI对话功能</p>
+                <h1>{{ heading }}</h1>
+                {{ subheading|safe }}
             </div>
-            
             <div class="content">
-                <div class="search-form">
-                    <h2>🎯 搜索选项</h2>
-                    
-                    <form method="post" action="/search">
-                        <div class="form-group">
-                            <label for="query">🔍 搜索关键词</label>
-                            <input type="text" id="query" name="query" placeholder="例如: python web framework" required>
-                        </div>
-                        
-                        <div class="form-group">
-                            <label for="language">💻 编程语言 (可选)</label>
-                            <select id="language" name="language">
-                                <option value="">所有语言</option>
-                                <option value="python">Python</option>
-                                <option value="javascript">JavaScript</option>
-                                <option value="java">Java</option>
-                                <option value="go">Go</option>
-                                <option value="rust">Rust</option>
-                                <option value="typescript">TypeScript</option>
-                                <option value="cpp">C++</option>
-                                <option value="csharp">C#</option>
-                                <option value="php">PHP</option>
-                                <option value="ruby">Ruby</option>
-                            </select>
-                        </div>
-                        
-                        <div class="form-group">
-                            <label for="sort">📊 排序方式</label>
-                            <select id="sort" name="sort">
-                                <option value="stars">⭐ 按星数</option>
-                                <option value="forks">🍴 按fork数</option>
-                                <option value="updated">📅 按更新时间</option>
-                            </select>
-                        </div>
-                        
-                        <div class="button-group">
-                            <button type="submit" name="action" value="search">🔍 搜索仓库</button>
-                        </div>
-                    </form>
-                    
-                    <form method="post" action="/repo_info" style="margin-top: 30px;">
-                        <h3>📦 获取仓库详情</h3>
-                        <div class="form-group">
-                            <label for="owner">👤 所有者</label>
-                            <input type="text" id="owner" name="owner" placeholder="例如: microsoft">
-                        </div>
-                        <div class="form-group">
-                            <label for="repo">📁 仓库名</label>
-                            <input type="text" id="repo" name="repo" placeholder="例如: vscode">
-                        </div>
-                        <button type="submit">📦 获取详情</button>
-                    </form>
-                    
-                    <form method="post" action="/search_users" style="margin-top: 30px;">
-                        <h3>👥 搜索用户</h3>
-                        <div class="form-group">
-                            <label for="user_query">🔍 用户搜索</label>
-                            <input type="text" id="user_query" name="user_query" placeholder="例如: microsoft">
-                        </div>
-                        <button type="submit">👥 搜索用户</button>
-                    </form>
-                </div>
+                {{ content|safe }}
             </div>
         </div>
     </body>
     </html>
-    """
-    return html_content
+""")
 
-@app.post("/search", response_class=HTMLResponse)
-async def search_repositories(query: str = Form(...), language: str = Form(""), sort: str = Form("stars")):
-    """搜索仓库"""
+RESULTS_TEMPLATE = Template("""
+    <div class="results">
+        <h2>{{ title }}</h2>
+        {{ body|safe }}
+    </div>
+""")
+
+MESSAGE_TEMPLATE = Template("<p>{{ message }}</p>")
+
+REPO_ITEM_TEMPLATE = Template("""
+    <div class="repo-item">
+        <div class="repo-name">{{ full_name }}</div>
+        <p>{{ description }}</p>
+        <div class="repo-stats">
+            <span>⭐ {{ stars }} 星</span>
+            <span>🍴 {{ forks }} fork</span>
+            <span>💻 {{ language }}</span>
+        </div>
+        <p><strong>🔗 链接:</strong> <a href="{{ html_url }}" class="repo-link" target="_blank">查看仓库</a></p>
+    </div>
+""")
+
+REPO_DETAIL_TEMPLATE = Template("""
+    <div class="repo-item">
+        <div class="repo-name">{{ full_name }}</div>
+        <p><strong>📝 描述:</strong> {{ description }}</p>
+        <div class="repo-stats">
+            <span>⭐ {{ stars }} 星</span>
+            <span>🍴 {{ forks }} fork</span>
+            <span>👀 {{ watchers }} 关注</span>
+            <span>🐛 {{ open_issues }} 问题</span>
+        </div>
+        <p><strong>💻 主要语言:</strong> {{ language }}</p>
+        <p><strong>📦 大小:</strong> {{ size }} KB</p>
+        <p><strong>📅 创建:</strong> {{ created_at }}</p>
+        <p><strong>📅 更新:</strong> {{ updated_at }}</p>
+        <p><strong>🔗 链接:</strong> <a href="{{ html_url }}" class="repo-link" target="_blank">查看仓库</a></p>
+    </div>
+""")
+
+USER_ITEM_TEMPLATE = Template("""
+    <div class="repo-item">
+        <div class="repo-name">{{ login }} ({{ user_type }})</div>
+        <p><strong>🔗 链接:</strong> <a href="{{ html_url }}" class="repo-link" target="_blank">查看主页</a></p>
+    </div>
+""")
+
+HEADER_BACK_LINK = Markup('<a href="/" style="color: white; text-decoration: none;">← 返回搜索</a>')
+RESULTS_BACK_LINK = Markup('<a href="/" style="color: #667eea;">← 返回搜索</a>')
+
+INDEX_CONTENT = Markup("""
+    <div class="search-form">
+        <h2>🎯 搜索选项</h2>
+
+        <form method="get" action="/search">
+            <div class="form-group">
+                <label for="query">🔍 搜索关键词</label>
+                <input type="text" id="query" name="query" placeholder="例如: python web framework" required>
+            </div>
+
+            <div class="form-group">
+                <label for="language">💻 编程语言 (可选)</label>
+                <select id="language" name="language">
+                    <option value="">所有语言</option>
+                    <option value="python">Python</option>
+                    <option value="javascript">JavaScript</option>
+                    <option value="java">Java</option>
+                    <option value="go">Go</option>
+                    <option value="rust">Rust</option>
+                    <option value="typescript">TypeScript</option>
+                    <option value="cpp">C++</option>
+                    <option value="csharp">C#</option>
+                    <option value="php">PHP</option>
+                    <option value="ruby">Ruby</option>
+                </select>
+            </div>
+
+            <div class="form-group">
+                <label for="sort">📊 排序方式</label>
+                <select id="sort" name="sort">
+                    <option value="stars">⭐ 按星数</option>
+                    <option value="forks">🍴 按fork数</option>
+                    <option value="updated">📅 按更新时间</option>
+                </select>
+            </div>
+
+            <div class="button-group">
+                <button type="submit" name="action" value="search">🔍 搜索仓库</button>
+            </div>
+        </form>
+
+        <form method="get" action="/repo_info" style="margin-top: 30px;">
+            <h3>📦 获取仓库详情</h3>
+            <div class="form-group">
+                <label for="owner">👤 所有者</label>
+                <input type="text" id="owner" name="owner" placeholder="例如: microsoft">
+            </div>
+            <div class="form-group">
+                <label for="repo">📁 仓库名</label>
+                <input type="text" id="repo" name="repo" placeholder="例如: vscode">
+            </div>
+            <button type="submit">📦 获取详情</button>
+        </form>
+
+        <form method="get" action="/search_users" style="margin-top: 30px;">
+            <h3>👥 搜索用户</h3>
+            <div class="form-group">
+                <label for="user_query">🔍 用户搜索</label>
+                <input type="text" id="user_query" name="user_query" placeholder="例如: microsoft">
+            </div>
+            <button type="submit">👥 搜索用户</button>
+        </form>
+    </div>
+""")
+
+# 主页内容固定，启动时渲染并压缩一次
+INDEX_PAGE = StaticAsset("index.html", PAGE_TEMPLATE.render(
+    title="GitHub搜索器",
+    stylesheet=STYLESHEET.url,
+    heading="🔍 GitHub搜索器",
+    subheading=Markup("<p>简单的GitHub仓库搜索工具 - 无AI对话功能</p>"),
+    content=INDEX_CONTENT
+), "text/html; charset=utf-8")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期 - 关闭时释放GitHub客户端的连接池"""
+    yield
+    await github_client.close()
+
+app = FastAPI(title="GitHub Search Web - 简单搜索界面", lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
+
+def render_page(title: str, heading: str, content: str) -> str:
+    """渲染结果页面"""
+    return PAGE_TEMPLATE.render(
+        title=f"{title} - GitHub搜索器",
+        stylesheet=STYLESHEET.url,
+        heading=heading,
+        subheading=HEADER_BACK_LINK,
+        content=content
+    )
+
+def render_error(title: str, error: Exception, back_link: bool = False) -> str:
+    """渲染错误信息"""
+    body = MESSAGE_TEMPLATE.render(message=f"错误信息: {str(error)}")
+    if back_link:
+        body = Markup(body + RESULTS_BACK_LINK)
+    return RESULTS_TEMPLATE.render(title=title, body=body)
+
+@app.get("/", response_class=HTMLResponse)
+async def index(request: Request):
+    """主页面"""
+    # 主页引用带哈希的样式表，需要每次向服务器确认（ETag未变时返回304）
+    return asset_response(INDEX_PAGE, request, REVALIDATE)
+
+@app.get(STYLESHEET.url)
+async def stylesheet(request: Request):
+    """样式表（URL随内容变化，可以永久缓存）"""
+    return asset_response(STYLESHEET, request, IMMUTABLE)
+
+async def build_search_page(query: str, language: str, sort: str) -> Tuple[str, Optional[int]]:
+    """生成仓库搜索结果页面，返回 (HTML, 缓存时间)"""
+    max_age = None
     try:
         # 处理语言参数
         lang = language if language else None
@@ -237,251 +347,208 @@ async def search_repositories(query: str = Form(...), language: str = Form(""),
         results_html = generate_results_html(repositories, f"搜索结果: {query}")
         
     except Exception as e:
-        results_html = f"""
-        <div class="results">
-            <h2>❌ 搜索失败</h2>
-            <p>错误信息: {str(e)}</p>
-            <a href="/" style="color: #667eea;">← 返回搜索</a>
-        </div>
-        """
+        results_html = render_error("❌ 搜索失败", e, back_link=True)
+        # 错误页面不缓存
+        max_age = 0
     
-    return f"""
-    <!DOCTYPE html>
-    <html lang="zh-CN">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>搜索结果 - GitHub搜索器</title>
-        <style>
-            {get_css()}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🔍 GitHub搜索器</h1>
-                <a href="/" style="color: white; text-decoration: none;">← 返回搜索</a>
-            </div>
-            <div class="content">
-                {results_html}
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    return render_page("搜索结果", "🔍 GitHub搜索器", results_html), max_age
 
-@app.post("/repo_info", response_class=HTMLResponse)
-async def get_repository_info(owner: str = Form(...), repo: str = Form(...)):
-    """获取仓库详情"""
+async def build_repo_page(owner: str, repo: str) -> Tuple[str, Optional[int]]:
+    """生成仓库详情页面，返回 (HTML, 缓存时间)"""
+    max_age = None
     try:
         repo_info = await github_client.get_repository_info(owner, repo)
         
-        results_html = f"""
-        <div class="results">
-            <h2>📦 仓库详情</h2>
-            <div class="repo-item">
-                <div class="repo-name">{repo_info.get('full_name')}</div>
-                <p><strong>📝 描述:</strong> {repo_info.get('description', '无描述')}</p>
-                <div class="repo-stats">
-                    <span>⭐ {repo_info.get('stargazers_count', 0):,} 星</span>
-                    <span>🍴 {repo_info.get('forks_count', 0):,} fork</span>
-                    <span>👀 {repo_info.get('watchers_count', 0):,} 关注</span>
-                    <span>🐛 {repo_info.get('open_issues_count', 0):,} 问题</span>
-                </div>
-                <p><strong>💻 主要语言:</strong> {repo_info.get('language', '未知')}</p>
-                <p><strong>📦 大小:</strong> {repo_info.get('size', 0):,} KB</p>
-                <p><strong>📅 创建:</strong> {repo_info.get('created_at', '未知')[:10]}</p>
-                <p><strong>📅 更新:</strong> {repo_info.get('updated_at', '未知')[:10]}</p>
-                <p><strong>🔗 链接:</strong> <a href="{repo_info.get('html_url', '')}" class="repo-link" target="_blank">查看仓库</a></p>
-            </div>
-        </div>
-        """
+        results_html = RESULTS_TEMPLATE.render(title="📦 仓库详情", body=REPO_DETAIL_TEMPLATE.render(
+            full_name=repo_info.get('full_name'),
+            description=repo_info.get('description') or '无描述',
+            stars=f"{repo_info.get('stargazers_count', 0):,}",
+            forks=f"{repo_info.get('forks_count', 0):,}",
+            watchers=f"{repo_info.get('watchers_count', 0):,}",
+            open_issues=f"{repo_info.get('open_issues_count', 0):,}",
+            language=repo_info.get('language') or '未知',
+            size=f"{repo_info.get('size', 0):,}",
+            created_at=(repo_info.get('created_at') or '未知')[:10],
+            updated_at=(repo_info.get('updated_at') or '未知')[:10],
+            html_url=repo_info.get('html_url', '')
+        ))
         
     except Exception as e:
-        results_html = f"""
-        <div class="results">
-            <h2>❌ 获取失败</h2>
-            <p>错误信息: {str(e)}</p>
-        </div>
-        """
+        results_html = render_error("❌ 获取失败", e)
+        # 错误页面不缓存
+        max_age = 0
     
-    return f"""
-    <!DOCTYPE html>
-    <html lang="zh-CN">
-    <head>
-        <meta charset="UTF-8">
-        <title>仓库详情 - GitHub搜索器</title>
-        <style>{get_css()}</style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>📦 仓库详情</h1>
-                <a href="/" style="color: white; text-decoration: none;">← 返回搜索</a>
-            </div>
-            <div class="content">
-                {results_html}
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    return render_page("仓库详情", "📦 仓库详情", results_html), max_age
 
-@app.post("/search_users", response_class=HTMLResponse) 
-async def search_users(user_query: str = Form(...)):
-    """搜索用户"""
+async def build_users_page(user_query: str) -> Tuple[str, Optional[int]]:
+    """生成用户搜索结果页面，返回 (HTML, 缓存时间)"""
+    max_age = None
     try:
         users = await github_client.search_users(query=user_query)
         
-        users_html = ""
-        for user in users[:10]:
-            user_type = "🏢 组织" if user.get('type') == 'Organization' else "👤 用户"
-            users_html += f"""
-            <div class="repo-item">
-                <div class="repo-name">{user.get('login')} ({user_type})</div>
-                <p><strong>🔗 链接:</strong> <a href="{user.get('html_url', '')}" class="repo-link" target="_blank">查看主页</a></p>
-            </div>
-            """
+        users_html = "".join(
+            USER_ITEM_TEMPLATE.render(
+                login=user.get('login'),
+                user_type="🏢 组织" if user.get('type') == 'Organization' else "👤 用户",
+                html_url=user.get('html_url', '')
+            )
+            for user in users[:10]
+        )
         
-        results_html = f"""
-        <div class="results">
-            <h2>👥 用户搜索结果</h2>
-            {users_html}
-        </div>
-        """
+        results_html = RESULTS_TEMPLATE.render(title="👥 用户搜索结果", body=Markup(users_html))
         
     except Exception as e:
-        results_html = f"""
-        <div class="results">
-            <h2>❌ 搜索失败</h2>
-            <p>错误信息: {str(e)}</p>
-        </div>
-        """
+        results_html = render_error("❌ 搜索失败", e)
+        # 错误页面不缓存
+        max_age = 0
     
-    return f"""
-    <!DOCTYPE html>
-    <html lang="zh-CN">
-    <head>
-        <meta charset="UTF-8">
-        <title>用户搜索 - GitHub搜索器</title>
-        <style>{get_css()}</style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>👥 用户搜索</h1>
-                <a href="/" style="color: white; text-decoration: none;">← 返回搜索</a>
-            </div>
-            <div class="content">
-                {results_html}
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    return render_page("用户搜索", "👥 用户搜索", results_html), max_age
+
+# 结果页面同时支持GET和POST：表单使用GET提交，结果页面可以按Cache-Control被浏览器缓存
+
+@app.get("/search", response_class=HTMLResponse)
+async def search_repositories_page(request: Request, query: str, language: str = "", sort: str = "stars"):
+    """搜索仓库"""
+    return html_response(request, *await build_search_page(query, language, sort))
+
+@app.post("/search", response_class=HTMLResponse)
+async def search_repositories(request: Request, query: str = Form(...), language: str = Form(""), sort: str = Form("stars")):
+    """搜索仓库"""
+    return html_response(request, *await build_search_page(query, language, sort))
+
+@app.get("/repo_info", response_class=HTMLResponse)
+async def get_repository_info_page(request: Request, owner: str, repo: str):
+    """获取仓库详情"""
+    return html_response(request, *await build_repo_page(owner, repo))
+
+@app.post("/repo_info", response_class=HTMLResponse)
+async def get_repository_info(request: Request, owner: str = Form(...), repo: str = Form(...)):
+    """获取仓库详情"""
+    return html_response(request, *await build_repo_page(owner, repo))
+
+@app.get("/search_users", response_class=HTMLResponse)
+async def search_users_page(request: Request, user_query: str):
+    """搜索用户"""
+    return html_response(request, *await build_users_page(user_query))
+
+@app.post("/search_users", response_class=HTMLResponse)
+async def search_users(request: Request, user_query: str = Form(...)):
+    """搜索用户"""
+    return html_response(request, *await build_users_page(user_query))
+
+# ---- JSON API ----
+
+# 用户搜索结果本身包含的字段，只请求这些字段时不需要逐个获取用户详情
+SEARCH_USER_FIELDS = {
+    "login", "id", "node_id", "avatar_url", "gravatar_id", "url", "html_url", "type", "site_admin", "score",
+}
+
+def api_error(request: Request, error: Exception) -> Response:
+    """把GitHub请求的异常转换为带状态码的JSON错误"""
+    headers = {}
+    if isinstance(error, RateLimitError):
+        status_code = 429
+        if error.retry_after:
+            headers["Retry-After"] = str(int(error.retry_after + 0.999))
+    elif isinstance(error, BadRequestError):
+        status_code = 400
+    elif "not found" in str(error).lower():
+        status_code = 404
+    else:
+        status_code = 502
+    return json_response(request, {"error": str(error)}, status_code=status_code, headers=headers)
+
+def next_cursor(scope: dict, page: int, per_page: int, count: int) -> Optional[str]:
+    """当前页已满且未到搜索API的1000条上限时返回下一页的游标"""
+    if count < per_page or page * per_page >= SEARCH_RESULT_CAP:
+        return None
+    return encode_cursor(scope, page + 1)
+
+@app.get("/api/search")
+async def api_search(
+    request: Request,
+    query: str,
+    language: str = "",
+    sort: str = "stars",
+    order: str = "desc",
+    per_page: int = Query(10, ge=1, le=100),
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None
+):
+    """搜索仓库（JSON），fields指定返回的字段，cursor为上一页返回的next_cursor"""
+    scope = {"api": "search", "query": query, "language": language, "sort": sort, "order": order, "per_page": per_page}
+    try:
+        selected = parse_fields(fields)
+        page = decode_cursor(cursor, scope)
+        # 分页结果需要与GitHub保持一致的顺序，不使用本地索引
+        repositories = await github_client.search_repositories(
+            query=query, language=language or None, sort=sort, order=order,
+            per_page=per_page, page=page, use_index=False
+        )
+    except Exception as e:
+        return api_error(request, e)
+    
+    return json_response(request, {
+        "items": project_many(repositories, selected),
+        "page": page,
+        "next_cursor": next_cursor(scope, page, per_page, len(repositories))
+    })
+
+@app.get("/api/repo/{owner}/{repo}")
+async def api_repo(request: Request, owner: str, repo: str, fields: Optional[str] = None):
+    """获取仓库详情（JSON），fields指定返回的字段"""
+    try:
+        selected = parse_fields(fields)
+        repo_info = await github_client.get_repository_info(owner, repo)
+    except Exception as e:
+        return api_error(request, e)
+    
+    return json_response(request, project(repo_info, selected))
+
+@app.get("/api/users")
+async def api_users(
+    request: Request,
+    query: str,
+    per_page: int = Query(10, ge=1, le=100),
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None
+):
+    """搜索用户（JSON），只请求搜索结果已有的字段时不获取用户详情"""
+    scope = {"api": "users", "query": query, "per_page": per_page}
+    try:
+        selected = parse_fields(fields)
+        page = decode_cursor(cursor, scope)
+        requested = top_level_fields(selected)
+        users = await github_client.search_users(
+            query=query, per_page=per_page, page=page,
+            with_details=requested is None or not requested <= SEARCH_USER_FIELDS
+        )
+    except Exception as e:
+        return api_error(request, e)
+    
+    return json_response(request, {
+        "items": project_many(users, selected),
+        "page": page,
+        "next_cursor": next_cursor(scope, page, per_page, len(users))
+    })
 
 def generate_results_html(repositories, title):
     """生成结果HTML"""
     if not repositories:
-        return f"""
-        <div class="results">
-            <h2>📭 {title}</h2>
-            <p>未找到相关仓库</p>
-        </div>
-        """
-    
-    results_html = f"""
-    <div class="results">
-        <h2>🎯 {title}</h2>
-        <p>找到 {len(repositories)} 个仓库:</p>
-    """
+        return RESULTS_TEMPLATE.render(title=f"📭 {title}", body=MESSAGE_TEMPLATE.render(message="未找到相关仓库"))
     
+    items = [MESSAGE_TEMPLATE.render(message=f"找到 {len(repositories)} 个仓库:")]
     for repo in repositories:
-        stars = repo.get('stargazers_count', 0)
-        forks = repo.get('forks_count', 0)
-        language = repo.get('language', '未知')
-        description = repo.get('description', '无描述')
-        
-        results_html += f"""
-        <div class="repo-item">
-            <div class="repo-name">{repo['full_name']}</div>
-            <p>{description}</p>
-            <div class="repo-stats">
-                <span>⭐ {stars:,} 星</span>
-                <span>🍴 {forks:,} fork</span>
-                <span>💻 {language}</span>
-            </div>
-            <p><strong>🔗 链接:</strong> <a href="{repo.get('html_url', '')}" class="repo-link" target="_blank">查看仓库</a></p>
-        </div>
-        """
+        items.append(REPO_ITEM_TEMPLATE.render(
+            full_name=repo['full_name'],
+            description=repo.get('description') or '无描述',
+            stars=f"{repo.get('stargazers_count', 0):,}",
+            forks=f"{repo.get('forks_count', 0):,}",
+            language=repo.get('language') or '未知',
+            html_url=repo.get('html_url', '')
+        ))
     
-    results_html += "</div>"
-    return results_html
-
-def get_css():
-    """获取CSS样式"""
-    return """
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        .container { 
-            max-width: 1200px; 
-            margin: 0 auto; 
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        .header {
-            background: linear-gradient(45deg, #2d3748, #4a5568);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }
-        .header h1 { font-size: 2.5em; margin-bottom: 10px; }
-        .content { padding: 40px; }
-        .results {
-            margin-top: 30px;
-            padding: 30px;
-            background: #f8f9fa;
-            border-radius: 10px;
-            border-left: 5px solid #667eea;
-        }
-        .repo-item {
-            background: white;
-            border-radius: 8px;
-            padding: 20px;
-            margin-bottom: 20px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            transition: transform 0.3s;
-        }
-        .repo-item:hover {
-            transform: translateY(-3px);
-        }
-        .repo-name {
-            font-size: 1.3em;
-            font-weight: bold;
-            color: #2d3748;
-            margin-bottom: 10px;
-        }
-        .repo-stats {
-            display: flex;
-            gap: 20px;
-            margin: 10px 0;
-            font-size: 0.9em;
-            color: #666;
-        }
-        .repo-link {
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 600;
-        }
-        .repo-link:hover { text-decoration: underline; }
-    """
+    return RESULTS_TEMPLATE.render(title=f"🎯 {title}", body=Markup("".join(items)))
 
 if __name__ == "__main__":
     print("🌐 启动GitHub搜索Web界面...")
@@ -0,0 +1,185 @@
+"""
+响应缓存模块
+为GitHub API响应提供带TTL过期和LRU淘汰的进程内缓存
+过期但带有ETag/Last-Modified的记录会保留下来，用于条件请求重新验证
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.config import config
+
+
+class CacheEntry:
+    """单条缓存记录"""
+
+    __slots__ = ("value", "size", "expires_at", "etag", "last_modified", "links")
+
+    def __init__(self, value: Any, size: int, expires_at: float,
+                 etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 links: Optional[Dict[str, str]] = None):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.links = links or {}
+
+    @property
+    def revalidatable(self) -> bool:
+        """是否带有可用于条件请求的验证器"""
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """生成条件请求头（If-None-Match / If-Modified-Since）"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """判断记录是否仍在TTL有效期内"""
+        return (now if now is not None else time.monotonic()) < self.expires_at
+
+
+class ResponseCache:
+    """TTL + LRU 响应缓存
+
+    同时按条目数量和字节大小限制容量，超出时淘汰最久未使用的记录。
+    """
+
+    def __init__(self, ttl: Optional[int] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.ttl = config.CACHE_TTL if ttl is None else ttl
+        self.max_entries = config.CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    @staticmethod
+    def make_key(method: str, endpoint: str, params: Optional[Dict] = None) -> str:
+        """根据请求方法、端点和规范化后的参数生成缓存键"""
+        normalized = []
+        for name, value in sorted((params or {}).items()):
+            if value is None:
+                continue
+            value = str(value)
+            if name == "q":
+                # 搜索语句中的多余空白不影响结果
+                value = " ".join(value.split())
+            normalized.append((name, value))
+        return json.dumps(
+            [method.upper(), endpoint.strip("/"), normalized],
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+
+    def get(self, key: str, record_miss: bool = True) -> Optional[Any]:
+        """获取未过期的缓存值，不存在或已过期时返回None"""
+        entry = self.get_entry(key, record_miss)
+        return entry.value if entry is not None else None
+
+    def get_entry(self, key: str, record_miss: bool = True) -> Optional[CacheEntry]:
+        """获取未过期的缓存记录，不存在或已过期时返回None
+
+        record_miss为False时未命中不计入统计（随后还会经过正常请求路径再查一次的预检查）。
+        """
+        entry = self._entries.get(key)
+        if entry is None or not entry.is_fresh():
+            if entry is not None and not entry.revalidatable:
+                self._remove(key)
+            if record_miss:
+                self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """获取已过期但可重新验证的记录，不计入命中统计"""
+        entry = self._entries.get(key)
+        if entry is None or entry.is_fresh() or not entry.revalidatable:
+            return None
+        return entry
+
+    def refresh(self, key: str, ttl: Optional[int] = None) -> Optional[CacheEntry]:
+        """重新验证成功（HTTP 304）后延长记录有效期并返回该记录"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries.move_to_end(key)
+        self.revalidations += 1
+        return entry
+
+    def set(self, key: str, value: Any, size: Optional[int] = None, ttl: Optional[int] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None,
+            links: Optional[Dict[str, str]] = None) -> None:
+        """写入缓存，size为响应体字节数（未提供时按JSON长度估算）"""
+        if not self.enabled:
+            return
+
+        if size is None:
+            size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if size > self.max_bytes:
+            # 单条记录超过总容量，直接不缓存
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = CacheEntry(value, size, expires_at, etag, last_modified, links)
+        self._total_bytes += size
+        self._evict()
+
+    def invalidate(self, key: str) -> None:
+        """删除指定缓存记录"""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "revalidations": self.revalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _remove(self, key: str) -> CacheEntry:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+        return entry
+
+    def _evict(self) -> None:
+        """按LRU顺序淘汰记录直到满足数量和字节限制"""
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._total_bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
@@ -0,0 +1,225 @@
+"""
+对话补全缓存模块
+按规范化后的消息列表、工具定义和模型参数缓存AI回答，
+可选地通过MinHash相似度为措辞相近的提问复用已有回答（仓库名、标识符和数字必须完全相同）
+"""
+
+import hashlib
+import json
+import random
+import re
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from src.cache import ResponseCache
+from src.config import config
+
+# 梅森素数 2^61-1，用于MinHash的线性哈希族
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+# 实体：owner/repo、带 . - _ 的标识符、含数字的词、驼峰标识符
+_ENTITY_PATTERN = re.compile(
+    r"[\w.-]+/[\w.-]+|\w+(?:[._-]\w+)+|\w*\d\w*|[a-z]+[A-Z]\w*", re.UNICODE
+)
+# 两个提问各自独有的词共享这么长的前缀（或互相包含）时，视为改动了关键词而不是换了说法
+_STEM_LENGTH = 4
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """合并多余空白，去掉首尾空白"""
+    return " ".join((text or "").split())
+
+
+def normalize_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """只保留影响回答的字段，并规范化文本内容"""
+    normalized = []
+    for message in messages:
+        item = {"role": message.get("role"), "content": normalize_text(message.get("content"))}
+        for field in ("tool_calls", "tool_call_id", "name"):
+            if message.get(field):
+                item[field] = message[field]
+        normalized.append(item)
+    return normalized
+
+
+def entity_tokens(text: str) -> FrozenSet[str]:
+    """提取提问中必须完全一致的实体（忽略大小写和末尾标点）"""
+    return frozenset(match.rstrip(".-").lower() for match in _ENTITY_PATTERN.findall(text))
+
+
+def _words(text: str) -> FrozenSet[str]:
+    return frozenset(_WORD_PATTERN.findall(text.lower()))
+
+
+def _related_words(left: str, right: str) -> bool:
+    """两个不同的词是否是同一个词的变形（如 popular/unpopular、react/reacts、tensorflow/tensorboard）"""
+    shorter, longer = sorted((left, right), key=len)
+    if len(shorter) >= 3 and shorter in longer:
+        return True
+    return len(shorter) >= _STEM_LENGTH and left[:_STEM_LENGTH] == right[:_STEM_LENGTH]
+
+
+def prompts_compatible(left_entities: FrozenSet[str], left_words: FrozenSet[str],
+                       right_entities: FrozenSet[str], right_words: FrozenSet[str]) -> bool:
+    """相似的两个提问能否共用回答：实体完全相同，且没有被改动（而不是替换）的关键词"""
+    if left_entities != right_entities:
+        return False
+    left_only, right_only = left_words - right_words, right_words - left_words
+    return not any(_related_words(a, b) for a in left_only for b in right_only)
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class MinHasher:
+    """基于字符n-gram的MinHash签名，用于估算两段文本的Jaccard相似度"""
+
+    def __init__(self, num_perm: int = 64, ngram: int = 3, seed: int = 1):
+        rng = random.Random(seed)
+        self.ngram = ngram
+        self._coefficients = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> set:
+        """小写化后按词拼接，提取字符n-gram（中文等无空格文本同样适用）"""
+        compact = " ".join(_WORD_PATTERN.findall(text.lower()))
+        if len(compact) <= self.ngram:
+            return {compact} if compact else set()
+        return {compact[i:i + self.ngram] for i in range(len(compact) - self.ngram + 1)}
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+            for shingle in self.shingles(text)
+        ]
+        if not hashes:
+            return tuple(_MERSENNE_PRIME for _ in self._coefficients)
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._coefficients
+        )
+
+    @staticmethod
+    def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+        """签名中相同位置取值相等的比例即Jaccard相似度的估计值"""
+        if not left or len(left) != len(right):
+            return 0.0
+        return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+class CompletionCache:
+    """AI回答缓存
+
+    第一级按完整请求（规范化消息 + 工具定义 + 模型参数）的哈希精确匹配；
+    第二级在上下文（除最后一条用户消息外的全部内容）相同的前提下，
+    用MinHash比较最后一条用户消息，相似度达到阈值、实体完全相同、
+    且只是换了说法（没有改动某个关键词，如加un-前缀）时复用缓存的回答。
+    similarity_threshold为0时只做精确匹配。
+    """
+
+    def __init__(self, ttl: Optional[int] = None, max_entries: Optional[int] = None,
+                 similarity_threshold: Optional[float] = None, num_perm: Optional[int] = None):
+        self.cache = ResponseCache(
+            ttl=config.AI_CACHE_TTL if ttl is None else ttl,
+            max_entries=config.AI_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self.similarity_threshold = (
+            config.AI_CACHE_SIMILARITY if similarity_threshold is None else similarity_threshold
+        )
+        self.hasher = MinHasher(config.AI_CACHE_MINHASH_PERM if num_perm is None else num_perm)
+
+        # 精确键 -> (上下文键, MinHash签名, 实体, 词集合)，数量与缓存条目上限一致
+        self._signatures: "OrderedDict[str, Tuple[str, Tuple[int, ...], FrozenSet[str], FrozenSet[str]]]" = (
+            OrderedDict()
+        )
+
+        self.exact_hits = 0
+        self.similar_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache.enabled
+
+    @property
+    def similarity_enabled(self) -> bool:
+        return 0 < self.similarity_threshold <= 1
+
+    def make_keys(self, messages: List[Dict[str, Any]], tools: Any,
+                  params: Dict[str, Any]) -> Tuple[str, str, str]:
+        """返回 (精确键, 上下文键, 最后一条用户消息)"""
+        normalized = normalize_messages(messages)
+        exact_key = _digest([normalized, tools, params])
+
+        last_user = len(normalized) - 1
+        while last_user >= 0 and normalized[last_user]["role"] != "user":
+            last_user -= 1
+        prompt = normalized[last_user]["content"] if last_user >= 0 else ""
+        context = normalized[:last_user] + normalized[last_user + 1:] if last_user >= 0 else normalized
+        context_key = _digest([context, tools, params])
+        return exact_key, context_key, prompt
+
+    def get(self, messages: List[Dict[str, Any]], tools: Any,
+            params: Dict[str, Any]) -> Tuple[Optional[Any], Optional[str]]:
+        """查找缓存，返回 (缓存值, 命中方式 exact/similar)，未命中时返回 (None, None)"""
+        if not self.enabled:
+            return None, None
+        exact_key, context_key, prompt = self.make_keys(messages, tools, params)
+
+        value = self.cache.get(exact_key)
+        if value is not None:
+            self.exact_hits += 1
+            return value, "exact"
+
+        if not self.similarity_enabled or not prompt:
+            return None, None
+
+        signature = self.hasher.signature(prompt)
+        entities, words = entity_tokens(prompt), _words(prompt)
+        best_key, best_score = None, 0.0
+        for key, (stored_context, stored_signature, stored_entities, stored_words) in list(self._signatures.items()):
+            if stored_context != context_key:
+                continue
+            if not prompts_compatible(entities, words, stored_entities, stored_words):
+                continue
+            score = MinHasher.similarity(signature, stored_signature)
+            if score > best_score:
+                best_key, best_score = key, score
+
+        if best_key is None or best_score < self.similarity_threshold:
+            return None, None
+        value = self.cache.get(best_key)
+        if value is None:
+            # 对应的回答已过期或被淘汰
+            self._signatures.pop(best_key, None)
+            return None, None
+        self.similar_hits += 1
+        return value, "similar"
+
+    def set(self, messages: List[Dict[str, Any]], tools: Any, params: Dict[str, Any],
+            value: Any) -> None:
+        """写入缓存"""
+        if not self.enabled:
+            return
+        exact_key, context_key, prompt = self.make_keys(messages, tools, params)
+        self.cache.set(exact_key, value)
+
+        if self.similarity_enabled and prompt:
+            self._signatures[exact_key] = (
+                context_key, self.hasher.signature(prompt), entity_tokens(prompt), _words(prompt)
+            )
+            self._signatures.move_to_end(exact_key)
+            while len(self._signatures) > self.cache.max_entries:
+                self._signatures.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息"""
+        return {
+            **self.cache.stats(),
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "similarity_threshold": self.similarity_threshold
+        }
@@ -0,0 +1,186 @@
+"""
+HTTP响应压缩模块
+按客户端的Accept-Encoding选择brotli或gzip压缩响应体（brotli为可选依赖），
+小于阈值的响应、SSE流和已经压缩过的响应保持原样
+"""
+
+import gzip
+import zlib
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 按优先级排列的可用编码
+SUPPORTED_ENCODINGS: List[str] = (["br"] if brotli is not None else []) + ["gzip"]
+
+# 值得压缩的内容类型（图片等已经压缩过的格式不再压缩）
+_COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/javascript", "application/xml", "image/svg+xml",
+)
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Optional[List[str]] = None) -> Optional[str]:
+    """解析Accept-Encoding（含q值），返回客户端接受且服务端支持的最优编码"""
+    if not accept_encoding:
+        return None
+    available = SUPPORTED_ENCODINGS if available is None else available
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """一次性压缩（level为None时使用最高压缩率，适合启动时预压缩的内容）"""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if level is None else level)
+    return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+
+
+class _StreamCompressor:
+    """流式压缩器：每块数据都立即刷新，保证分块响应能及时到达客户端"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """ASGI响应压缩中间件
+
+    - 响应体小于minimum_size时不压缩（先缓冲到阈值再决定）
+    - text/event-stream、已有Content-Encoding的响应和不可压缩的类型直接透传
+    - 强ETag加上编码后缀，不同编码的表示不会共用同一个ETag
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None, level: Optional[int] = None):
+        self.app = app
+        self.minimum_size = config.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.level = config.COMPRESSION_LEVEL if level is None else level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(send, encoding, self.minimum_size, self.level)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """包装send，按需压缩单个响应"""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int, level: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.compressor: Optional[_StreamCompressor] = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").lower()
+            self.passthrough = (
+                message["status"] < 200 or message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or content_type.startswith("text/event-stream")
+                or not content_type.startswith(_COMPRESSIBLE_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            data = self.compressor.process(body) if body else b""
+            if not more_body:
+                data += self.compressor.finish()
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        self.buffer.append(body)
+        self.buffered += len(body)
+        if self.buffered < self.minimum_size:
+            if more_body:
+                return
+            # 整个响应都小于阈值，原样发送
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": b"".join(self.buffer)})
+            return
+
+        data = b"".join(self.buffer)
+        self.buffer = []
+        headers = MutableHeaders(scope=self.start)
+        headers["Content-Encoding"] = self.encoding
+        vary = headers.get("vary")
+        if not vary:
+            headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["Vary"] = f"{vary}, Accept-Encoding"
+        etag = headers.get("etag")
+        if etag and etag.startswith('"'):
+            headers["ETag"] = f'{etag[:-1]}-{self.encoding}"'
+
+        if not more_body:
+            compressed = compress(data, self.encoding, self.level)
+            headers["Content-Length"] = str(len(compressed))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+
+        # 分块响应：去掉Content-Length，边接收边压缩
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        self.compressor = _StreamCompressor(self.encoding, self.level)
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": self.compressor.process(data), "more_body": True})
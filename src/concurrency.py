@@ -0,0 +1,158 @@
+"""
+自适应并发控制模块
+进程级AIMD并发限制器：延迟和错误率正常时逐步放开并发，遇到限流、服务端错误或延迟突增时成倍收缩
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from src.config import config
+from src.utils.logger import app_logger
+
+
+class AdaptiveLimiter:
+    """AIMD（加性增、乘性减）并发限制器
+
+    - 基准延迟按资源类型（core/search/graphql）分别统计，搜索请求本身较慢，不与core请求比较
+    - 请求成功且延迟不超过同类基准延迟的latency_tolerance倍时，并发上限每轮增加1
+      （每个成功请求增加 1/limit，只在并发接近上限时增长，空闲时不会无限放大）
+    - 延迟突增时上限乘以0.9；限流（403/429）、5xx或超时时上限乘以backoff
+    - 两次收缩之间至少间隔一个基准延迟，避免同一批失败把上限压到最低
+    """
+
+    def __init__(self, initial: Optional[int] = None, min_limit: Optional[int] = None,
+                 max_limit: Optional[int] = None, latency_tolerance: Optional[float] = None,
+                 backoff: float = 0.5):
+        self.min_limit = max(1, config.GITHUB_CONCURRENCY_MIN if min_limit is None else min_limit)
+        self.max_limit = max(self.min_limit, config.GITHUB_CONCURRENCY_MAX if max_limit is None else max_limit)
+        initial = config.GITHUB_CONCURRENCY_INITIAL if initial is None else initial
+        self.latency_tolerance = (
+            config.GITHUB_LATENCY_TOLERANCE if latency_tolerance is None else latency_tolerance
+        )
+        self.backoff = backoff
+
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 各资源类型健康状态下的基准延迟（秒）
+        self._baselines: Dict[str, float] = {}
+        self._last_decrease = 0.0
+
+        self.increases = 0
+        self.decreases = 0
+        self.peak_in_flight = 0
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """获取一个并发名额，超出上限时按先来先服务排队"""
+        self._bind_loop()
+        if self._in_flight < self.limit and not self._waiters:
+            self._take()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 名额已经分配但调用方被取消，归还名额
+                self._in_flight -= 1
+                self._wake()
+            else:
+                try:
+                    self._waiters.remove(future)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False,
+                resource: Optional[str] = None) -> None:
+        """归还名额，并根据本次请求的延迟和结果调整上限
+
+        overloaded表示服务端过载信号（限流、5xx、超时）；latency为None时不调整。
+        resource为请求的资源类型，延迟只和同类请求的基准延迟比较。
+        """
+        resource = resource or "core"
+        at_limit = self._in_flight >= self.limit
+        self._in_flight = max(0, self._in_flight - 1)
+        if overloaded:
+            self._decrease(self.backoff, "overload", resource)
+        elif latency is not None:
+            self._observe(latency, at_limit, resource)
+        self._wake()
+
+    def _observe(self, latency: float, at_limit: bool, resource: str) -> None:
+        baseline = self._baselines.get(resource)
+        if baseline is None or latency < baseline:
+            baseline = latency
+        else:
+            # 基准延迟缓慢上浮，适应网络状况的长期变化
+            baseline = baseline * 0.99 + latency * 0.01
+        self._baselines[resource] = baseline
+
+        if latency > baseline * self.latency_tolerance:
+            self._decrease(0.9, "latency", resource)
+        elif at_limit and self._limit < self.max_limit:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self.increases += 1
+
+    def _decrease(self, factor: float, reason: str, resource: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < max(self._baselines.get(resource, 0.0), 0.1):
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * factor)
+        self.decreases += 1
+        if self.limit != previous:
+            app_logger.debug(f"Concurrency limit {previous} -> {self.limit} ({reason})")
+
+    def _take(self) -> None:
+        self._in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._take()
+                future.set_result(None)
+
+    def _bind_loop(self) -> None:
+        """事件循环变化时（如多次asyncio.run）丢弃旧循环上的计数和等待者"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._in_flight = 0
+            self._waiters.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回限制器状态"""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "baseline_latency": {name: round(value, 4) for name, value in self._baselines.items()},
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "peak_in_flight": self.peak_in_flight
+        }
+
+
+# 全局GitHub请求并发限制器（所有GitHubClient共享）
+# 上限不超过每个主机的连接数，否则等待空闲连接的时间会被当作服务端延迟
+github_limiter = AdaptiveLimiter(
+    max_limit=min(config.GITHUB_CONCURRENCY_MAX, config.GITHUB_POOL_LIMIT_PER_HOST or config.GITHUB_CONCURRENCY_MAX)
+)
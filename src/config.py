@@ -17,9 +17,56 @@ class Config:
     GITHUB_TOKEN: str = os.getenv("GITHUB_TOKEN", "")
     GITHUB_BASE_URL: str = os.getenv("GITHUB_BASE_URL", "https://api.github.com")
     
+    # GitHub GraphQL配置（可选，批量获取用户/仓库详情，需要GITHUB_TOKEN；返回的字段比REST少）
+    GITHUB_USE_GRAPHQL: bool = os.getenv("GITHUB_USE_GRAPHQL", "false").lower() in ("1", "true", "yes")
+    GITHUB_GRAPHQL_URL: str = os.getenv("GITHUB_GRAPHQL_URL", "")
+    GITHUB_GRAPHQL_BATCH_SIZE: int = int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "50"))
+    
     # Deepseek AI配置
     DEEPSEEK_API_KEY: str = os.getenv("DEEPSEEK_API_KEY", "")
     DEEPSEEK_API_URL: str = os.getenv("DEEPSEEK_API_URL", "https://api.deepseek.com/chat/completions")
+    # 建立连接与两次读取之间的超时，以及包含重试在内的整体时限（秒）
+    DEEPSEEK_CONNECT_TIMEOUT: float = float(os.getenv("DEEPSEEK_CONNECT_TIMEOUT", "10"))
+    DEEPSEEK_READ_TIMEOUT: float = float(os.getenv("DEEPSEEK_READ_TIMEOUT", "60"))
+    DEEPSEEK_API_TIMEOUT: float = float(os.getenv("DEEPSEEK_API_TIMEOUT", "120"))
+    # 同时进行的Deepseek请求上限，避免突发流量耗尽服务商配额
+    DEEPSEEK_MAX_CONCURRENCY: int = int(os.getenv("DEEPSEEK_MAX_CONCURRENCY", "8"))
+    DEEPSEEK_RETRY_MAX_ATTEMPTS: int = int(os.getenv("DEEPSEEK_RETRY_MAX_ATTEMPTS", "3"))
+    DEEPSEEK_POOL_LIMIT: int = int(os.getenv("DEEPSEEK_POOL_LIMIT", "20"))
+    DEEPSEEK_KEEPALIVE_TIMEOUT: float = float(os.getenv("DEEPSEEK_KEEPALIVE_TIMEOUT", "60"))
+    
+    # AI工具调用配置
+    AI_TOOL_CONCURRENCY: int = int(os.getenv("AI_TOOL_CONCURRENCY", "4"))
+    AI_TOOL_TIMEOUT: float = float(os.getenv("AI_TOOL_TIMEOUT", "45"))
+    # 多轮工具调用的预算：最大轮数、累计token数、整体对话时限（秒）
+    AI_MAX_TOOL_ROUNDS: int = int(os.getenv("AI_MAX_TOOL_ROUNDS", "4"))
+    AI_TOKEN_BUDGET: int = int(os.getenv("AI_TOKEN_BUDGET", "24000"))
+    AI_CHAT_DEADLINE: float = float(os.getenv("AI_CHAT_DEADLINE", "120"))
+    # AI回答缓存（TTL为0时关闭）；相似度阈值为0时只复用完全相同的提问
+    AI_CACHE_TTL: int = int(os.getenv("AI_CACHE_TTL", "1800"))
+    AI_CACHE_MAX_ENTRIES: int = int(os.getenv("AI_CACHE_MAX_ENTRIES", "256"))
+    AI_CACHE_SIMILARITY: float = float(os.getenv("AI_CACHE_SIMILARITY", "0"))
+    AI_CACHE_MINHASH_PERM: int = int(os.getenv("AI_CACHE_MINHASH_PERM", "64"))
+    
+    # 工具结果缓存TTL（秒，0表示不缓存）：趋势数据变化最慢，搜索结果变化最快
+    TOOL_CACHE_TTL_SEARCH: int = int(os.getenv("TOOL_CACHE_TTL_SEARCH", "300"))
+    TOOL_CACHE_TTL_REPO: int = int(os.getenv("TOOL_CACHE_TTL_REPO", "600"))
+    TOOL_CACHE_TTL_USERS: int = int(os.getenv("TOOL_CACHE_TTL_USERS", "600"))
+    TOOL_CACHE_TTL_TRENDING: int = int(os.getenv("TOOL_CACHE_TTL_TRENDING", "1800"))
+    TOOL_CACHE_MAX_ENTRIES: int = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "512"))
+    
+    # 本地仓库搜索索引（默认关闭；开启后搜索优先由本地索引回答，结果不足时再请求GitHub）
+    SEARCH_INDEX_ENABLED: bool = os.getenv("SEARCH_INDEX_ENABLED", "false").lower() == "true"
+    SEARCH_INDEX_PATH: str = os.getenv("SEARCH_INDEX_PATH", "")
+    SEARCH_INDEX_MAX_DOCS: int = int(os.getenv("SEARCH_INDEX_MAX_DOCS", "50000"))
+    
+    # 热门趋势快照配置（刷新间隔为0时不做后台预计算，只按需获取）
+    TRENDING_LANGUAGES: str = os.getenv("TRENDING_LANGUAGES", "python,javascript,typescript,go,rust,java")
+    TRENDING_REFRESH_INTERVAL: int = int(os.getenv("TRENDING_REFRESH_INTERVAL", "1800"))
+    TRENDING_MAX_AGE: int = int(os.getenv("TRENDING_MAX_AGE", "3600"))
+    TRENDING_PER_PAGE: int = int(os.getenv("TRENDING_PER_PAGE", "10"))
+    TRENDING_SNAPSHOT_PATH: str = os.getenv("TRENDING_SNAPSHOT_PATH", "")
+    TRENDING_MAX_SNAPSHOTS: int = int(os.getenv("TRENDING_MAX_SNAPSHOTS", "64"))
     
     # MCP服务器配置
     MCP_SERVER_NAME: str = os.getenv("MCP_SERVER_NAME", "github-search-mcp")
@@ -30,10 +77,44 @@ class Config:
     
     # 缓存配置
     CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    
+    # 持久化缓存配置（SQLite文件路径，留空则不启用）
+    CACHE_DB_PATH: str = os.getenv("CACHE_DB_PATH", "")
+    CACHE_DB_MAX_BYTES: int = int(os.getenv("CACHE_DB_MAX_BYTES", str(256 * 1024 * 1024)))
+    CACHE_DB_SWEEP_INTERVAL: int = int(os.getenv("CACHE_DB_SWEEP_INTERVAL", "300"))
+    CACHE_DB_STALE_TTL: int = int(os.getenv("CACHE_DB_STALE_TTL", "86400"))
+    
+    # Web响应压缩配置（小于阈值的响应不压缩；安装brotli时优先使用br）
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_LEVEL: int = int(os.getenv("COMPRESSION_LEVEL", "6"))
     
     # API限制配置
     GITHUB_API_RATE_LIMIT: int = int(os.getenv("GITHUB_API_RATE_LIMIT", "5000"))
     GITHUB_API_TIMEOUT: int = int(os.getenv("GITHUB_API_TIMEOUT", "30"))
+    GITHUB_SEARCH_RATE_LIMIT: int = int(os.getenv("GITHUB_SEARCH_RATE_LIMIT", "30"))
+    # 剩余配额低于该比例时开始均匀放行请求
+    GITHUB_RATE_LIMIT_RESERVE: float = float(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "0.1"))
+    
+    # 重试配置（仅对幂等的GET请求生效）
+    GITHUB_RETRY_MAX_ATTEMPTS: int = int(os.getenv("GITHUB_RETRY_MAX_ATTEMPTS", "3"))
+    GITHUB_RETRY_BASE_DELAY: float = float(os.getenv("GITHUB_RETRY_BASE_DELAY", "0.5"))
+    GITHUB_RETRY_MAX_DELAY: float = float(os.getenv("GITHUB_RETRY_MAX_DELAY", "8"))
+
+    # 自适应并发配置（进程内所有GitHub请求共享，按延迟和错误率自动调整）
+    GITHUB_CONCURRENCY_INITIAL: int = int(os.getenv("GITHUB_CONCURRENCY_INITIAL", "8"))
+    GITHUB_CONCURRENCY_MIN: int = int(os.getenv("GITHUB_CONCURRENCY_MIN", "2"))
+    # 实际上限不超过GITHUB_POOL_LIMIT_PER_HOST
+    GITHUB_CONCURRENCY_MAX: int = int(os.getenv("GITHUB_CONCURRENCY_MAX", "20"))
+    # 延迟超过基准延迟的该倍数时视为延迟突增
+    GITHUB_LATENCY_TOLERANCE: float = float(os.getenv("GITHUB_LATENCY_TOLERANCE", "3.0"))
+    
+    # 连接池配置
+    GITHUB_POOL_LIMIT: int = int(os.getenv("GITHUB_POOL_LIMIT", "100"))
+    GITHUB_POOL_LIMIT_PER_HOST: int = int(os.getenv("GITHUB_POOL_LIMIT_PER_HOST", "20"))
+    GITHUB_KEEPALIVE_TIMEOUT: float = float(os.getenv("GITHUB_KEEPALIVE_TIMEOUT", "30"))
+    GITHUB_DNS_CACHE_TTL: int = int(os.getenv("GITHUB_DNS_CACHE_TTL", "300"))
     
     @classmethod
     def validate(cls) -> bool:
@@ -63,6 +144,16 @@ class Config:
             
         return headers
     
+    @classmethod
+    def get_graphql_url(cls) -> str:
+        """获取GitHub GraphQL端点（企业版 /api/v3 对应 /api/graphql）"""
+        if cls.GITHUB_GRAPHQL_URL:
+            return cls.GITHUB_GRAPHQL_URL
+        base_url = cls.GITHUB_BASE_URL.rstrip("/")
+        if base_url.endswith("/api/v3"):
+            return base_url[:-len("/v3")] + "/graphql"
+        return f"{base_url}/graphql"
+    
     @classmethod
     def get_deepseek_headers(cls) -> dict:
         """获取Deepseek API请求头"""
@@ -0,0 +1,167 @@
+"""
+Deepseek API客户端
+复用连接池的长连接客户端，提供超时控制、429/5xx重试和并发上限
+"""
+
+import aiohttp
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from src.config import config
+from src.retry import RetryableError, RetryPolicy, parse_retry_after
+from src.utils.logger import app_logger
+
+
+class DeepseekClient:
+    """Deepseek对话补全客户端
+
+    所有请求共享同一个HTTP会话；对话补全没有副作用，因此POST请求也按幂等请求重试。
+    流式请求只在收到首个数据块之前重试，开始输出后出错直接抛出。
+    """
+
+    def __init__(self):
+        self.api_url = config.DEEPSEEK_API_URL
+        self.timeout = config.DEEPSEEK_API_TIMEOUT
+        self.max_concurrency = max(1, config.DEEPSEEK_MAX_CONCURRENCY)
+
+        # 共享的HTTP会话和并发信号量（惰性创建，事件循环变化时重建）
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.retry_policy = RetryPolicy(max_attempts=config.DEEPSEEK_RETRY_MAX_ATTEMPTS)
+
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.in_flight = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享的HTTP会话，首次调用或事件循环变化时创建"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=config.DEEPSEEK_POOL_LIMIT,
+                keepalive_timeout=config.DEEPSEEK_KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=config.get_deepseek_headers()
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._session_loop = loop
+            app_logger.debug("Created pooled Deepseek HTTP session")
+        return self._session
+
+    async def close(self) -> None:
+        """关闭共享的HTTP会话，释放连接池"""
+        session = self._session
+        self._session = None
+        self._session_loop = None
+        self._semaphore = None
+        if session is not None and not session.closed:
+            await session.close()
+            app_logger.debug("Closed pooled Deepseek HTTP session")
+
+    async def complete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """发送非流式对话补全请求，返回完整的响应JSON"""
+        async with self._open(payload) as response:
+            return await response.json()
+
+    async def stream(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """发送流式对话补全请求（stream: true），逐个产出SSE数据块"""
+        async with self._open({**payload, "stream": True}) as response:
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                yield json.loads(data)
+
+    @asynccontextmanager
+    async def _open(self, payload: Dict[str, Any]):
+        """在并发上限内发送请求，重试直到拿到HTTP 200响应"""
+        session = self._get_session()
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                response = await self._send_with_retry(session, payload)
+                try:
+                    yield response
+                finally:
+                    response.release()
+            finally:
+                self.in_flight -= 1
+
+    async def _send_with_retry(self, session: aiohttp.ClientSession,
+                               payload: Dict[str, Any]) -> aiohttp.ClientResponse:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        attempt = 0
+        while True:
+            attempt += 1
+            self.requests += 1
+            try:
+                return await self._send_once(session, payload, deadline - loop.time())
+            except RetryableError as e:
+                delay = self.retry_policy.next_delay("POST", attempt, e.retry_after,
+                                                     deadline - loop.time(), idempotent=True)
+                if delay is None:
+                    self.failures += 1
+                    app_logger.error(f"{e} (after {attempt} attempt(s))")
+                    raise
+                self.retries += 1
+                app_logger.warning(f"{e}, retrying Deepseek request in {delay:.2f}s (attempt {attempt})")
+                await asyncio.sleep(delay)
+            except Exception:
+                self.failures += 1
+                raise
+
+    async def _send_once(self, session: aiohttp.ClientSession, payload: Dict[str, Any],
+                         time_left: float) -> aiohttp.ClientResponse:
+        """发送单次请求；返回状态为200的响应，由调用方负责读取和释放"""
+        if time_left <= 0:
+            raise Exception("Deepseek API调用超时")
+
+        # 读取超时作用于两次数据到达之间，流式输出期间不会因总耗时过长而中断
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=config.DEEPSEEK_CONNECT_TIMEOUT,
+            sock_read=config.DEEPSEEK_READ_TIMEOUT
+        )
+        try:
+            response = await asyncio.wait_for(
+                session.post(self.api_url, json=payload, timeout=timeout),
+                timeout=time_left
+            )
+        except aiohttp.ClientError as e:
+            raise RetryableError(f"Deepseek network error: {str(e)}")
+        except asyncio.TimeoutError:
+            raise RetryableError("Deepseek request timeout")
+
+        if response.status == 200:
+            return response
+
+        try:
+            error_text = await response.text()
+        finally:
+            response.release()
+        if response.status == 429 or response.status >= 500:
+            raise RetryableError(
+                f"Deepseek API调用失败: {response.status} - {error_text}",
+                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+            )
+        raise Exception(f"Deepseek API调用失败: {response.status} - {error_text}")
+
+    def stats(self) -> Dict[str, Any]:
+        """返回请求统计信息"""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency
+        }
@@ -0,0 +1,235 @@
+"""
+持久化缓存模块
+基于SQLite的第二级响应缓存，进程重启后依然保留，多个工作进程可共享同一文件
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from src.config import config
+from src.utils.logger import app_logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    links TEXT,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses (expires_at);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+"""
+
+
+class DiskEntry:
+    """从磁盘读取的缓存记录（expires_at为Unix时间戳）"""
+
+    __slots__ = ("value", "size", "etag", "last_modified", "links", "expires_at")
+
+    def __init__(self, value: Any, size: int, etag: Optional[str], last_modified: Optional[str],
+                 links: Dict[str, str], expires_at: float):
+        self.value = value
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.links = links
+        self.expires_at = expires_at
+
+    def ttl_left(self) -> float:
+        """剩余有效期（秒），已过期时为负数"""
+        return self.expires_at - time.time()
+
+
+class DiskCache:
+    """SQLite持久化缓存
+
+    响应体使用zlib压缩存储；数据库开启WAL模式，允许多个进程并发读写。
+    后台任务定期清理过期记录，并在超过容量上限时按最近访问时间淘汰。
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None,
+                 sweep_interval: Optional[int] = None, stale_ttl: Optional[int] = None):
+        self.path = config.CACHE_DB_PATH if path is None else path
+        self.max_bytes = config.CACHE_DB_MAX_BYTES if max_bytes is None else max_bytes
+        self.sweep_interval = config.CACHE_DB_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
+        # 过期后仍保留带ETag的记录一段时间，用于条件请求重新验证
+        self.stale_ttl = config.CACHE_DB_STALE_TTL if stale_ttl is None else stale_ttl
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.swept = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            app_logger.info(f"Disk cache opened: {self.path}")
+        return self._conn
+
+    # ---- 同步操作（在线程池中执行） ----
+
+    def get_sync(self, key: str) -> Optional[DiskEntry]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT body, etag, last_modified, links, expires_at, size FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+
+        body, etag, last_modified, links, expires_at, size = row
+        self.hits += 1
+        return DiskEntry(
+            json.loads(zlib.decompress(body)),
+            len(body) if size is None else size,
+            etag,
+            last_modified,
+            json.loads(links) if links else {},
+            expires_at
+        )
+
+    def set_sync(self, key: str, body: bytes, ttl: float, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, links: Optional[Dict[str, str]] = None) -> None:
+        """写入原始响应体（size记录未压缩的字节数，供内存缓存计算容量）"""
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, body, etag, last_modified, links, expires_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, compressed, etag, last_modified, json.dumps(links) if links else None,
+                 now + ttl, now, len(body))
+            )
+        self.writes += 1
+
+    def touch_sync(self, key: str, ttl: float) -> None:
+        """重新验证成功后延长记录有效期"""
+        now = time.time()
+        with self._lock:
+            self._connection().execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (now + ttl, now, key)
+            )
+
+    def sweep_sync(self) -> int:
+        """删除过期记录，并在超出容量时淘汰最久未访问的记录，返回删除数量"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute(
+                "DELETE FROM responses WHERE expires_at < ? "
+                "AND (etag IS NULL AND last_modified IS NULL OR expires_at < ?)",
+                (now, now - self.stale_ttl)
+            ).rowcount
+
+            total = conn.execute("SELECT COALESCE(SUM(LENGTH(body)), 0) FROM responses").fetchone()[0]
+            while total > self.max_bytes:
+                rows = conn.execute(
+                    "SELECT key, LENGTH(body) FROM responses ORDER BY accessed_at LIMIT 100"
+                ).fetchall()
+                if not rows:
+                    break
+                for key, size in rows:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    removed += 1
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+
+        self.swept += removed
+        if removed:
+            app_logger.debug(f"Disk cache sweep removed {removed} entries")
+        return removed
+
+    # ---- 异步接口 ----
+
+    async def get(self, key: str) -> Optional[DiskEntry]:
+        self._ensure_sweeper()
+        try:
+            return await asyncio.to_thread(self.get_sync, key)
+        except (sqlite3.Error, ValueError, zlib.error) as e:
+            app_logger.warning(f"Disk cache read failed: {str(e)}")
+            return None
+
+    async def set(self, key: str, body: bytes, ttl: float, etag: Optional[str] = None,
+                  last_modified: Optional[str] = None, links: Optional[Dict[str, str]] = None) -> None:
+        self._ensure_sweeper()
+        try:
+            await asyncio.to_thread(self.set_sync, key, body, ttl, etag, last_modified, links)
+        except sqlite3.Error as e:
+            app_logger.warning(f"Disk cache write failed: {str(e)}")
+
+    async def touch(self, key: str, ttl: float) -> None:
+        try:
+            await asyncio.to_thread(self.touch_sync, key, ttl)
+        except sqlite3.Error as e:
+            app_logger.warning(f"Disk cache update failed: {str(e)}")
+
+    def _ensure_sweeper(self) -> None:
+        """惰性启动后台清理任务"""
+        if self.sweep_interval <= 0:
+            return
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep_sync)
+            except sqlite3.Error as e:
+                app_logger.warning(f"Disk cache sweep failed: {str(e)}")
+            await asyncio.sleep(self.sweep_interval)
+
+    async def close(self) -> None:
+        """停止后台清理并关闭数据库连接"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """返回磁盘缓存统计信息"""
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "swept": self.swept
+        }
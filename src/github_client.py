@@ -5,10 +5,39 @@ GitHub API客户端
 
 import aiohttp
 import asyncio
-from typing import Dict, List, Optional, Any
+import json
+import re
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+from src.cache import ResponseCache
+from src.concurrency import github_limiter
 from src.config import config
+from src.disk_cache import DiskCache
+from src.graphql_queries import (
+    build_repositories_query,
+    build_users_query,
+    chunked,
+    repository_from_graphql,
+    user_from_graphql
+)
+from src.models import Repository, User, parse_payload, payload_size
+from src.rate_limiter import RateLimitError, rate_limiter, resource_for_endpoint
+from src.retry import RetryableError, RetryPolicy, parse_retry_after
+from src.search_index import SearchIndex
+from src.singleflight import SingleFlight
 from src.utils.logger import app_logger
 
+# GitHub搜索API最多只返回前1000条结果
+SEARCH_RESULT_CAP = 1000
+
+_LINK_PATTERN = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """解析Link响应头，返回 {rel: url}"""
+    if not value:
+        return {}
+    return {rel: url for url, rel in _LINK_PATTERN.findall(value)}
+
 class GitHubClient:
     """GitHub API客户端"""
     
@@ -17,42 +46,275 @@ class GitHubClient:
         self.headers = config.get_github_headers()
         self.timeout = config.GITHUB_API_TIMEOUT
         
-    async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """发送HTTP请求到GitHub API"""
+        # 共享的HTTP会话（惰性创建，复用TCP/TLS连接）
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # 响应缓存（TTL来自CACHE_TTL），配置CACHE_DB_PATH时启用SQLite持久化二级缓存
+        self.cache = ResponseCache()
+        self.disk_cache = DiskCache()
+        
+        # 进程级限流调度器（按X-RateLimit响应头跟踪配额）
+        self.scheduler = rate_limiter
+        
+        # 瞬时故障重试策略
+        self.retry_policy = RetryPolicy()
+        
+        # 进程级自适应并发限制（所有并发扇出路径共享）
+        self.limiter = github_limiter
+        
+        # 进行中请求合并（与响应缓存配合，避免并发的重复请求）
+        self.inflight = SingleFlight()
+        
+        # 本地仓库搜索索引（由获取到的仓库数据增量构建，SEARCH_INDEX_ENABLED开启）
+        self.search_index = SearchIndex()
+    
+    async def __aenter__(self) -> "GitHubClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享的HTTP会话，首次调用或事件循环变化时创建"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=config.GITHUB_POOL_LIMIT,
+                limit_per_host=config.GITHUB_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=config.GITHUB_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=config.GITHUB_DNS_CACHE_TTL
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._session_loop = loop
+            app_logger.debug("Created pooled GitHub HTTP session")
+        return self._session
+    
+    async def close(self) -> None:
+        """关闭共享的HTTP会话，释放连接池"""
+        if self.search_index.enabled:
+            await self.search_index.save()
+        if self.disk_cache.enabled:
+            await self.disk_cache.close()
+        session = self._session
+        self._session = None
+        self._session_loop = None
+        if session is not None and not session.closed:
+            await session.close()
+            app_logger.debug("Closed pooled GitHub HTTP session")
+        
+    async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                            use_cache: bool = True) -> Dict:
+        """发送HTTP请求到GitHub API，GET请求优先读取响应缓存"""
+        data, _ = await self._request(method, endpoint, params, use_cache)
+        return data
+    
+    async def _request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                       use_cache: bool = True) -> Tuple[Any, Dict[str, str]]:
+        """发送请求并返回 (响应数据, Link分页链接)"""
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
-        app_logger.debug(f"Making {method} request to: {url}")
+        cache_key = None
+        if use_cache and method.upper() == "GET" and self.cache.enabled:
+            cache_key = ResponseCache.make_key(method, endpoint, params)
+            cached = self.cache.get_entry(cache_key)
+            if cached is not None:
+                app_logger.debug(f"Cache hit: {method} {url}")
+                return cached.value, cached.links
+        
+        if method.upper() != "GET":
+            return await self._fetch(method, url, endpoint, params, cache_key)
         
-        async with aiohttp.ClientSession() as session:
+        # 相同签名的并发GET请求合并为一次网络调用
+        flight_key = cache_key or ResponseCache.make_key(method, endpoint, params)
+        return await self.inflight.do(
+            flight_key,
+            lambda: self._fetch(method, url, endpoint, params, cache_key)
+        )
+    
+    async def _fetch(self, method: str, url: str, endpoint: str, params: Optional[Dict],
+                     cache_key: Optional[str], json_body: Optional[Dict] = None,
+                     idempotent: Optional[bool] = None) -> Tuple[Any, Dict[str, str]]:
+        """带重试地获取响应，缓存过期时使用条件请求重新验证"""
+        request_headers = None
+        if cache_key is not None:
+            # 内存未命中时查询磁盘缓存，并把记录提升到内存
+            if self.disk_cache.enabled:
+                disk_entry = await self.disk_cache.get(cache_key)
+                if disk_entry is not None:
+                    ttl_left = disk_entry.ttl_left()
+                    value = parse_payload(endpoint, disk_entry.value)
+                    self.cache.set(
+                        cache_key, value, size=payload_size(value, disk_entry.size), ttl=ttl_left,
+                        etag=disk_entry.etag, last_modified=disk_entry.last_modified,
+                        links=disk_entry.links
+                    )
+                    if ttl_left > 0:
+                        app_logger.debug(f"Disk cache hit: {method} {url}")
+                        return value, disk_entry.links
+            
+            # 缓存已过期但保留了ETag/Last-Modified，发送条件请求重新验证
+            stale = self.cache.get_stale(cache_key)
+            if stale is not None:
+                request_headers = stale.conditional_headers()
+        
+        # 整体截止时间：所有重试共享GITHUB_API_TIMEOUT
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        attempt = 0
+        while True:
+            attempt += 1
             try:
-                async with session.request(
-                    method,
-                    url,
-                    headers=self.headers,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
+                return await self._send_once(method, url, endpoint, params, request_headers,
+                                             cache_key, deadline, json_body)
+            except (RetryableError, RateLimitError) as e:
+                retry_after = e.retry_after
+                if isinstance(e, RateLimitError) and retry_after is None:
+                    # 主配额耗尽需要等到重置，不做重试
+                    raise
+                delay = self.retry_policy.next_delay(method, attempt, retry_after, deadline - loop.time(),
+                                                     idempotent=idempotent)
+                if delay is None:
+                    app_logger.error(f"{e} (after {attempt} attempt(s))")
+                    raise
+                app_logger.warning(f"{e}, retrying {method} {url} in {delay:.2f}s (attempt {attempt})")
+                await asyncio.sleep(delay)
+    
+    async def _send_once(self, method: str, url: str, endpoint: str, params: Optional[Dict],
+                         request_headers: Optional[Dict], cache_key: Optional[str],
+                         deadline: float, json_body: Optional[Dict] = None) -> Tuple[Any, Dict[str, str]]:
+        """发送单次HTTP请求并处理响应状态"""
+        resource = resource_for_endpoint(endpoint)
+        if resource is not None:
+            await self.scheduler.acquire(resource)
+        
+        loop = asyncio.get_running_loop()
+        time_left = deadline - loop.time()
+        if time_left <= 0:
+            raise Exception("Request timeout")
+        
+        # 进程级并发名额：根据延迟和错误率自适应调整
+        try:
+            await asyncio.wait_for(self.limiter.acquire(), timeout=time_left)
+        except asyncio.TimeoutError:
+            raise RetryableError("Request timeout")
+        
+        started = loop.time()
+        overloaded = False
+        try:
+            return await self._send_request(method, url, endpoint, resource, params, request_headers,
+                                            cache_key, deadline - started, json_body)
+        except (RateLimitError, RetryableError):
+            # 限流、5xx、超时和网络错误都视为过载信号
+            overloaded = True
+            raise
+        finally:
+            self.limiter.release(loop.time() - started, overloaded, resource)
+    
+    async def _send_request(self, method: str, url: str, endpoint: str, resource: Optional[str],
+                            params: Optional[Dict],
+                            request_headers: Optional[Dict], cache_key: Optional[str],
+                            time_left: float, json_body: Optional[Dict] = None) -> Tuple[Any, Dict[str, str]]:
+        """发送HTTP请求，处理响应状态并写入缓存"""
+        if time_left <= 0:
+            raise RetryableError("Request timeout")
+        
+        app_logger.debug(f"Making {method} request to: {url}")
+        
+        session = self._get_session()
+        try:
+            async with session.request(
+                method,
+                url,
+                params=params,
+                json=json_body,
+                headers=request_headers,
+                timeout=aiohttp.ClientTimeout(total=time_left)
+            ) as response:
+                if resource is not None:
+                    resource = self.scheduler.update_from_headers(resource, response.headers)
+                
+                if response.status == 200:
+                    body = await response.read()
+                    # 仓库和用户在这里解析为紧凑记录，缓存中不再保存完整的原始dict
+                    data = parse_payload(endpoint, json.loads(body))
+                    links = parse_link_header(response.headers.get("Link"))
+                    if cache_key is not None:
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
+                        # 按解析后的紧凑结构计算占用，记录越紧凑缓存能容纳的条目越多
+                        self.cache.set(
+                            cache_key, data, size=payload_size(data, len(body)),
+                            etag=etag, last_modified=last_modified, links=links
+                        )
+                        if self.disk_cache.enabled:
+                            await self.disk_cache.set(
+                                cache_key, body, self.cache.ttl,
+                                etag=etag, last_modified=last_modified, links=links
+                            )
+                    return data, links
+                elif response.status == 304 and request_headers:
+                    # 304 Not Modified 不消耗GitHub配额，直接复用缓存内容；
+                    # 带有X-RateLimit头时配额已按响应头同步，只在没有时归还本地扣除的一次
+                    app_logger.debug(f"Cache revalidated (304): {method} {url}")
+                    if resource is not None and "X-RateLimit-Remaining" not in response.headers:
+                        self.scheduler.refund(resource)
+                    entry = self.cache.refresh(cache_key)
+                    if entry is not None:
+                        if self.disk_cache.enabled:
+                            await self.disk_cache.touch(cache_key, self.cache.ttl)
+                        return entry.value, entry.links
+                    raise Exception("GitHub API error: HTTP 304 without cached body")
+                elif response.status in (403, 429):
+                    raise await self._forbidden_error(resource or "core", response)
+                elif response.status == 404:
+                    raise Exception("Resource not found")
+                elif response.status >= 500:
+                    raise RetryableError(
+                        f"GitHub API error: HTTP {response.status}",
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
+                else:
+                    raise Exception(f"GitHub API error: HTTP {response.status}")
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    elif response.status == 403:
-                        raise Exception("GitHub API rate limit exceeded or access forbidden")
-                    elif response.status == 404:
-                        raise Exception("Resource not found")
-                    else:
-                        raise Exception(f"GitHub API error: HTTP {response.status}")
-                        
-            except aiohttp.ClientError as e:
-                app_logger.error(f"Network error: {str(e)}")
-                raise Exception(f"Network error: {str(e)}")
-            except asyncio.TimeoutError:
-                app_logger.error("Request timeout")
-                raise Exception("Request timeout")
+        except aiohttp.ClientError as e:
+            raise RetryableError(f"Network error: {str(e)}")
+        except asyncio.TimeoutError:
+            raise RetryableError("Request timeout")
+    
+    async def _forbidden_error(self, resource: str, response: aiohttp.ClientResponse) -> Exception:
+        """区分配额耗尽、二级限流和普通的访问拒绝"""
+        headers = response.headers
+        if headers.get("X-RateLimit-Remaining") == "0":
+            reset_at = headers.get("X-RateLimit-Reset")
+            app_logger.warning(f"GitHub {resource} rate limit exhausted")
+            return RateLimitError(
+                "GitHub API rate limit exceeded",
+                resource=resource,
+                reset_at=float(reset_at) if reset_at else None
+            )
+        
+        body = await response.text()
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None or response.status == 429 or "secondary rate limit" in body.lower():
+            seconds = retry_after if retry_after is not None else 60.0
+            self.scheduler.block(resource, seconds)
+            return RateLimitError(
+                "GitHub API secondary rate limit exceeded",
+                resource=resource,
+                retry_after=seconds
+            )
+        
+        return Exception("GitHub API access forbidden")
     
     async def search_repositories(self, query: str, language: Optional[str] = None, 
-                                sort: str = "stars", order: str = "desc", per_page: int = 10) -> List[Dict]:
-        """搜索GitHub仓库"""
+                                sort: str = "stars", order: str = "desc", per_page: int = 10,
+                                use_index: bool = True, page: int = 1) -> List[Repository]:
+        """搜索GitHub仓库（use_index为False时跳过本地索引，总是请求GitHub）"""
         search_query = query
         if language:
             search_query += f" language:{language}"
@@ -63,32 +325,147 @@ class GitHubClient:
             "order": order,
             "per_page": min(per_page, 100)
         }
+        if page > 1:
+            params["page"] = page
         
         app_logger.info(f"Searching repositories with query: {search_query}")
         
+        # 本地索引只能回答第一页
+        use_index = use_index and page == 1
+        local = self.search_index.search(search_query, sort, order, params["per_page"]) if use_index else None
+        if local is not None:
+            app_logger.info(f"Found {len(local)} repositories in local search index")
+            return local
+        
         try:
             data = await self._make_request("GET", "search/repositories", params)
             repositories = data.get("items", [])
+            self.search_index.add(repositories)
             app_logger.info(f"Found {len(repositories)} repositories")
             return repositories
         except Exception as e:
             app_logger.error(f"Error searching repositories: {str(e)}")
             raise
     
-    async def get_repository_info(self, owner: str, repo: str) -> Dict:
+    async def iter_search_repositories(self, query: str, language: Optional[str] = None,
+                                       sort: str = "stars", order: str = "desc",
+                                       limit: Optional[int] = None,
+                                       per_page: int = 100) -> AsyncIterator[Repository]:
+        """逐条迭代仓库搜索结果，自动跟随Link分页
+        
+        在调用方处理当前页时预取下一页，达到limit或搜索API的1000条上限时停止。
+        """
+        search_query = query
+        if language:
+            search_query += f" language:{language}"
+        
+        params = {
+            "q": search_query,
+            "sort": sort,
+            "order": order,
+            "per_page": min(per_page, 100)
+        }
+        
+        app_logger.info(f"Iterating repositories with query: {search_query} (limit={limit})")
+        
+        async for repo in self._paginate("search/repositories", params, limit):
+            self.search_index.add((repo,))
+            yield repo
+    
+    async def iter_search_users(self, query: str, type: Optional[str] = None,
+                                limit: Optional[int] = None, per_page: int = 100,
+                                with_details: bool = False) -> AsyncIterator[User]:
+        """逐条迭代用户搜索结果，自动跟随Link分页
+        
+        with_details为True时按页获取用户详细信息（每个用户额外消耗一次配额）。
+        """
+        search_query = query
+        if type:
+            search_query += f" type:{type}"
+        
+        params = {
+            "q": search_query,
+            "per_page": min(per_page, 100)
+        }
+        
+        app_logger.info(f"Iterating users with query: {search_query} (limit={limit})")
+        
+        if not with_details:
+            async for user in self._paginate("search/users", params, limit):
+                yield user
+            return
+        
+        page: List[User] = []
+        async for user in self._paginate("search/users", params, limit):
+            page.append(user)
+            if len(page) >= params["per_page"]:
+                for detailed in await self._get_users_details_parallel(page):
+                    yield detailed
+                page = []
+        for detailed in await self._get_users_details_parallel(page):
+            yield detailed
+    
+    async def _paginate(self, endpoint: str, params: Dict, limit: Optional[int]) -> AsyncIterator[Dict]:
+        """跟随Link: rel="next"逐页获取搜索结果，并预取下一页"""
+        limit = SEARCH_RESULT_CAP if limit is None else min(limit, SEARCH_RESULT_CAP)
+        if limit <= 0:
+            return
+        params = dict(params, per_page=min(params.get("per_page", 100), limit))
+        
+        yielded = 0
+        pending: Optional[asyncio.Task] = asyncio.ensure_future(self._request("GET", endpoint, params))
+        try:
+            while pending is not None:
+                data, links = await pending
+                pending = None
+                items = data.get("items", [])
+                
+                next_params = self._next_page_params(params, links)
+                if next_params is not None and items and yielded + len(items) < limit:
+                    # 预取下一页，与调用方处理当前页并行
+                    params = next_params
+                    pending = asyncio.ensure_future(self._request("GET", endpoint, params))
+                
+                for item in items:
+                    yield item
+                    yielded += 1
+                    if yielded >= limit:
+                        return
+        finally:
+            if pending is not None:
+                if pending.done():
+                    if not pending.cancelled():
+                        pending.exception()
+                else:
+                    pending.cancel()
+    
+    @staticmethod
+    def _next_page_params(params: Dict, links: Dict[str, str]) -> Optional[Dict]:
+        """根据Link头中的next链接计算下一页的请求参数"""
+        next_url = links.get("next")
+        if not next_url:
+            return None
+        page = parse_qs(urlparse(next_url).query).get("page")
+        if not page:
+            return None
+        return dict(params, page=page[0])
+    
+    async def get_repository_info(self, owner: str, repo: str) -> Repository:
         """获取特定仓库的详细信息"""
         endpoint = f"repos/{owner}/{repo}"
         app_logger.info(f"Getting repository info for: {owner}/{repo}")
         
         try:
             data = await self._make_request("GET", endpoint)
+            self.search_index.add((data,))
             return data
         except Exception as e:
             app_logger.error(f"Error getting repository info: {str(e)}")
             raise
     
-    async def search_users(self, query: str, type: Optional[str] = None, per_page: int = 10) -> List[Dict]:
-        """搜索GitHub用户"""
+    async def search_users(self, query: str, type: Optional[str] = None, per_page: int = 10,
+                           page: int = 1, with_details: bool = True) -> List[User]:
+        """搜索GitHub用户（with_details为False时只返回搜索结果中的基本字段，不额外消耗配额）"""
         search_query = query
         if type:
             search_query += f" type:{type}"
@@ -97,6 +474,8 @@ class GitHubClient:
             "q": search_query,
             "per_page": min(per_page, 100)
         }
+        if page > 1:
+            params["page"] = page
         
         app_logger.info(f"Searching users with query: {search_query}")
         
@@ -104,6 +483,8 @@ class GitHubClient:
             data = await self._make_request("GET", "search/users", params)
             users = data.get("items", [])
             app_logger.info(f"Found {len(users)} users")
+            if not with_details:
+                return users
             
             # 并行获取每个用户的详细信息（包含完整统计数据）
             detailed_users = await self._get_users_details_parallel(users)
@@ -112,7 +493,7 @@ class GitHubClient:
             app_logger.error(f"Error searching users: {str(e)}")
             raise
 
-    async def get_user_info(self, username: str) -> Dict:
+    async def get_user_info(self, username: str) -> User:
         """获取特定用户的详细信息"""
         endpoint = f"users/{username}"
         app_logger.debug(f"Getting user info for: {username}")
@@ -124,7 +505,147 @@ class GitHubClient:
             app_logger.error(f"Error getting user info: {str(e)}")
             raise
 
-    async def _get_user_details_safe(self, user: Dict) -> Dict:
+    @property
+    def graphql_enabled(self) -> bool:
+        """GraphQL批量查询需要开启配置且提供Token"""
+        return config.GITHUB_USE_GRAPHQL and bool(config.GITHUB_TOKEN)
+    
+    async def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict:
+        """执行GraphQL查询（只读查询可安全重试）"""
+        data, _ = await self._fetch(
+            "POST", config.get_graphql_url(), "graphql", None, None,
+            json_body={"query": query, "variables": variables},
+            idempotent=True
+        )
+        errors = data.get("errors") or []
+        if any(error.get("type") == "RATE_LIMITED" for error in errors):
+            raise RateLimitError("GitHub GraphQL rate limit exceeded", resource="graphql")
+        if data.get("data") is None:
+            message = errors[0].get("message") if errors else "empty response"
+            raise Exception(f"GitHub GraphQL error: {message}")
+        return data["data"]
+    
+    async def get_users_info_batch(self, logins: List[str]) -> Dict[str, Optional[User]]:
+        """通过GraphQL批量获取用户详细信息
+        
+        每个查询最多包含GITHUB_GRAPHQL_BATCH_SIZE个用户，返回 {login: 用户信息}，
+        不存在的用户对应None。字段结构与REST users/{login} 保持一致。
+        """
+        logins = list(dict.fromkeys(logins))
+        if not logins:
+            return {}
+        
+        chunks = chunked(logins, config.GITHUB_GRAPHQL_BATCH_SIZE)
+        app_logger.info(f"GraphQL批量获取 {len(logins)} 个用户（{len(chunks)} 次查询）")
+        
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, Optional[User]]:
+            query, variables = build_users_query(chunk)
+            data = await self._graphql(query, variables)
+            users = User.parse_many(user_from_graphql(data.get(f"u{i}")) for i in range(len(chunk)))
+            return dict(zip(chunk, users))
+        
+        results: Dict[str, Optional[User]] = {}
+        for part in await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks]):
+            results.update(part)
+        return results
+    
+    async def get_repositories_info_batch(self, repos: List[Tuple[str, str]]) -> Dict[str, Optional[Repository]]:
+        """通过GraphQL批量获取仓库详细信息
+        
+        repos为 (owner, repo) 列表，返回 {"owner/repo": 仓库信息}，不存在的仓库对应None。
+        字段结构与REST repos/{owner}/{repo} 的常用字段保持一致。
+        """
+        repos = list(dict.fromkeys(repos))
+        if not repos:
+            return {}
+        
+        chunks = chunked(repos, config.GITHUB_GRAPHQL_BATCH_SIZE)
+        app_logger.info(f"GraphQL批量获取 {len(repos)} 个仓库（{len(chunks)} 次查询）")
+        
+        results: Dict[str, Optional[Repository]] = {}
+        for part in await asyncio.gather(*[self._graphql_repositories(chunk) for chunk in chunks]):
+            results.update(part)
+        return results
+    
+    async def _graphql_repositories(self, chunk: List[Tuple[str, str]]) -> Dict[str, Optional[Repository]]:
+        """一次GraphQL查询获取一批仓库"""
+        query, variables = build_repositories_query(chunk)
+        data = await self._graphql(query, variables)
+        repositories = Repository.parse_many(repository_from_graphql(data.get(f"r{i}")) for i in range(len(chunk)))
+        results = {f"{owner}/{repo}": repository for (owner, repo), repository in zip(chunk, repositories)}
+        self.search_index.add(results.values())
+        return results
+    
+    async def get_repositories_info(self, repos: Iterable[Union[str, Tuple[str, str]]]) -> AsyncIterator[Dict]:
+        """批量获取仓库信息，按完成顺序逐个产出结果
+        
+        repos可以是 "owner/repo" 字符串或 (owner, repo) 元组，重复项（不区分大小写）只获取一次。
+        每个结果为 {"repo": "owner/repo", "data": 仓库信息或None, "error": 错误信息或None, "source": 来源}，
+        单个仓库失败不影响其他仓库。缓存中已有的仓库立即返回；其余仓库启用GraphQL时分批查询，
+        否则通过REST并发获取（GraphQL批次失败时该批次也退回REST），并发数由进程级自适应限制器控制。
+        """
+        pending: List[Tuple[str, str]] = []
+        seen = set()
+        for item in repos:
+            owner, _, name = item.partition("/") if isinstance(item, str) else (item[0], "/", item[1])
+            owner, name = owner.strip(), name.strip()
+            full_name = f"{owner}/{name}"
+            if full_name.lower() in seen:
+                continue
+            seen.add(full_name.lower())
+            if not owner or not name or "/" in name:
+                yield {"repo": item if isinstance(item, str) else full_name, "data": None,
+                       "error": "Invalid repository name", "source": None}
+                continue
+            
+            # 未命中时get_repository_info会再查一次缓存，这里不重复计入未命中
+            cached = self.cache.get(ResponseCache.make_key("GET", f"repos/{owner}/{name}"), record_miss=False)
+            if cached is not None:
+                yield {"repo": full_name, "data": cached, "error": None, "source": "cache"}
+            else:
+                pending.append((owner, name))
+        
+        if not pending:
+            return
+        app_logger.info(f"Bulk fetching {len(pending)} repositories ({len(seen) - len(pending)} cached or invalid)")
+        
+        async def fetch_rest(owner: str, name: str) -> List[Dict]:
+            try:
+                data = await self.get_repository_info(owner, name)
+                return [{"repo": f"{owner}/{name}", "data": data, "error": None, "source": "rest"}]
+            except Exception as e:
+                return [{"repo": f"{owner}/{name}", "data": None, "error": str(e), "source": "rest"}]
+        
+        async def fetch_graphql(chunk: List[Tuple[str, str]]) -> List[Dict]:
+            try:
+                found = await self._graphql_repositories(chunk)
+            except Exception as e:
+                app_logger.warning(f"GraphQL batch failed, falling back to REST: {str(e)}")
+                results = []
+                for part in await asyncio.gather(*[fetch_rest(owner, name) for owner, name in chunk]):
+                    results.extend(part)
+                return results
+            return [
+                {"repo": full_name, "data": data, "error": None if data else "Resource not found",
+                 "source": "graphql"}
+                for full_name, data in found.items()
+            ]
+        
+        if self.graphql_enabled:
+            tasks = [fetch_graphql(chunk) for chunk in chunked(pending, config.GITHUB_GRAPHQL_BATCH_SIZE)]
+        else:
+            tasks = [fetch_rest(owner, name) for owner, name in pending]
+        
+        futures = [asyncio.ensure_future(task) for task in tasks]
+        try:
+            for future in asyncio.as_completed(futures):
+                for result in await future:
+                    yield result
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    async def _get_user_details_safe(self, user: User) -> User:
         """安全获取单个用户详细信息"""
         try:
             detailed_user = await self.get_user_info(user['login'])
@@ -134,23 +655,25 @@ class GitHubClient:
             # 如果获取详细信息失败，使用基本信息
             return user
 
-    async def _get_users_details_parallel(self, users: List[Dict]) -> List[Dict]:
+    async def _get_users_details_parallel(self, users: List[User]) -> List[User]:
         """并行获取多个用户的详细信息"""
         if not users:
             return []
         
-        app_logger.info(f"并行获取 {len(users)} 个用户的详细信息")
-        
-        # 使用 asyncio.gather 并行处理，但限制并发数量避免触发rate limit
-        semaphore = asyncio.Semaphore(5)  # 最多同时5个请求
+        if self.graphql_enabled:
+            # 一次GraphQL查询获取整批用户，失败时回退到逐个REST请求
+            try:
+                details = await self.get_users_info_batch([user['login'] for user in users])
+                return [details.get(user['login']) or user for user in users]
+            except Exception as e:
+                app_logger.warning(f"GraphQL批量获取用户失败，回退到REST: {str(e)}")
         
-        async def limited_get_details(user):
-            async with semaphore:
-                return await self._get_user_details_safe(user)
+        app_logger.info(f"并行获取 {len(users)} 个用户的详细信息")
         
+        # 使用 asyncio.gather 并行处理，实际并发数由进程级自适应限制器控制
         try:
             detailed_users = await asyncio.gather(
-                *[limited_get_details(user) for user in users],
+                *[self._get_user_details_safe(user) for user in users],
                 return_exceptions=False
             )
             return detailed_users
@@ -163,12 +686,18 @@ class GitHubClient:
     async def get_api_info(self) -> Dict:
         """获取API信息"""
         try:
-            data = await self._make_request("GET", "rate_limit")
+            data = await self._make_request("GET", "rate_limit", use_cache=False)
             return {
                 "api_status": "connected",
                 "rate_limit": data.get("rate", {}),
                 "authenticated": bool(config.GITHUB_TOKEN),
-                "base_url": self.base_url
+                "base_url": self.base_url,
+                "cache": self.cache.stats(),
+                "disk_cache": self.disk_cache.stats() if self.disk_cache.enabled else None,
+                "budget": self.scheduler.budget(),
+                "inflight": self.inflight.stats(),
+                "concurrency": self.limiter.stats(),
+                "search_index": self.search_index.stats() if self.search_index.enabled else None
             }
         except Exception as e:
             return {
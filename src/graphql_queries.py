@@ -0,0 +1,151 @@
+"""
+GitHub GraphQL批量查询
+构造带别名的批量查询语句，并把GraphQL结果转换为与REST API一致的字段结构
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+_USER_FIELDS = """
+    __typename
+    login
+    url
+    avatarUrl
+    repositories(privacy: PUBLIC) { totalCount }
+    ... on User {
+      name
+      location
+      createdAt
+      databaseId
+      bio
+      company
+      followers { totalCount }
+      following { totalCount }
+    }
+    ... on Organization {
+      name
+      location
+      createdAt
+      databaseId
+      description
+    }
+"""
+
+_REPOSITORY_FIELDS = """
+    databaseId
+    name
+    nameWithOwner
+    owner { login }
+    description
+    url
+    homepageUrl
+    stargazerCount
+    forkCount
+    isFork
+    isArchived
+    diskUsage
+    createdAt
+    updatedAt
+    pushedAt
+    primaryLanguage { name }
+    licenseInfo { name spdxId }
+    defaultBranchRef { name }
+    watchers { totalCount }
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+"""
+
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    """按固定大小切分列表"""
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def build_users_query(logins: List[str]) -> Tuple[str, Dict[str, str]]:
+    """构造批量查询用户/组织的GraphQL语句，返回 (query, variables)"""
+    declarations = []
+    selections = []
+    variables = {}
+    for i, login in enumerate(logins):
+        declarations.append(f"$l{i}: String!")
+        selections.append(f"  u{i}: repositoryOwner(login: $l{i}) {{{_USER_FIELDS}  }}")
+        variables[f"l{i}"] = login
+    query = f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}"
+    return query, variables
+
+
+def build_repositories_query(repos: List[Tuple[str, str]]) -> Tuple[str, Dict[str, str]]:
+    """构造批量查询仓库的GraphQL语句，返回 (query, variables)"""
+    declarations = []
+    selections = []
+    variables = {}
+    for i, (owner, name) in enumerate(repos):
+        declarations.append(f"$o{i}: String!, $n{i}: String!")
+        selections.append(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{{_REPOSITORY_FIELDS}  }}")
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+    query = f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}"
+    return query, variables
+
+
+def _total(node: Optional[Dict], key: str) -> int:
+    value = (node or {}).get(key) or {}
+    return value.get("totalCount", 0)
+
+
+def user_from_graphql(node: Optional[Dict]) -> Optional[Dict]:
+    """将GraphQL用户/组织节点转换为REST users/{login} 的字段结构"""
+    if not node:
+        return None
+    return {
+        "login": node.get("login"),
+        "id": node.get("databaseId"),
+        "type": "Organization" if node.get("__typename") == "Organization" else "User",
+        "name": node.get("name"),
+        "bio": node.get("bio") or node.get("description"),
+        "company": node.get("company"),
+        "location": node.get("location"),
+        "html_url": node.get("url"),
+        "avatar_url": node.get("avatarUrl"),
+        "created_at": node.get("createdAt"),
+        "public_repos": _total(node, "repositories"),
+        "followers": _total(node, "followers"),
+        "following": _total(node, "following"),
+    }
+
+
+def repository_from_graphql(node: Optional[Dict]) -> Optional[Dict]:
+    """将GraphQL仓库节点转换为REST repos/{owner}/{repo} 的字段结构"""
+    if not node:
+        return None
+    license_info = node.get("licenseInfo")
+    topics = ((node.get("repositoryTopics") or {}).get("nodes")) or []
+    return {
+        "id": node.get("databaseId"),
+        "name": node.get("name"),
+        "full_name": node.get("nameWithOwner"),
+        "owner": {"login": (node.get("owner") or {}).get("login")},
+        "description": node.get("description"),
+        "html_url": node.get("url"),
+        "homepage": node.get("homepageUrl") or None,
+        "stargazers_count": node.get("stargazerCount", 0),
+        # REST API中watchers_count等于星标数，订阅者数量为subscribers_count
+        "watchers_count": node.get("stargazerCount", 0),
+        "subscribers_count": _total(node, "watchers"),
+        "forks_count": node.get("forkCount", 0),
+        "open_issues_count": _total(node, "issues") + _total(node, "pullRequests"),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "size": node.get("diskUsage") or 0,
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "pushed_at": node.get("pushedAt"),
+        "license": {
+            "name": license_info.get("name"),
+            "spdx_id": license_info.get("spdxId"),
+        } if license_info else None,
+        "default_branch": (node.get("defaultBranchRef") or {}).get("name"),
+        "fork": node.get("isFork", False),
+        "archived": node.get("isArchived", False),
+        "topics": [item["topic"]["name"] for item in topics if item and item.get("topic")],
+    }
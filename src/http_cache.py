@@ -0,0 +1,75 @@
+"""
+HTTP缓存头工具
+为静态页面和结果页面生成强ETag、处理If-None-Match（返回304）并设置Cache-Control
+"""
+
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+
+from src.config import config
+from src.utils.templates import StaticAsset
+
+# 静态资源URL带内容哈希，可以永久缓存
+IMMUTABLE = "public, max-age=31536000, immutable"
+# 页面内容可能随部署变化，每次都向服务器确认（ETag未变时返回304）
+REVALIDATE = "no-cache"
+
+_ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def make_etag(body: bytes) -> str:
+    """根据内容生成强ETag"""
+    return f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match是否命中（弱比较；压缩中间件加上的编码后缀视为同一内容）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        for suffix in _ENCODING_SUFFIXES:
+            if candidate.endswith(f'{suffix}"'):
+                candidate = candidate[:-len(suffix) - 1] + '"'
+                break
+        if candidate == target:
+            return True
+    return False
+
+
+def page_cache_control(max_age: Optional[int] = None) -> str:
+    """结果页面的Cache-Control：缓存时间与GitHub数据的缓存时间一致"""
+    max_age = config.CACHE_TTL if max_age is None else max_age
+    return f"private, max-age={max_age}" if max_age > 0 else "no-cache"
+
+
+def asset_response(asset: StaticAsset, request: Request, cache_control: str) -> Response:
+    """返回启动时生成的内容，按Accept-Encoding选择预压缩版本，ETag命中时返回304"""
+    body, encoding, etag = asset.select(request.headers.get("accept-encoding"))
+    headers: Dict[str, str] = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), asset.etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=asset.media_type, headers=headers)
+
+
+def html_response(request: Request, html: str, max_age: Optional[int] = None) -> Response:
+    """返回动态生成的HTML页面，附带强ETag和Cache-Control
+
+    GET/HEAD请求的ETag命中时返回304；压缩由CompressionMiddleware负责。
+    """
+    body = html.encode("utf-8")
+    etag = make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": page_cache_control(max_age)}
+    if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=body, headers=headers)
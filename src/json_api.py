@@ -0,0 +1,130 @@
+"""
+JSON API工具
+字段投影（fields=）、游标分页和JSON编码（安装orjson时使用orjson）
+"""
+
+import base64
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from src.http_cache import etag_matches, make_etag, page_cache_control
+from src.models import Record, json_default, raw_many
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+Fields = List[Tuple[str, ...]]
+
+_FIELD_PATTERN = re.compile(r"^\w+(\.\w+)*$")
+
+
+class BadRequestError(Exception):
+    """请求参数无效（fields、cursor），API返回400"""
+
+
+def dumps(data: Any) -> bytes:
+    """把数据编码为紧凑的UTF-8 JSON（记录类型输出完整的原始数据）"""
+    if orjson is not None:
+        return orjson.dumps(data, default=json_default)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=json_default).encode("utf-8")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Fields]:
+    """解析 fields=full_name,stargazers_count,owner.login，未指定时返回None（返回全部字段）"""
+    if not fields or not fields.strip():
+        return None
+    parsed: Fields = []
+    for name in fields.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if not _FIELD_PATTERN.match(name):
+            raise BadRequestError(f"Invalid field name: {name}")
+        parsed.append(tuple(name.split(".")))
+    return parsed or None
+
+
+def top_level_fields(fields: Optional[Fields]) -> Optional[set]:
+    """投影涉及的顶层字段名"""
+    return None if fields is None else {path[0] for path in fields}
+
+
+def project(data: Mapping, fields: Optional[Fields]) -> Dict:
+    """只保留请求的字段（支持用点号访问嵌套字段），不存在的字段忽略
+
+    记录类型的紧凑字段不够用时（包括未指定fields）使用完整的原始数据。
+    """
+    if isinstance(data, Record) and not data.covers(fields):
+        data = data.raw
+    if fields is None:
+        return data
+    result: Dict = {}
+    for path in fields:
+        value: Any = data
+        for key in path:
+            if not isinstance(value, Mapping) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = result
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+    return result
+
+
+def project_many(items: Iterable[Mapping], fields: Optional[Fields]) -> List[Dict]:
+    """批量投影，需要原始数据的记录按响应整体解压一次"""
+    items = list(items)
+    needs_raw = [isinstance(item, Record) and not item.covers(fields) for item in items]
+    raws = iter(raw_many(item for item, raw in zip(items, needs_raw) if raw))
+    return [project(next(raws) if raw else item, fields) for item, raw in zip(items, needs_raw)]
+
+
+def _scope_digest(scope: Dict) -> str:
+    return hashlib.sha256(dumps(sorted(scope.items()))).hexdigest()[:12]
+
+
+def encode_cursor(scope: Dict, page: int) -> str:
+    """生成分页游标，游标与查询条件绑定，不能用于其他查询"""
+    payload = json.dumps({"s": _scope_digest(scope), "p": page}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], scope: Dict) -> int:
+    """解析分页游标，返回页码；游标无效或与查询条件不匹配时抛出BadRequestError"""
+    if not cursor:
+        return 1
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        page = int(payload["p"])
+        digest = payload["s"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise BadRequestError("Invalid cursor") from e
+    if digest != _scope_digest(scope) or page < 1:
+        raise BadRequestError("Cursor does not match this query")
+    return page
+
+
+def json_response(request: Request, data: Any, max_age: Optional[int] = None,
+                  status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """返回JSON响应，成功的响应附带强ETag和与数据缓存时间一致的Cache-Control"""
+    body = dumps(data)
+    headers = dict(headers or {})
+    if status_code != 200:
+        headers.setdefault("Cache-Control", "no-store")
+        return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+    etag = make_etag(body)
+    headers.update({"ETag": etag, "Cache-Control": page_cache_control(max_age)})
+    if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
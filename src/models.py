@@ -0,0 +1,247 @@
+"""
+GitHub数据模型
+紧凑的 __slots__ 记录类型，只保留格式化输出和本地索引用到的字段；
+原始JSON按响应整体压缩保存，通过 .raw 无损取回全部字段
+"""
+
+import json
+import sys
+import zlib
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+_MISSING = object()
+
+
+class RawStore:
+    """同一次响应中所有记录的原始JSON，合并后整体压缩（比逐条压缩更快、更小）"""
+
+    __slots__ = ("_data", "_length")
+
+    def __init__(self, data: bytes):
+        self._data = zlib.compress(data, 1)
+        self._length = len(data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def share(self, length: int) -> int:
+        """长度为length的一段原始数据分摊到的压缩后字节数"""
+        return sys.getsizeof(self._data) * length // max(self._length, 1)
+
+    def inflate(self) -> bytes:
+        return zlib.decompress(self._data)
+
+
+def _encode(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class Record(Mapping):
+    """只读的紧凑记录
+
+    行为与原来的dict一致（get、[]、in、遍历），但只包含FIELDS中的字段，
+    原始数据中不存在的字段同样不存在。NESTED中的字段会解析为对应的记录类型。
+    """
+
+    __slots__ = ("_raw",)
+
+    FIELDS: Tuple[str, ...] = ()
+    NESTED: Dict[str, type] = {}
+
+    def __init__(self, data: Dict[str, Any], raw: Optional[Tuple[RawStore, int, int]] = None):
+        nested = self.NESTED
+        for name in self.FIELDS:
+            value = data.get(name, _MISSING)
+            if name in nested and isinstance(value, dict):
+                value = nested[name](value)
+            elif isinstance(value, list):
+                value = tuple(value)
+            setattr(self, name, value)
+        # (共享的压缩数据, 起始偏移, 结束偏移)，为None时只保留紧凑字段
+        self._raw = raw
+
+    @classmethod
+    def parse(cls, data: Optional[Dict[str, Any]]) -> Optional["Record"]:
+        """把GitHub返回的dict解析为记录，None原样返回"""
+        return cls.parse_many((data,))[0]
+
+    @classmethod
+    def parse_many(cls, items: Iterable[Optional[Dict[str, Any]]]) -> List[Optional["Record"]]:
+        """批量解析，所有记录的原始数据一起压缩保存"""
+        items = list(items)
+        chunks: List[bytes] = []
+        spans: List[Tuple[int, int]] = []
+        position = 0
+        for item in items:
+            chunk = b"" if item is None or isinstance(item, Record) else _encode(item)
+            chunks.append(chunk)
+            spans.append((position, position + len(chunk)))
+            position += len(chunk)
+        store = RawStore(b"".join(chunks)) if position else None
+        records: List[Optional[Record]] = []
+        for item, (start, end) in zip(items, spans):
+            if item is None or isinstance(item, Record):
+                records.append(item)
+            else:
+                records.append(cls(item, (store, start, end)))
+        return records
+
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key, _MISSING) if key in self.FIELDS else _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if getattr(self, name) is not _MISSING:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """紧凑字段转换为普通dict（可直接JSON序列化）"""
+        result = {}
+        for name in self:
+            value = getattr(self, name)
+            if isinstance(value, Record):
+                value = value.to_dict()
+            elif isinstance(value, tuple):
+                value = list(value)
+            result[name] = value
+        return result
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """GitHub返回的完整原始数据（每次调用返回新的dict；同一响应的多条记录用raw_many）"""
+        if self._raw is None:
+            return self.to_dict()
+        store, start, end = self._raw
+        return json.loads(store.inflate()[start:end])
+
+    @classmethod
+    def covers(cls, paths: Optional[Sequence[Tuple[str, ...]]]) -> bool:
+        """字段路径（如 ("owner", "login")）是否都能由紧凑字段回答（None表示需要全部字段）
+
+        嵌套记录只包含部分字段，请求整个嵌套对象（如 owner）时需要原始数据。
+        """
+        if paths is None:
+            return False
+        for path in paths:
+            record = cls
+            for index, key in enumerate(path):
+                if key not in record.FIELDS:
+                    return False
+                nested = record.NESTED.get(key)
+                if index == len(path) - 1:
+                    if nested is not None:
+                        return False
+                elif nested is None:
+                    return False
+                else:
+                    record = nested
+        return True
+
+    def footprint(self) -> int:
+        """估算占用的内存字节数（包括分摊的压缩原始数据），用于缓存容量统计"""
+        size = sys.getsizeof(self)
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is _MISSING or value is None or isinstance(value, bool):
+                continue
+            if isinstance(value, Record):
+                size += value.footprint()
+            elif isinstance(value, tuple):
+                size += sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+            else:
+                size += sys.getsizeof(value)
+        if self._raw is not None:
+            store, start, end = self._raw
+            size += sys.getsizeof(self._raw) + store.share(end - start)
+        return size
+
+
+class License(Record):
+    """开源许可证"""
+
+    FIELDS = ("key", "name", "spdx_id")
+    __slots__ = FIELDS
+
+
+class User(Record):
+    """GitHub用户或组织（也用于仓库的owner）"""
+
+    FIELDS = (
+        "login", "id", "type", "name", "bio", "company", "location", "blog", "html_url", "avatar_url",
+        "public_repos", "followers", "following", "created_at",
+    )
+    __slots__ = FIELDS
+
+
+class Repository(Record):
+    """GitHub仓库"""
+
+    FIELDS = (
+        "id", "name", "full_name", "owner", "description", "html_url", "homepage", "language", "topics",
+        "stargazers_count", "watchers_count", "subscribers_count", "forks_count", "open_issues_count", "size",
+        "created_at", "updated_at", "pushed_at", "license", "default_branch", "fork", "archived",
+    )
+    __slots__ = FIELDS
+    NESTED = {"owner": User, "license": License}
+
+
+def raw_many(records: Iterable[Record]) -> List[Dict[str, Any]]:
+    """批量取回原始数据，来自同一响应的记录只解压一次"""
+    inflated: Dict[RawStore, bytes] = {}
+    result = []
+    for record in records:
+        if record._raw is None:
+            result.append(record.to_dict())
+            continue
+        store, start, end = record._raw
+        data = inflated.get(store)
+        if data is None:
+            data = inflated[store] = store.inflate()
+        result.append(json.loads(data[start:end]))
+    return result
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps的default参数：记录序列化为完整的原始数据"""
+    if isinstance(value, Record):
+        return value.raw
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def payload_size(data: Any, default: int) -> int:
+    """缓存容量统计用的大小：包含记录时按紧凑结构估算，否则使用default（响应体字节数）"""
+    if isinstance(data, Record):
+        return data.footprint()
+    items = data.get("items") if isinstance(data, dict) else None
+    if isinstance(items, list) and any(isinstance(item, Record) for item in items):
+        return (sys.getsizeof(data) + sys.getsizeof(items)
+                + sum(item.footprint() for item in items if isinstance(item, Record)))
+    return default
+
+
+def parse_payload(endpoint: str, data: Any) -> Any:
+    """按REST端点把响应解析为记录类型，其他端点的响应原样返回"""
+    if not isinstance(data, dict):
+        return data
+    parts = endpoint.strip("/").split("/")
+    if parts[0] == "search" and len(parts) == 2 and parts[1] in ("repositories", "users"):
+        record = Repository if parts[1] == "repositories" else User
+        items = data.get("items")
+        if isinstance(items, list):
+            data = dict(data, items=record.parse_many(items))
+        return data
+    if parts[0] == "repos" and len(parts) == 3:
+        return Repository.parse(data)
+    if parts[0] == "users" and len(parts) == 2:
+        return User.parse(data)
+    return data
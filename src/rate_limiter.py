@@ -0,0 +1,252 @@
+"""
+GitHub限流调度器
+根据X-RateLimit响应头分别跟踪core/search等配额，平滑发送请求并按优先级排队
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from src.config import config
+from src.utils.logger import app_logger
+
+# 请求优先级：数值越小越优先
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+_request_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "github_request_priority", default=PRIORITY_INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """在当前上下文内设置GitHub请求优先级（后台任务使用PRIORITY_BACKGROUND）"""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def current_priority() -> int:
+    """获取当前上下文的请求优先级"""
+    return _request_priority.get()
+
+
+class RateLimitError(Exception):
+    """GitHub配额耗尽或触发二级限流"""
+
+    def __init__(self, message: str, resource: str = "core",
+                 reset_at: Optional[float] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.resource = resource
+        self.reset_at = reset_at
+        self.retry_after = retry_after
+
+
+def resource_for_endpoint(endpoint: str) -> Optional[str]:
+    """根据API端点推断所属的配额类型，不消耗配额的端点返回None"""
+    endpoint = endpoint.lstrip("/")
+    if endpoint.startswith("rate_limit"):
+        return None
+    if endpoint.startswith("search/code"):
+        return "code_search"
+    if endpoint.startswith("search/"):
+        return "search"
+    if endpoint.startswith("graphql"):
+        return "graphql"
+    return "core"
+
+
+class QuotaBucket:
+    """单个配额的令牌桶
+
+    令牌数即剩余配额：每次发送前在本地扣减，收到响应头后与服务端同步，
+    窗口重置时恢复为上限。剩余配额低于预留比例时，按距重置的时间均匀放行。
+    """
+
+    def __init__(self, name: str, limit: int, window: float):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at: Optional[float] = None  # Unix时间戳
+        self.blocked_until = 0.0  # 二级限流导致的暂停（Unix时间戳）
+        self.last_sent = 0.0
+
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def delay(self, now: float) -> float:
+        """计算当前还需等待多久才能发送下一个请求（秒）"""
+        if self.reset_at is not None and now >= self.reset_at:
+            # 配额窗口已重置
+            self.remaining = self.limit
+            self.reset_at = None
+
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        if self.remaining <= 0:
+            reset_at = self.reset_at if self.reset_at is not None else now + self.window
+            self.reset_at = reset_at
+            return max(reset_at - now, 0.0)
+
+        reserve = self.limit * config.GITHUB_RATE_LIMIT_RESERVE
+        if self.reset_at is not None and self.remaining <= reserve:
+            interval = (self.reset_at - now) / (self.remaining + 1)
+            return max(self.last_sent + interval - now, 0.0)
+
+        return 0.0
+
+    def take(self, now: float) -> None:
+        self.remaining -= 1
+        self.last_sent = now
+
+    def refund(self) -> None:
+        """归还一次本地扣减的配额（如304响应不计入配额）"""
+        self.remaining = min(self.remaining + 1, self.limit)
+
+    def update(self, limit: int, remaining: int, reset_at: float) -> None:
+        """根据响应头同步配额状态"""
+        if self.reset_at is None or reset_at > self.reset_at + 1:
+            # 新的配额窗口，以服务端数值为准
+            self.remaining = remaining
+        else:
+            # 同一窗口内并发请求的响应可能乱序到达，取较小值
+            self.remaining = min(self.remaining, remaining)
+        self.limit = limit
+        self.reset_at = reset_at
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": max(self.remaining, 0),
+            "reset_at": int(self.reset_at) if self.reset_at else None,
+            "reset_in": round(max(self.reset_at - now, 0.0), 1) if self.reset_at else None,
+            "blocked_for": round(max(self.blocked_until - now, 0.0), 1),
+            "queued": sum(1 for _, _, fut in self._waiters if not fut.done())
+        }
+
+
+class RateLimitScheduler:
+    """进程级GitHub请求调度器
+
+    所有GitHubClient共享同一份配额状态（配额按Token计算）。
+    """
+
+    def __init__(self):
+        authenticated = bool(config.GITHUB_TOKEN)
+        self._defaults = {
+            "core": (config.GITHUB_API_RATE_LIMIT if authenticated else 60, 3600.0),
+            "search": (config.GITHUB_SEARCH_RATE_LIMIT if authenticated else 10, 60.0),
+            "code_search": (10, 60.0),
+            "graphql": (5000 if authenticated else 0, 3600.0),
+        }
+        self._buckets: Dict[str, QuotaBucket] = {}
+        self._sequence = itertools.count()
+
+    def bucket(self, resource: str) -> QuotaBucket:
+        bucket = self._buckets.get(resource)
+        if bucket is None:
+            limit, window = self._defaults.get(resource, self._defaults["core"])
+            bucket = QuotaBucket(resource, limit, window)
+            self._buckets[resource] = bucket
+        return bucket
+
+    async def acquire(self, resource: str, priority: Optional[int] = None) -> None:
+        """获取一次请求配额，配额不足时按优先级排队等待"""
+        if priority is None:
+            priority = current_priority()
+        bucket = self.bucket(resource)
+        now = time.time()
+        delay = bucket.delay(now)
+
+        if delay <= 0 and not bucket._waiters:
+            bucket.take(now)
+            return
+
+        if delay > config.GITHUB_API_TIMEOUT:
+            # 需要等待的时间远超请求超时，直接失败而不是挂起
+            raise RateLimitError(
+                f"GitHub API rate limit exceeded for '{resource}', resets in {int(delay)}s",
+                resource=resource, reset_at=bucket.reset_at, retry_after=delay
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(bucket._waiters, (priority, next(self._sequence), future))
+        app_logger.debug(f"Rate limiter queued {resource} request (priority={priority}, delay={delay:.2f}s)")
+        self._dispatch(bucket)
+        await future
+
+    def update_from_headers(self, resource: str, headers: Mapping[str, str]) -> str:
+        """根据X-RateLimit-*响应头更新配额，返回实际的配额类型"""
+        resource = headers.get("X-RateLimit-Resource", resource)
+        try:
+            limit = int(headers["X-RateLimit-Limit"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_at = float(headers["X-RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return resource
+
+        bucket = self.bucket(resource)
+        bucket.update(limit, remaining, reset_at)
+        self._dispatch(bucket)
+        return resource
+
+    def refund(self, resource: str) -> None:
+        """归还一次配额并尝试放行排队请求"""
+        bucket = self.bucket(resource)
+        bucket.refund()
+        self._dispatch(bucket)
+
+    def block(self, resource: str, seconds: float) -> None:
+        """触发二级限流时暂停该配额的请求发送"""
+        bucket = self.bucket(resource)
+        bucket.blocked_until = max(bucket.blocked_until, time.time() + seconds)
+        app_logger.warning(f"GitHub {resource} requests paused for {seconds:.0f}s (secondary rate limit)")
+
+    def budget(self) -> Dict[str, Dict[str, Any]]:
+        """返回当前各配额的预算情况"""
+        now = time.time()
+        return {name: bucket.snapshot(now) for name, bucket in self._buckets.items()}
+
+    def _dispatch(self, bucket: QuotaBucket) -> None:
+        """按优先级放行排队的请求，配额不足时定时重试"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if bucket._timer is not None:
+            if bucket._timer_loop is loop and not bucket._timer.cancelled():
+                bucket._timer.cancel()
+            bucket._timer = None
+
+        while bucket._waiters:
+            _, _, future = bucket._waiters[0]
+            if future.done() or future.get_loop() is not loop:
+                # 已取消或属于已关闭的事件循环
+                heapq.heappop(bucket._waiters)
+                continue
+
+            now = time.time()
+            delay = bucket.delay(now)
+            if delay > 0:
+                bucket._timer = loop.call_later(delay, self._dispatch, bucket)
+                bucket._timer_loop = loop
+                return
+
+            heapq.heappop(bucket._waiters)
+            bucket.take(now)
+            future.set_result(None)
+
+
+# 全局调度器实例
+rate_limiter = RateLimitScheduler()
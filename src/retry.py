@@ -0,0 +1,70 @@
+"""
+重试策略模块
+为瞬时故障（超时、网络错误、5xx、二级限流）提供带抖动的指数退避重试
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from src.config import config
+
+# 只有幂等请求才会被自动重试
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RetryableError(Exception):
+    """可重试的瞬时错误（超时、网络错误、5xx等）"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析Retry-After响应头（秒数或HTTP日期），返回需要等待的秒数"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """指数退避重试策略（full jitter）"""
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None):
+        self.max_attempts = max(1, config.GITHUB_RETRY_MAX_ATTEMPTS if max_attempts is None else max_attempts)
+        self.base_delay = config.GITHUB_RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = config.GITHUB_RETRY_MAX_DELAY if max_delay is None else max_delay
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """计算第attempt次失败后的等待时间，服务端给出Retry-After时优先遵循"""
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def next_delay(self, method: str, attempt: int, retry_after: Optional[float],
+                   time_left: float, idempotent: Optional[bool] = None) -> Optional[float]:
+        """返回下次重试前的等待秒数；不应再重试时返回None
+        
+        idempotent未指定时根据HTTP方法判断（如只读的GraphQL POST查询可显式标记为幂等）。
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if not idempotent or attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt, retry_after)
+        if delay >= time_left:
+            # 等待会超出整体截止时间
+            return None
+        return delay
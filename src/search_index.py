@@ -0,0 +1,334 @@
+"""
+本地仓库搜索索引
+用已经获取过的仓库元数据构建倒排索引（BM25排序），支持stars/forks/language/pushed/created等限定条件，
+常见查询可以在本地直接回答，无法回答时再请求GitHub
+"""
+
+import asyncio
+import gzip
+import json
+import math
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from src.config import config
+from src.models import Repository
+from src.utils.logger import app_logger
+
+# 只保留格式化输出需要的字段，索引文件保持紧凑
+_STORED_FIELDS = (
+    "id", "name", "full_name", "description", "html_url", "language", "topics",
+    "stargazers_count", "forks_count", "watchers_count", "open_issues_count",
+    "created_at", "updated_at", "pushed_at",
+)
+
+# 各字段在文档中的权重（以重复词频的方式计入）
+_FIELD_WEIGHTS = (("name", 3), ("topics", 2), ("description", 1), ("language", 1))
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[^\W\d_a-z]", re.UNICODE)
+_CAMEL_PATTERN = re.compile(r"([a-z0-9])([A-Z])")
+_QUALIFIER_PATTERN = re.compile(r"^(\w+):(.+)$")
+_RANGE_PATTERN = re.compile(r"^(>=|<=|>|<)?(.+)$")
+
+_SORT_FIELDS = {"stars": "stargazers_count", "forks": "forks_count", "updated": "updated_at"}
+
+# 本地无法处理的布尔运算
+_OPERATORS = {"NOT", "OR", "AND"}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """分词：拆分驼峰、连字符和下划线，英文数字按词，中文等按单字"""
+    if not text:
+        return []
+    text = _CAMEL_PATTERN.sub(r"\1 \2", text)
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _range_filter(expression: str, cast: Callable[[str], Any]) -> Callable[[Any], bool]:
+    """解析GitHub风格的范围表达式：>N、>=N、<N、<=N、N..M、N"""
+    if ".." in expression:
+        low, high = expression.split("..", 1)
+        low_value = cast(low) if low not in ("", "*") else None
+        high_value = cast(high) if high not in ("", "*") else None
+        return lambda value: (value is not None
+                              and (low_value is None or value >= low_value)
+                              and (high_value is None or value <= high_value))
+    operator, operand = _RANGE_PATTERN.match(expression).groups()
+    target = cast(operand)
+    comparisons = {
+        ">": lambda value: value > target,
+        ">=": lambda value: value >= target,
+        "<": lambda value: value < target,
+        "<=": lambda value: value <= target,
+        None: lambda value: value == target,
+    }
+    compare = comparisons[operator]
+    return lambda value: value is not None and compare(value)
+
+
+def _date(value: str) -> str:
+    """日期按 YYYY-MM-DD 前缀比较"""
+    value = value.strip()
+    if not re.match(r"^\d{4}-\d{2}-\d{2}", value):
+        raise ValueError(f"invalid date: {value}")
+    return value[:10]
+
+
+def parse_query(query: str) -> Optional[Tuple[List[str], List[Callable[[Dict], bool]]]]:
+    """把搜索语句拆成 (关键词, 过滤条件)；包含本地无法处理的限定条件或布尔运算（-、NOT、OR、括号）时返回None"""
+    terms: List[str] = []
+    filters: List[Callable[[Dict], bool]] = []
+    for part in query.split():
+        if part in _OPERATORS or part.startswith("-") or "(" in part or ")" in part:
+            return None
+        match = _QUALIFIER_PATTERN.match(part)
+        if not match:
+            terms.extend(tokenize(part))
+            continue
+        name, expression = match.group(1).lower(), match.group(2)
+        try:
+            if name == "stars":
+                check = _range_filter(expression, int)
+                filters.append(lambda doc, check=check: check(doc.get("stargazers_count", 0)))
+            elif name == "forks":
+                check = _range_filter(expression, int)
+                filters.append(lambda doc, check=check: check(doc.get("forks_count", 0)))
+            elif name in ("pushed", "created"):
+                check = _range_filter(expression, _date)
+                field = f"{name}_at"
+                filters.append(lambda doc, check=check, field=field: check((doc.get(field) or "")[:10] or None))
+            elif name == "language":
+                language = expression.lower()
+                filters.append(lambda doc, language=language: (doc.get("language") or "").lower() == language)
+            elif name == "topic":
+                topic = expression.lower()
+                filters.append(lambda doc, topic=topic: topic in (doc.get("topics") or []))
+            else:
+                return None
+        except ValueError:
+            return None
+    return terms, filters
+
+
+def _build_document(repo: Mapping) -> Tuple[str, Repository, Dict[str, int]]:
+    """生成 (键, 文档, 词频)，不修改索引，可以在线程中执行"""
+    doc = Repository({field: repo.get(field) for field in _STORED_FIELDS if repo.get(field) is not None})
+    term_counts: Dict[str, int] = {}
+    for field, weight in _FIELD_WEIGHTS:
+        value = doc.get(field)
+        text = " ".join(value) if isinstance(value, tuple) else value
+        for term in tokenize(text):
+            term_counts[term] = term_counts.get(term, 0) + weight
+    return repo["full_name"].lower(), doc, term_counts
+
+
+class SearchIndex:
+    """仓库元数据的倒排索引
+
+    文档以仓库full_name为键，重复写入同一仓库时先删除旧的倒排记录（增量更新）。
+    本地至少有limit个同时包含全部关键词并满足限定条件的仓库时才视为命中。
+    """
+
+    def __init__(self, path: Optional[str] = None, max_docs: Optional[int] = None,
+                 k1: float = 1.2, b: float = 0.75):
+        self.path = config.SEARCH_INDEX_PATH if path is None else path
+        self.max_docs = config.SEARCH_INDEX_MAX_DOCS if max_docs is None else max_docs
+        self.k1 = k1
+        self.b = b
+
+        self._docs: Dict[str, Repository] = {}
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._loaded = False
+        self._load_task: Optional[asyncio.Task] = None
+        self._dirty = False
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return config.SEARCH_INDEX_ENABLED and self.max_docs > 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, repositories: Iterable[Mapping]) -> int:
+        """增量加入仓库，返回加入数量"""
+        if not self.enabled:
+            return 0
+        self._ensure_loaded()
+        added = 0
+        for repo in repositories:
+            if repo and repo.get("full_name"):
+                self._add_one(repo)
+                added += 1
+        while len(self._docs) > self.max_docs:
+            # 超出容量时淘汰最早加入的仓库
+            self._remove(next(iter(self._docs)))
+        if added:
+            self._dirty = True
+        return added
+
+    def search(self, query: str, sort: Optional[str] = "stars", order: str = "desc",
+               limit: int = 10) -> Optional[List[Repository]]:
+        """在本地索引中搜索，结果不足limit条或查询无法在本地处理时返回None
+
+        结果只包含_STORED_FIELDS中的字段（没有原始数据）。
+        """
+        if not self.enabled:
+            return None
+        self._ensure_loaded()
+        parsed = parse_query(query)
+        if parsed is None:
+            self.misses += 1
+            return None
+        terms, filters = parsed
+
+        candidates = self._match_all(terms) if terms else set(self._docs)
+        matches = [key for key in candidates if all(check(self._docs[key]) for check in filters)]
+        if len(matches) < limit or not matches:
+            self.misses += 1
+            return None
+
+        field = _SORT_FIELDS.get(sort or "")
+        if field is not None:
+            matches.sort(key=lambda key: self._docs[key].get(field) or 0, reverse=(order != "asc"))
+        else:
+            scores = self._bm25(terms, matches)
+            matches.sort(key=lambda key: scores.get(key, 0.0), reverse=True)
+
+        self.hits += 1
+        return [self._docs[key] for key in matches[:limit]]
+
+    # ---- 索引维护 ----
+
+    def _add_one(self, repo: Mapping) -> None:
+        self._insert(*_build_document(repo))
+
+    def _insert(self, key: str, doc: Repository, term_counts: Dict[str, int]) -> None:
+        if key in self._docs:
+            self._remove(key)
+        self._docs[key] = doc
+        self._doc_terms[key] = term_counts
+        self._doc_lengths[key] = sum(term_counts.values())
+        self._total_length += self._doc_lengths[key]
+        for term, count in term_counts.items():
+            self._postings.setdefault(term, {})[key] = count
+
+    def _remove(self, key: str) -> None:
+        self._docs.pop(key, None)
+        term_counts = self._doc_terms.pop(key, {})
+        self._total_length -= self._doc_lengths.pop(key, 0)
+        for term in term_counts:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self._postings[term]
+
+    def _match_all(self, terms: List[str]) -> Set[str]:
+        """返回包含全部关键词的文档（从最短的倒排列表开始求交集）"""
+        postings = [self._postings.get(term) for term in dict.fromkeys(terms)]
+        if not postings or any(not posting for posting in postings):
+            return set()
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return result
+
+    def _bm25(self, terms: List[str], keys: List[str]) -> Dict[str, float]:
+        """按加权词频计算BM25得分"""
+        doc_count = len(self._docs)
+        average_length = self._total_length / doc_count if doc_count else 0.0
+        scores: Dict[str, float] = {}
+        for term in dict.fromkeys(terms):
+            posting = self._postings.get(term, {})
+            idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for key in keys:
+                tf = posting.get(key)
+                if not tf:
+                    continue
+                length = self._doc_lengths[key]
+                norm = self.k1 * (1 - self.b + self.b * length / average_length) if average_length else self.k1
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    # ---- 持久化 ----
+
+    def _ensure_loaded(self) -> None:
+        """首次使用时从gzip压缩的JSON文件加载文档，倒排表在内存中重建
+
+        在事件循环中使用时，读取和分词放到线程中执行，加载完成前索引先按空索引工作。
+        """
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._apply_loaded(self._read())
+            return
+        self._load_task = loop.create_task(self._load())
+
+    async def _load(self) -> None:
+        self._apply_loaded(await asyncio.to_thread(self._read))
+
+    def _read(self) -> List[Tuple[str, Repository, Dict[str, int]]]:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                documents = json.load(f)
+            return [_build_document(doc) for doc in documents]
+        except (OSError, ValueError, KeyError) as e:
+            app_logger.warning(f"Failed to load search index: {str(e)}")
+            return []
+
+    def _apply_loaded(self, entries: List[Tuple[str, Repository, Dict[str, int]]]) -> None:
+        """合并磁盘上的文档（加载期间新加入的仓库更新，不被旧数据覆盖）"""
+        loaded = 0
+        for key, doc, term_counts in entries:
+            if key not in self._docs and len(self._docs) < self.max_docs:
+                self._insert(key, doc, term_counts)
+                loaded += 1
+        if entries:
+            app_logger.info(f"Loaded {loaded} repositories into search index from {self.path}")
+
+    def _write(self, documents: List[Dict]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(documents, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    async def save(self) -> None:
+        """把索引写入磁盘（仅在有新文档时写入）"""
+        if self._load_task is not None:
+            # 等待加载完成，避免只写入部分文档覆盖磁盘上的索引
+            await self._load_task
+            self._load_task = None
+        if not self.path or not self._dirty:
+            return
+        documents = [doc.to_dict() for doc in self._docs.values()]
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._write, documents)
+        except OSError as e:
+            app_logger.warning(f"Failed to save search index: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """返回索引统计信息"""
+        return {
+            "documents": len(self._docs),
+            "terms": len(self._postings),
+            "hits": self.hits,
+            "misses": self.misses
+        }
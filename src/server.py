@@ -4,10 +4,10 @@ GitHub Search FastMCP Server
 使用装饰器方式注册MCP工具
 """
 
-import asyncio
 import sys
 import os
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import List, Optional
 
 # 添加父目录到Python路径，以便导入src模块
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,15 +18,51 @@ from fastmcp import FastMCP
 from src.config import config
 from src.utils.logger import app_logger
 from src.github_client import GitHubClient
+from src.models import Repository
+from src.tool_cache import ErrorResult, cached_tool
+from src.trending import TRENDING_PERIODS, TrendingStore
+
+# 创建GitHub客户端实例（所有工具共享同一个客户端和连接池）
+github_client = GitHubClient()
+
+# 热门趋势快照（后台定时刷新）
+trending_store = TrendingStore(github_client)
+
+@asynccontextmanager
+async def lifespan(server):
+    """服务器生命周期 - 启动趋势快照刷新，退出时释放GitHub客户端的连接池"""
+    trending_store.start()
+    try:
+        yield {}
+    finally:
+        await trending_store.stop()
+        await github_client.close()
 
 # 创建FastMCP实例
-mcp = FastMCP("GitHub搜索助手")
+mcp = FastMCP("GitHub搜索助手", lifespan=lifespan)
 
-# 创建GitHub客户端实例
-github_client = GitHubClient()
+def format_repositories(repositories: List[Repository]) -> str:
+    """格式化仓库列表"""
+    results = [f"🔍 找到 {len(repositories)} 个仓库:\n"]
+    
+    for i, repo in enumerate(repositories, 1):
+        stars = repo.get('stargazers_count', 0)
+        forks = repo.get('forks_count', 0)
+        language_info = repo.get('language', '未知')
+        description = repo.get('description', '无描述')
+        
+        results.append(
+            f"{i}. **{repo['full_name']}** ⭐ {stars:,}\n"
+            f"   📝 {description}\n"
+            f"   💻 {language_info} | 🍴 {forks:,} 个分叉\n"
+            f"   🔗 {repo.get('html_url', '')}\n"
+        )
+    
+    return "\n".join(results)
 
 @mcp.tool()
-def search_repositories(query: str, language: Optional[str] = None, 
+@cached_tool(ttl=config.TOOL_CACHE_TTL_SEARCH)
+async def search_repositories(query: str, language: Optional[str] = None, 
                        sort: str = "stars", per_page: int = 10) -> str:
     """搜索GitHub仓库工具
     
@@ -44,48 +80,22 @@ def search_repositories(query: str, language: Optional[str] = None,
     try:
         app_logger.info(f"搜索仓库: query={query}, language={language}, sort={sort}")
         
-        # 这里使用同步调用，因为FastMCP工具函数需要同步
-        # 在实际应用中，您需要使用asyncio.run或其他方式处理异步调用
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            repositories = loop.run_until_complete(
-                github_client.search_repositories(
-                    query=query, language=language, sort=sort, per_page=per_page
-                )
-            )
-        finally:
-            loop.close()
+        repositories = await github_client.search_repositories(
+            query=query, language=language, sort=sort, per_page=per_page
+        )
         
         if not repositories:
             return f"未找到与查询 '{query}' 匹配的仓库"
         
-        # 格式化结果
-        results = [f"🔍 找到 {len(repositories)} 个仓库:\n"]
-        
-        for i, repo in enumerate(repositories, 1):
-            stars = repo.get('stargazers_count', 0)
-            forks = repo.get('forks_count', 0)
-            language_info = repo.get('language', '未知')
-            description = repo.get('description', '无描述')
-            
-            results.append(
-                f"{i}. **{repo['full_name']}** ⭐ {stars:,}\n"
-                f"   📝 {description}\n"
-                f"   💻 {language_info} | 🍴 {forks:,} 个分叉\n"
-                f"   🔗 {repo.get('html_url', '')}\n"
-            )
-        
-        return "\n".join(results)
+        return format_repositories(repositories)
         
     except Exception as e:
         app_logger.error(f"搜索仓库时出错: {str(e)}")
-        return f"搜索仓库时出错: {str(e)}"
+        return ErrorResult(f"搜索仓库时出错: {str(e)}")
 
 @mcp.tool()
-def get_repository_info(owner: str, repo: str) -> str:
+@cached_tool(ttl=config.TOOL_CACHE_TTL_REPO)
+async def get_repository_info(owner: str, repo: str) -> str:
     """获取仓库详细信息工具
     
     获取指定GitHub仓库的详细信息，包括统计数据、描述、许可证等。
@@ -100,17 +110,7 @@ def get_repository_info(owner: str, repo: str) -> str:
     try:
         app_logger.info(f"获取仓库信息: {owner}/{repo}")
         
-        # 处理异步调用
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            repo_info = loop.run_until_complete(
-                github_client.get_repository_info(owner, repo)
-            )
-        finally:
-            loop.close()
+        repo_info = await github_client.get_repository_info(owner, repo)
         
         return f"""📦 **{repo_info['full_name']}**
 
@@ -130,10 +130,11 @@ def get_repository_info(owner: str, repo: str) -> str:
         
     except Exception as e:
         app_logger.error(f"获取仓库信息时出错: {str(e)}")
-        return f"获取仓库信息时出错: {str(e)}"
+        return ErrorResult(f"获取仓库信息时出错: {str(e)}")
 
 @mcp.tool()
-def search_users(query: str, user_type: Optional[str] = None) -> str:
+@cached_tool(ttl=config.TOOL_CACHE_TTL_USERS)
+async def search_users(query: str, user_type: Optional[str] = None) -> str:
     """搜索GitHub用户工具
     
     搜索GitHub用户和组织账号。
@@ -148,17 +149,7 @@ def search_users(query: str, user_type: Optional[str] = None) -> str:
     try:
         app_logger.info(f"搜索用户: query={query}, type={user_type}")
         
-        # 处理异步调用
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            users = loop.run_until_complete(
-                github_client.search_users(query=query, type=user_type)
-            )
-        finally:
-            loop.close()
+        users = await github_client.search_users(query=query, type=user_type)
         
         if not users:
             return f"未找到与查询 '{query}' 匹配的用户"
@@ -179,10 +170,11 @@ def search_users(query: str, user_type: Optional[str] = None) -> str:
         
     except Exception as e:
         app_logger.error(f"搜索用户时出错: {str(e)}")
-        return f"搜索用户时出错: {str(e)}"
+        return ErrorResult(f"搜索用户时出错: {str(e)}")
 
 @mcp.tool()
-def get_trending_repositories(language: Optional[str] = None, since: str = "daily") -> str:
+@cached_tool(ttl=config.TOOL_CACHE_TTL_TRENDING)
+async def get_trending_repositories(language: Optional[str] = None, since: str = "daily") -> str:
     """获取热门趋势仓库工具
     
     获取GitHub上的热门趋势仓库。
@@ -197,26 +189,21 @@ def get_trending_repositories(language: Optional[str] = None, since: str = "dail
     try:
         app_logger.info(f"获取热门仓库: language={language}, since={since}")
         
-        # 构造搜索查询以获取热门仓库
-        # 使用创建时间和星标数作为热门度指标
-        if since == "daily":
-            query = "created:>=$(date -d '1 day ago' '+%Y-%m-%d')"
-        elif since == "weekly":
-            query = "created:>=$(date -d '1 week ago' '+%Y-%m-%d')"
-        else:  # monthly
-            query = "created:>=$(date -d '1 month ago' '+%Y-%m-%d')"
-        
-        # 使用现有的搜索功能
-        return search_repositories(
-            query=f"stars:>10 {query}",
-            language=language,
-            sort="stars",
-            per_page=10
-        )
+        if since not in TRENDING_PERIODS:
+            since = "monthly"
+        
+        # 优先读取后台预计算的快照，缺失或过期时才发起搜索
+        snapshot = await trending_store.fetch(language, since)
+        repositories = snapshot.repositories
+        
+        if not repositories:
+            return f"未找到 {language or '所有语言'} 的热门仓库"
+        
+        return f"🕒 数据更新于 {snapshot.updated_at()}\n\n" + format_repositories(repositories)
         
     except Exception as e:
         app_logger.error(f"获取热门仓库时出错: {str(e)}")
-        return f"获取热门仓库时出错: {str(e)}"
+        return ErrorResult(f"获取热门仓库时出错: {str(e)}")
 
 def main():
     """启动FastMCP服务器的主函数"""
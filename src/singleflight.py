@@ -0,0 +1,86 @@
+"""
+请求合并模块
+相同签名的并发请求只发送一次，其余调用方等待同一个结果（single-flight）
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """进行中请求的去重器
+
+    第一个调用方（leader）创建共享任务，之后到达的相同key调用方直接等待该任务。
+    共享任务通过asyncio.shield保护，单个调用方取消不会影响其他等待者。
+    """
+
+    def __init__(self, max_tracked_keys: int = 256):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self._key_stats: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+        self._max_tracked_keys = max_tracked_keys
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """执行fn，若相同key的调用正在进行则复用其结果"""
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.coalesced += 1
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+            self._record(key, coalesced=1)
+        else:
+            task = loop.create_task(fn())
+            self._calls[key] = task
+            self._waiters[key] = 1
+            self.leaders += 1
+            self._record(key, leaders=1)
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """返回合并统计，包括等待者最多的key"""
+        busiest = sorted(self._key_stats.items(), key=lambda item: item[1]["coalesced"], reverse=True)
+        return {
+            "in_flight": len(self._calls),
+            "waiting": sum(self._waiters.values()),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "top_keys": [
+                {"key": key, **counts} for key, counts in busiest[:top] if counts["coalesced"]
+            ]
+        }
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            waiters = self._waiters.pop(key, 0)
+            self._record(key, max_waiters=waiters)
+        if not task.cancelled():
+            # 确保异常被读取，避免所有等待者都已取消时产生警告
+            task.exception()
+
+    def _record(self, key: str, leaders: int = 0, coalesced: int = 0,
+                max_waiters: Optional[int] = None) -> None:
+        counts = self._key_stats.get(key)
+        if counts is None:
+            counts = {"leaders": 0, "coalesced": 0, "max_waiters": 0}
+            self._key_stats[key] = counts
+            while len(self._key_stats) > self._max_tracked_keys:
+                self._key_stats.popitem(last=False)
+        else:
+            self._key_stats.move_to_end(key)
+        counts["leaders"] += leaders
+        counts["coalesced"] += coalesced
+        if max_waiters is not None:
+            counts["max_waiters"] = max(counts["max_waiters"], max_waiters)
@@ -0,0 +1,76 @@
+"""
+工具结果缓存模块
+按规范化后的参数缓存MCP工具最终返回的格式化文本，MCP服务器模式和Web对话模式共用
+"""
+
+import functools
+import inspect
+import json
+from typing import Any, Awaitable, Callable, TypeVar
+
+from src.cache import ResponseCache
+from src.config import config
+from src.singleflight import SingleFlight
+from src.utils.logger import app_logger
+
+F = TypeVar("F", bound=Callable[..., Awaitable[str]])
+
+# 进程内共享的工具结果缓存（每条记录写入时使用所属工具的TTL）
+tool_cache = ResponseCache(ttl=3600, max_entries=config.TOOL_CACHE_MAX_ENTRIES)
+
+# 相同参数的并发工具调用只执行一次
+_inflight = SingleFlight()
+
+
+def _canonical(value: Any) -> Any:
+    """字符串去掉首尾空白并合并多余空白，其余值保持不变"""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+
+class ErrorResult(str):
+    """工具返回的错误提示（如限流、网络错误、参数错误），照常返回给调用方但不写入缓存"""
+
+
+def cached_tool(ttl: int) -> Callable[[F], F]:
+    """缓存工具函数结果的装饰器
+
+    缓存键由函数的模块名、函数名和补全默认值后的参数组成，
+    ttl为0时不缓存；返回ErrorResult、非字符串结果或抛出异常时同样不缓存。
+    被装饰函数的签名保持不变，可以继续注册为MCP工具。
+    """
+    def decorator(fn: F) -> F:
+        signature = inspect.signature(fn)
+        name = f"{fn.__module__}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if ttl <= 0:
+                return await fn(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = json.dumps(
+                [name, {arg: _canonical(value) for arg, value in bound.arguments.items()}],
+                ensure_ascii=False,
+                sort_keys=True,
+                default=str
+            )
+
+            cached = tool_cache.get(key)
+            if cached is not None:
+                app_logger.debug(f"Tool cache hit: {name}")
+                return cached
+
+            async def run():
+                result = await fn(*args, **kwargs)
+                if isinstance(result, str) and not isinstance(result, ErrorResult):
+                    tool_cache.set(key, result, size=len(result.encode("utf-8")), ttl=ttl)
+                return result
+
+            return await _inflight.do(key, run)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,237 @@
+"""
+热门趋势快照模块
+后台定时为常用语言和时间范围预先计算热门仓库列表，工具调用直接读取快照，不再消耗搜索配额
+"""
+
+import asyncio
+import datetime
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.config import config
+from src.models import Repository, raw_many
+from src.rate_limiter import PRIORITY_BACKGROUND, request_priority
+from src.utils.logger import app_logger
+
+# 时间范围 -> (回溯天数, 日期字段, 最低星数, 描述)
+TRENDING_PERIODS: Dict[str, Tuple[int, str, int, str]] = {
+    # 今日趋势：最近7天更新过且星数较高的仓库
+    "daily": (7, "pushed", 50, "最近7天活跃"),
+    # 周趋势：最近30天创建的高星仓库
+    "weekly": (30, "created", 10, "最近30天"),
+    # 月趋势：最近90天创建的热门仓库
+    "monthly": (90, "created", 5, "最近90天"),
+}
+
+
+def build_trending_query(period: str, now: Optional[datetime.datetime] = None) -> Tuple[str, str]:
+    """构造趋势搜索语句，返回 (query, 时间范围描述)"""
+    days, field, min_stars, description = TRENDING_PERIODS[period]
+    date_filter = ((now or datetime.datetime.now()) - datetime.timedelta(days=days)).strftime('%Y-%m-%d')
+    return f"{field}:>{date_filter} stars:>{min_stars}", description
+
+
+def normalize_language(language: Optional[str]) -> str:
+    """语言名统一为小写，未指定语言时为空字符串"""
+    return (language or "").strip().lower()
+
+
+class TrendingSnapshot:
+    """某个 (语言, 时间范围) 的热门仓库快照"""
+
+    __slots__ = ("language", "period", "repositories", "fetched_at")
+
+    def __init__(self, language: str, period: str, repositories: List[Repository], fetched_at: float):
+        self.language = language
+        self.period = period
+        self.repositories = repositories
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        """快照距今的秒数"""
+        return time.time() - self.fetched_at
+
+    @property
+    def stale(self) -> bool:
+        return self.age > config.TRENDING_MAX_AGE
+
+    def updated_at(self) -> str:
+        """快照生成时间（本地时间，精确到分钟）"""
+        return datetime.datetime.fromtimestamp(self.fetched_at).strftime('%Y-%m-%d %H:%M')
+
+    def to_dict(self) -> Dict:
+        return {
+            "language": self.language,
+            "period": self.period,
+            "repositories": raw_many(self.repositories),
+            "fetched_at": self.fetched_at
+        }
+
+
+class TrendingStore:
+    """热门仓库快照存储
+
+    后台任务在每个TRENDING_REFRESH_INTERVAL内刷新一遍 TRENDING_LANGUAGES × 时间范围 的快照，
+    各组合的搜索请求均匀错开（而不是集中发出），只占用搜索配额的一小部分；请求使用后台优先级。
+    未预计算或已过期的组合在首次请求时按需获取，这类快照最多保留TRENDING_MAX_SNAPSHOTS个。
+    配置TRENDING_SNAPSHOT_PATH时快照会写入JSON文件，重启后先使用文件中的快照。
+    """
+
+    def __init__(self, client, languages: Optional[List[str]] = None,
+                 interval: Optional[int] = None, path: Optional[str] = None,
+                 max_snapshots: Optional[int] = None):
+        self.client = client
+        if languages is None:
+            languages = config.TRENDING_LANGUAGES.split(",")
+        # 空字符串代表“所有语言”
+        self.languages = list(dict.fromkeys(normalize_language(item) for item in [""] + languages))
+        self.interval = config.TRENDING_REFRESH_INTERVAL if interval is None else interval
+        self.path = config.TRENDING_SNAPSHOT_PATH if path is None else path
+        self.max_snapshots = config.TRENDING_MAX_SNAPSHOTS if max_snapshots is None else max_snapshots
+
+        # 按最近使用排序，语言来自工具参数（可能是任意字符串），按需获取的快照需要限制数量
+        self._snapshots: "OrderedDict[Tuple[str, str], TrendingSnapshot]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def get(self, language: Optional[str], period: str) -> Optional[TrendingSnapshot]:
+        """读取快照（可能已过期），不存在时返回None"""
+        key = (normalize_language(language), period)
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            self._snapshots.move_to_end(key)
+        return snapshot
+
+    async def fetch(self, language: Optional[str], period: str) -> TrendingSnapshot:
+        """优先返回未过期的快照，否则立即搜索并更新快照"""
+        snapshot = self.get(language, period)
+        if snapshot is not None and not snapshot.stale:
+            return snapshot
+        try:
+            return await self.refresh_one(language, period)
+        except Exception:
+            if snapshot is not None:
+                # 搜索失败（如配额耗尽）时退回使用过期快照
+                app_logger.warning(f"Serving stale trending snapshot for {language or 'all'}/{period}")
+                return snapshot
+            raise
+
+    async def refresh_one(self, language: Optional[str], period: str) -> TrendingSnapshot:
+        """搜索并保存一个 (语言, 时间范围) 的快照"""
+        language = normalize_language(language)
+        query, _ = build_trending_query(period)
+        repositories = await self.client.search_repositories(
+            query=query,
+            language=language or None,
+            sort="stars",
+            order="desc",
+            per_page=config.TRENDING_PER_PAGE,
+            # 快照需要GitHub上的最新数据，不使用本地索引
+            use_index=False
+        )
+        snapshot = TrendingSnapshot(language, period, repositories, time.time())
+        self._store(snapshot)
+        self.refreshes += 1
+        return snapshot
+
+    def _store(self, snapshot: TrendingSnapshot) -> None:
+        """保存快照，超出数量时淘汰最久未使用的按需快照（预计算的组合始终保留）"""
+        key = (snapshot.language, snapshot.period)
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        extra = [key for key in self._snapshots if key[0] not in self.languages]
+        for key in extra[:max(0, len(extra) - self.max_snapshots)]:
+            del self._snapshots[key]
+
+    async def _refresh_due(self, language: str, period: str, min_age: float) -> None:
+        """快照不存在或已超过min_age时刷新，失败只记录日志"""
+        snapshot = self._snapshots.get((language, period))
+        if snapshot is not None and snapshot.age < min_age:
+            return
+        try:
+            with request_priority(PRIORITY_BACKGROUND):
+                await self.refresh_one(language, period)
+        except Exception as e:
+            self.refresh_errors += 1
+            app_logger.warning(f"Trending refresh failed for {language or 'all'}/{period}: {str(e)}")
+
+    def start(self) -> None:
+        """加载磁盘快照并启动后台刷新任务（interval为0时只按需获取）"""
+        self.load()
+        if self.interval <= 0 or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """停止后台刷新任务并保存快照（刷新周期可能只完成了一部分）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save()
+
+    async def _refresh_loop(self) -> None:
+        # 每个组合在一个刷新周期内轮到一次，相邻两次搜索间隔 interval / 组合数
+        combinations = [(language, period) for language in self.languages for period in TRENDING_PERIODS]
+        step = self.interval / len(combinations)
+        while True:
+            started = time.monotonic()
+            for language, period in combinations:
+                # 磁盘加载的快照仍然新鲜时跳过，下一个周期再刷新
+                await self._refresh_due(language, period, self.interval - step)
+                await asyncio.sleep(step)
+            app_logger.info(f"Trending refresh cycle finished in {time.monotonic() - started:.0f}s")
+            await self.save()
+
+    def load(self) -> None:
+        """从JSON文件加载快照"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+            for item in items:
+                snapshot = TrendingSnapshot(item["language"], item["period"],
+                                            Repository.parse_many(item["repositories"]), item["fetched_at"])
+                self._store(snapshot)
+            app_logger.info(f"Loaded {len(items)} trending snapshots from {self.path}")
+        except (OSError, ValueError, KeyError) as e:
+            app_logger.warning(f"Failed to load trending snapshots: {str(e)}")
+
+    async def save(self) -> None:
+        """把快照写入JSON文件（先写临时文件再替换，避免读到半个文件）"""
+        if not self.path:
+            return
+        items = [snapshot.to_dict() for snapshot in self._snapshots.values()]
+
+        def write():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(items, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+        try:
+            await asyncio.to_thread(write)
+        except OSError as e:
+            app_logger.warning(f"Failed to save trending snapshots: {str(e)}")
+
+    def stats(self) -> Dict:
+        """返回快照统计信息"""
+        return {
+            "snapshots": len(self._snapshots),
+            "stale": sum(1 for s in self._snapshots.values() if s.stale),
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "interval": self.interval
+        }
@@ -0,0 +1,179 @@
+"""
+Markdown渲染工具
+单遍扫描的增量Markdown渲染器，内置HTML转义，支持标题、列表、代码块、粗体、斜体、行内代码和链接，
+既可以一次渲染完整文本，也可以在流式输出时逐块渲染
+"""
+
+import re
+from html import escape
+from typing import List, Optional
+
+# 行内标记：各分支都以字面字符开头，正则引擎可以直接跳到候选位置
+_URL_PATTERN = r"[^()\s]*(?:\([^()\s]*\)[^()\s]*)*"
+_INLINE_PATTERN = (
+    r"`(?P<code>[^`\n]+)`"
+    r"|\[(?P<label>[^\]\n]+)\]\((?P<url>" + _URL_PATTERN + r")\)"
+    # 粗体链接是回答中最常见的写法，单独匹配以免嵌套渲染
+    r"|\*\*\[(?P<bold_label>[^\]\n]+)\]\((?P<bold_url>" + _URL_PATTERN + r")\)\*\*"
+    r"|\*\*(?P<bold>\S[^\n]*?)\*\*"
+    r"|\*(?P<em>[^\s*][^*\n]*?)\*"
+)
+
+# 块级标记（从上一行的换行符开始匹配）+ 行内标记，整段文本只扫描一遍
+_MARKDOWN = re.compile(
+    # 代码块：未闭合时一直延续到文本末尾
+    r"\n[ \t]*```(?P<lang>[^\n]*)(?P<body>(?:\n(?![ \t]*```[ \t]*(?:\n|\Z))[^\n]*)*)"
+    r"(?:\n[ \t]*```[ \t]*(?=\n|\Z)|\Z)"
+    r"|\n(?P<level>#{1,6})[ \t]+(?P<heading>[^\n]*)"
+    r"|\n(?P<ul>[ \t]*[-*+][ \t]+[^\n]*(?:\n[ \t]*[-*+][ \t]+[^\n]*)*)"
+    r"|\n(?P<ol>[ \t]*\d{1,9}[.)][ \t]+[^\n]*(?:\n[ \t]*\d{1,9}[.)][ \t]+[^\n]*)*)"
+    r"|" + _INLINE_PATTERN
+)
+_INLINE = re.compile(_INLINE_PATTERN)
+_LIST_MARKER = re.compile(r"^[ \t]*(?:[-*+]|\d{1,9}[.)])[ \t]+", re.MULTILINE)
+_SAFE_URL = re.compile(r"(?:https?:|mailto:|/|#)", re.IGNORECASE)
+
+# 流式渲染时用于判断行类型（与上面的块级规则保持一致）
+_FENCE_LINE = re.compile(r"[ \t]*```")
+_FENCE_CLOSE_LINE = re.compile(r"[ \t]*```[ \t]*")
+_BLOCK_LINE = re.compile(r"#{1,6}[ \t]|[ \t]*(?:[-*+]|\d{1,9}[.)])[ \t]")
+
+# 块级元素结束标记：紧随其后的换行（以及一个空行）不再输出<br>
+_BLOCK_END = "\x00"
+
+
+def _render_inline(text: str) -> str:
+    """渲染嵌套的行内标记（不含标记字符时直接返回）"""
+    if "*" in text or "[" in text or "`" in text:
+        return _INLINE.sub(_inline, text)
+    return text
+
+
+def _link(label: str, url: str) -> str:
+    label = _render_inline(label)
+    if not _SAFE_URL.match(url):
+        # 不安全的协议（如javascript:）只输出文本
+        return label
+    return f'<a href="{url}" target="_blank" rel="noopener">{label}</a>'
+
+
+def _inline(match: "re.Match") -> str:
+    first = match.string[match.start()]
+    if first == "`":
+        return f"<code>{match.group('code')}</code>"
+    if first == "[":
+        return _link(match.group("label"), match.group("url"))
+    bold_label = match.group("bold_label")
+    if bold_label is not None:
+        return f"<strong>{_link(bold_label, match.group('bold_url'))}</strong>"
+    bold = match.group("bold")
+    if bold is not None:
+        return f"<strong>{_render_inline(bold)}</strong>"
+    return f"<em>{_render_inline(match.group('em'))}</em>"
+
+
+def _block(match: "re.Match") -> str:
+    if match.string[match.start()] != "\n":
+        return _inline(match)
+
+    language = match.group("lang")
+    if language is not None:
+        language = language.strip()
+        css = f' class="language-{language}"' if language else ""
+        # 代码块内的换行用字符引用保留，不参与<br>替换
+        body = match.group("body")[1:].replace("\n", "&#10;")
+        return f"\n<pre><code{css}>{body}</code></pre>{_BLOCK_END}"
+
+    level = match.group("level")
+    if level is not None:
+        text = _render_inline(match.group("heading").strip())
+        return f"\n<h{len(level)}><strong>{text}</strong></h{len(level)}>{_BLOCK_END}"
+
+    tag = "ul" if match.group("ul") is not None else "ol"
+    # 行内标记不跨行，所有列表项一起渲染后再按行拆分
+    items = _render_inline(_LIST_MARKER.sub("", match.group(tag)))
+    return f"\n<{tag}><li>{items.replace(chr(10), '</li><li>')}</li></{tag}>{_BLOCK_END}"
+
+
+def render_markdown(text: Optional[str]) -> str:
+    """一次性渲染完整的Markdown文本
+
+    先整体做HTML转义（Markdown语法字符不受影响），再用一个合并了块级和行内标记的正则扫描一遍，
+    剩余的换行统一替换为<br>，与原先的显示效果一致。
+    """
+    if not text:
+        return ""
+    source = "\n" + escape(text.replace(_BLOCK_END, ""))
+    html = _MARKDOWN.sub(_block, source)
+    html = (html.replace(_BLOCK_END + "\n\n", "")
+                .replace(_BLOCK_END + "\n", "")
+                .replace(_BLOCK_END, "")
+                .replace("\n", "<br>"))
+    # 去掉开头补上的换行
+    return html[len("<br>"):]
+
+
+class MarkdownRenderer:
+    """流式Markdown渲染器
+
+    feed()接收任意切分的文本块，只渲染到最后一个“安全”的行尾（普通文本行或空行，且不在代码块内），
+    之后仍可能延续的列表、标题后的空行和未闭合的代码块留到后续文本到达时再渲染。
+    每个字符只被扫描和渲染一次；所有片段按顺序拼接的结果与render_markdown()一次渲染完全相同。
+    """
+
+    def __init__(self):
+        # 已经完整但暂不能渲染的行，以及最后一行未完成的部分
+        self._held: List[str] = []
+        self._held_length = 0
+        self._partial = ""
+        self._in_fence = False
+
+    @property
+    def pending_length(self) -> int:
+        """尚未渲染的字符数"""
+        return self._held_length + len(self._partial)
+
+    def feed(self, chunk: str) -> str:
+        """输入一段文本，返回新渲染部分的HTML"""
+        if not chunk:
+            return ""
+        if "\n" not in chunk:
+            self._partial += chunk
+            return ""
+        text = self._partial + chunk
+        end = text.rfind("\n") + 1
+        lines, self._partial = text[:end], text[end:]
+
+        safe = 0
+        position = 0
+        while position < end:
+            line_end = lines.index("\n", position)
+            line = lines[position:line_end]
+            if self._in_fence:
+                if _FENCE_CLOSE_LINE.fullmatch(line):
+                    self._in_fence = False
+            elif _FENCE_LINE.match(line):
+                self._in_fence = True
+            elif not line.strip() or not _BLOCK_LINE.match(line):
+                safe = line_end + 1
+            position = line_end + 1
+
+        if not safe:
+            self._held.append(lines)
+            self._held_length += end
+            return ""
+        self._held.append(lines[:safe])
+        segment = "".join(self._held)
+        self._held = [lines[safe:]] if safe < end else []
+        self._held_length = end - safe
+        return render_markdown(segment)
+
+    def close(self) -> str:
+        """结束输入，返回剩余内容的HTML"""
+        self._held.append(self._partial)
+        html = render_markdown("".join(self._held))
+        self._held = []
+        self._held_length = 0
+        self._partial = ""
+        self._in_fence = False
+        return html
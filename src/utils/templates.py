@@ -0,0 +1,91 @@
+"""
+HTML模板工具
+预编译模板（加载时切分占位符，渲染时只做一次拼接，默认HTML转义）和带内容哈希的静态资源
+"""
+
+import hashlib
+import os
+import re
+from html import escape
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.compression import SUPPORTED_ENCODINGS, choose_encoding, compress
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*(\|\s*safe\s*)?\}\}")
+
+
+class Markup(str):
+    """已经是安全HTML的字符串，作为模板变量时不再转义"""
+
+
+class Template:
+    """预编译的HTML模板
+
+    {{ name }} 的值渲染时做HTML转义，{{ name|safe }} 或Markup类型的值原样输出。
+    compact为True时去掉每行首尾的空白（模板中不要包含<pre>、<textarea>）。
+    """
+
+    def __init__(self, source: str, compact: bool = True):
+        if compact:
+            source = "\n".join(line.strip() for line in source.strip().splitlines() if line.strip())
+        self._literals: List[str] = []
+        self._fields: List[Tuple[str, bool]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            self._literals.append(source[position:match.start()])
+            self._fields.append((match.group(1), match.group(2) is not None))
+            position = match.end()
+        self._literals.append(source[position:])
+
+    @property
+    def fields(self) -> List[str]:
+        """模板中的变量名"""
+        return [name for name, _ in self._fields]
+
+    def render(self, **context: Any) -> Markup:
+        """用context中的值填充模板"""
+        literals = self._literals
+        parts = [literals[0]]
+        for index, (name, safe) in enumerate(self._fields):
+            value = context[name]
+            if value is None:
+                value = ""
+            elif not (safe or isinstance(value, Markup)):
+                value = escape(str(value))
+            parts.append(value if isinstance(value, str) else str(value))
+            parts.append(literals[index + 1])
+        return Markup("".join(parts))
+
+
+def minify_css(css: str) -> str:
+    """去掉CSS中的缩进和空行"""
+    return "\n".join(line.strip() for line in css.strip().splitlines() if line.strip())
+
+
+class StaticAsset:
+    """启动时生成的静态内容
+
+    原始内容和各种编码（gzip，安装brotli时还有br）的压缩结果只计算一次；
+    URL中带内容哈希，内容变化时URL随之变化，因此可以设置很长的缓存时间。
+    """
+
+    def __init__(self, name: str, content: str, media_type: str):
+        self.media_type = media_type
+        self.body = content.encode("utf-8")
+        self.encoded: Dict[str, bytes] = {
+            encoding: compress(self.body, encoding) for encoding in SUPPORTED_ENCODINGS
+        }
+        self.digest = hashlib.sha256(self.body).hexdigest()[:16]
+        self.etag = f'"{self.digest}"'
+        stem, extension = os.path.splitext(name)
+        self.url = f"/static/{stem}.{self.digest}{extension}"
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str], str]:
+        """按客户端的Accept-Encoding选择 (内容, Content-Encoding, ETag)
+
+        不同编码的内容是不同的表示，各自使用带编码后缀的强ETag。
+        """
+        encoding = choose_encoding(accept_encoding, list(self.encoded))
+        if encoding is None:
+            return self.body, None, self.etag
+        return self.encoded[encoding], encoding, f'"{self.digest}-{encoding}"'
@@ -0,0 +1,9 @@
+"""
+测试配置
+把项目根目录加入模块搜索路径，直接运行 pytest 即可导入 src 包
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,130 @@
+"""
+ResponseCache 测试：TTL过期、LRU淘汰、字节容量和条件请求重新验证
+"""
+
+import pytest
+
+from src import cache as cache_module
+from src.cache import ResponseCache
+
+
+class FakeClock:
+    """可手动推进的单调时钟"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake)
+    return fake
+
+
+def test_get_returns_value_until_ttl_expires(clock):
+    cache = ResponseCache(ttl=10, max_entries=10, max_bytes=1024)
+    cache.set("a", {"x": 1}, size=10)
+
+    clock.now += 9.9
+    assert cache.get("a") == {"x": 1}
+
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = ResponseCache(ttl=10, max_entries=10, max_bytes=1024)
+    cache.set("short", 1, size=1, ttl=1)
+    cache.set("long", 2, size=1, ttl=100)
+
+    clock.now += 50
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_lru_evicts_least_recently_used_entry(clock):
+    cache = ResponseCache(ttl=60, max_entries=2, max_bytes=1024)
+    cache.set("a", 1, size=1)
+    cache.set("b", 2, size=1)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3, size=1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_byte_limit_evicts_and_skips_oversized_entries(clock):
+    cache = ResponseCache(ttl=60, max_entries=100, max_bytes=100)
+    cache.set("a", 1, size=60)
+    cache.set("b", 2, size=60)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 60
+
+    cache.set("huge", 3, size=101)
+    assert cache.get("huge") is None
+    assert cache.get("b") == 2
+
+
+def test_overwrite_replaces_size_accounting(clock):
+    cache = ResponseCache(ttl=60, max_entries=10, max_bytes=1024)
+    cache.set("a", 1, size=100)
+    cache.set("a", 2, size=30)
+    assert cache.stats()["bytes"] == 30
+    assert cache.get("a") == 2
+
+
+def test_disabled_cache_stores_nothing(clock):
+    cache = ResponseCache(ttl=0, max_entries=10, max_bytes=1024)
+    cache.set("a", 1, size=1)
+    assert not cache.enabled
+    assert cache.get("a") is None
+
+
+def test_expired_entry_with_validator_is_kept_for_revalidation(clock):
+    cache = ResponseCache(ttl=10, max_entries=10, max_bytes=1024)
+    cache.set("a", {"x": 1}, size=10, etag='"v1"')
+    assert cache.get_stale("a") is None
+
+    clock.now += 11
+    assert cache.get("a") is None
+    stale = cache.get_stale("a")
+    assert stale is not None
+    assert stale.conditional_headers() == {"If-None-Match": '"v1"'}
+
+    entry = cache.refresh("a")
+    assert entry is stale
+    assert cache.get("a") == {"x": 1}
+    assert cache.revalidations == 1
+
+    clock.now += 11
+    assert cache.get("a") is None
+
+
+def test_expired_entry_without_validator_is_dropped(clock):
+    cache = ResponseCache(ttl=10, max_entries=10, max_bytes=1024)
+    cache.set("a", 1, size=1)
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.get_stale("a") is None
+    assert cache.refresh("a") is None
+
+
+def test_record_miss_false_skips_miss_count(clock):
+    cache = ResponseCache(ttl=10, max_entries=10, max_bytes=1024)
+    assert cache.get("missing", record_miss=False) is None
+    assert cache.misses == 0
+
+
+def test_make_key_normalizes_params():
+    key = ResponseCache.make_key("get", "/search/repositories", {"q": "  fast   api ", "page": 1, "x": None})
+    assert key == ResponseCache.make_key("GET", "search/repositories", {"page": "1", "q": "fast api"})
+    assert key != ResponseCache.make_key("GET", "search/repositories", {"q": "fast api", "page": 2})
@@ -0,0 +1,61 @@
+"""
+CompletionCache 测试：精确匹配、上下文隔离和相似复用的实体保护
+"""
+
+import pytest
+
+from src.completion_cache import CompletionCache, entity_tokens
+
+
+def ask(cache: CompletionCache, prompt: str, history=()):
+    return cache.get([*history, {"role": "user", "content": prompt}], None, {"model": "m"})
+
+
+def remember(cache: CompletionCache, prompt: str, answer: str, history=()):
+    cache.set([*history, {"role": "user", "content": prompt}], None, {"model": "m"}, answer)
+
+
+@pytest.fixture
+def cache():
+    return CompletionCache(ttl=60, max_entries=32, similarity_threshold=0.8)
+
+
+def test_exact_match_ignores_whitespace_only():
+    cache = CompletionCache(ttl=60, max_entries=8, similarity_threshold=0)
+    remember(cache, "Find  Python  web frameworks", "answer")
+    assert ask(cache, " Find Python web frameworks ") == ("answer", "exact")
+    assert ask(cache, "Find Python web framework") == (None, None)
+    # 模型参数不同不能复用
+    assert cache.get([{"role": "user", "content": "Find Python web frameworks"}], None, {"model": "x"}) == (None, None)
+
+
+def test_similar_prompt_reuses_answer(cache):
+    remember(cache, "How many stars does facebook/react have?", "react answer")
+    assert ask(cache, "how many stars does Facebook/React have") == ("react answer", "similar")
+
+
+@pytest.mark.parametrize("threshold", [0.8, 0.9, 0.95])
+@pytest.mark.parametrize("cached, prompt", [
+    ("How many stars does facebook/react have?", "How many stars does facebook/redux have?"),
+    ("How many stars does facebook/react have?", "How many stars does facebook/reacts have?"),
+    ("Find popular Python web frameworks", "Find unpopular Python web frameworks"),
+    ("Tell me about the repository tensorflow/tensorflow", "Tell me about the repository tensorflow/tensorboard"),
+    ("Show issues opened in 2023 for vuejs/core", "Show issues opened in 2024 for vuejs/core"),
+])
+def test_similar_prompt_with_different_entity_misses(threshold, cached, prompt):
+    cache = CompletionCache(ttl=60, max_entries=8, similarity_threshold=threshold)
+    remember(cache, cached, "cached answer")
+    assert ask(cache, prompt) == (None, None)
+
+
+def test_similar_match_requires_same_context(cache):
+    history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+    remember(cache, "How many stars does facebook/react have?", "answer", history)
+    assert ask(cache, "How many stars does facebook/react have") == (None, None)
+    assert ask(cache, "How many stars does facebook/react have", history) == ("answer", "similar")
+
+
+def test_entity_tokens():
+    assert entity_tokens("Compare Facebook/React and vuejs/core.") == {"facebook/react", "vuejs/core"}
+    assert entity_tokens("top 10 repos for node.js and fastAPI_utils") == {"10", "node.js", "fastapi_utils"}
+    assert entity_tokens("find popular frameworks") == frozenset()
@@ -0,0 +1,76 @@
+"""
+DiskCache 测试：读写往返、重启后保留、过期清理和容量淘汰
+"""
+
+import json
+import random
+import time
+
+from src.disk_cache import DiskCache
+
+
+def make_cache(tmp_path, **kwargs) -> DiskCache:
+    options = {"max_bytes": 1 << 20, "sweep_interval": 0, "stale_ttl": 60}
+    options.update(kwargs)
+    return DiskCache(path=str(tmp_path / "cache.db"), **options)
+
+
+def test_round_trip_survives_reopen(tmp_path):
+    body = json.dumps({"full_name": "o/r", "stargazers_count": 5}).encode("utf-8")
+    cache = make_cache(tmp_path)
+    cache.set_sync("key", body, ttl=60, etag='"v1"', links={"next": "https://example.com?page=2"})
+    cache._conn.close()
+
+    reopened = make_cache(tmp_path)
+    entry = reopened.get_sync("key")
+    assert entry.value == {"full_name": "o/r", "stargazers_count": 5}
+    assert entry.size == len(body)
+    assert entry.etag == '"v1"'
+    assert entry.links == {"next": "https://example.com?page=2"}
+    assert 55 < entry.ttl_left() <= 60
+    assert reopened.get_sync("missing") is None
+    assert (reopened.hits, reopened.misses) == (1, 1)
+
+
+def test_touch_extends_expiry(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set_sync("key", b"{}", ttl=-10, etag='"v1"')
+    assert cache.get_sync("key").ttl_left() < 0
+    cache.touch_sync("key", 60)
+    assert cache.get_sync("key").ttl_left() > 55
+
+
+def test_sweep_keeps_revalidatable_entries_for_stale_ttl(tmp_path):
+    cache = make_cache(tmp_path, stale_ttl=60)
+    cache.set_sync("plain", b"{}", ttl=-1)
+    cache.set_sync("etag", b"{}", ttl=-1, etag='"v1"')
+    cache.set_sync("old-etag", b"{}", ttl=-120, etag='"v1"')
+    cache.set_sync("fresh", b"{}", ttl=60)
+
+    assert cache.sweep_sync() == 2
+    assert cache.get_sync("plain") is None
+    assert cache.get_sync("old-etag") is None
+    assert cache.get_sync("etag") is not None
+    assert cache.get_sync("fresh") is not None
+
+
+def test_sweep_evicts_least_recently_accessed_over_capacity(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, max_bytes=1500)
+    # 随机内容压缩后约600字节，三条超出容量，淘汰一条后满足
+    body = json.dumps(random.Random(0).randbytes(600).hex()).encode("utf-8")
+    clock = [time.time()]
+    monkeypatch.setattr("src.disk_cache.time.time", lambda: clock[0])
+    for key in ("a", "b", "c"):
+        clock[0] += 1
+        cache.set_sync(key, body, ttl=3600)
+    clock[0] += 1
+    cache.get_sync("a")
+
+    assert cache.sweep_sync() == 1
+    assert cache.get_sync("b") is None
+    assert cache.get_sync("a") is not None
+    assert cache.get_sync("c") is not None
+
+
+def test_disabled_without_path():
+    assert not DiskCache(path="").enabled
@@ -0,0 +1,90 @@
+"""
+JSON API工具测试：fields解析、字段投影、游标往返和查询条件绑定
+"""
+
+import json
+
+import pytest
+
+from src.json_api import (
+    BadRequestError, decode_cursor, dumps, encode_cursor, parse_fields, project, top_level_fields
+)
+
+REPO = {
+    "full_name": "o/r",
+    "stargazers_count": 5,
+    "owner": {"login": "o", "id": 1},
+    "license": None,
+    "topics": ["a", "b"],
+}
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields("  ") is None
+    assert parse_fields(" , ") is None
+    assert parse_fields("full_name, owner.login,") == [("full_name",), ("owner", "login")]
+
+
+@pytest.mark.parametrize("fields", ["a b", "owner..login", ".name", "name.", "a-b"])
+def test_parse_fields_rejects_invalid_names(fields):
+    with pytest.raises(BadRequestError):
+        parse_fields(fields)
+
+
+def test_top_level_fields():
+    assert top_level_fields(None) is None
+    assert top_level_fields(parse_fields("owner.login,owner.id,full_name")) == {"owner", "full_name"}
+
+
+def test_project_selects_top_level_and_nested_fields():
+    assert project(REPO, None) is REPO
+    assert project(REPO, parse_fields("full_name,owner.login")) == {"full_name": "o/r", "owner": {"login": "o"}}
+    assert project(REPO, parse_fields("owner.login,owner.id")) == {"owner": {"login": "o", "id": 1}}
+    assert project(REPO, parse_fields("owner")) == {"owner": {"login": "o", "id": 1}}
+
+
+def test_project_skips_missing_paths_but_keeps_null_values():
+    assert project(REPO, parse_fields("missing,owner.missing,license,license.key,topics.x")) == {"license": None}
+
+
+def test_cursor_round_trip():
+    scope = {"api": "search", "query": "python", "per_page": 10}
+    assert decode_cursor(None, scope) == 1
+    assert decode_cursor("", scope) == 1
+    for page in (1, 2, 99):
+        cursor = encode_cursor(scope, page)
+        assert "=" not in cursor
+        assert decode_cursor(cursor, dict(reversed(list(scope.items())))) == page
+
+
+def test_cursor_is_bound_to_its_query():
+    cursor = encode_cursor({"api": "search", "query": "python", "per_page": 10}, 2)
+    with pytest.raises(BadRequestError, match="does not match"):
+        decode_cursor(cursor, {"api": "search", "query": "rust", "per_page": 10})
+    with pytest.raises(BadRequestError, match="does not match"):
+        decode_cursor(cursor, {"api": "search", "query": "python", "per_page": 20})
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30", "eyJzIjoieCJ9", "bnVsbA"])
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(BadRequestError, match="Invalid cursor"):
+        decode_cursor(cursor, {"api": "search"})
+
+
+def test_page_below_one_is_rejected():
+    scope = {"api": "search"}
+    with pytest.raises(BadRequestError):
+        decode_cursor(encode_cursor(scope, 0), scope)
+
+
+def test_bad_request_is_not_a_value_error():
+    # 只有参数错误返回400，上游的JSONDecodeError等ValueError应当返回502
+    assert not issubclass(BadRequestError, ValueError)
+
+
+def test_dumps_is_compact_utf8_json():
+    body = dumps({"name": "仓库", "items": [1, 2]})
+    assert isinstance(body, bytes)
+    assert json.loads(body) == {"name": "仓库", "items": [1, 2]}
+    assert b" " not in body
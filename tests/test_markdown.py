@@ -0,0 +1,88 @@
+"""
+Markdown渲染测试：基本语法、HTML转义，以及流式渲染与一次渲染结果一致
+"""
+
+import random
+
+import pytest
+
+from src.utils.markdown import MarkdownRenderer, render_markdown
+
+DOCUMENTS = [
+    "plain text",
+    "line one\nline two\n\nparagraph",
+    "# Title\n\nSome **bold** and *em* and `code`.\n",
+    "## 推荐仓库\n1. **[fastapi](https://github.com/tiangolo/fastapi)** ⭐ 70k\n2. [flask](https://github.com/pallets/flask)\n\n总结",
+    "- a\n- b with *em*\n* c\n\nafter list\n- again",
+    "```python\nprint('<hi>')\n\n# not a heading\n```\ntext after",
+    "intro\n```\nunclosed fence\n- not a list",
+    "text <script>alert(1)</script> & [x](javascript:alert(1))",
+    "### Heading\n\n\n- item\n\n1) one\n2) two\ntrailing line without newline",
+    "**bold [link](https://a.b/c_(d))** and **bold with *nested em***",
+    "\n\nleading blank lines\n#not heading\n####### seven",
+]
+
+
+def stream(chunks):
+    renderer = MarkdownRenderer()
+    parts = [renderer.feed(chunk) for chunk in chunks]
+    parts.append(renderer.close())
+    return "".join(parts)
+
+
+def test_renders_basic_markdown():
+    assert render_markdown("# Title") == "<h1><strong>Title</strong></h1>"
+    assert render_markdown("**a** *b* `c`") == "<strong>a</strong> <em>b</em> <code>c</code>"
+    assert render_markdown("- a\n- b") == "<ul><li>a</li><li>b</li></ul>"
+    assert render_markdown("1. a\n2. b") == "<ol><li>a</li><li>b</li></ol>"
+    assert render_markdown("a\nb") == "a<br>b"
+    assert render_markdown("") == ""
+    assert render_markdown(None) == ""
+
+
+def test_escapes_html_and_drops_unsafe_links():
+    html = render_markdown("<b>x</b> [click](javascript:alert(1)) [ok](https://github.com)")
+    assert "<b>" not in html
+    assert "&lt;b&gt;x&lt;/b&gt;" in html
+    assert "javascript:" not in html
+    assert '<a href="https://github.com" target="_blank" rel="noopener">ok</a>' in html
+
+
+def test_code_block_keeps_content_literal():
+    html = render_markdown("```py\n**not bold**\n<tag>\n```")
+    assert html == '<pre><code class="language-py">**not bold**&#10;&lt;tag&gt;</code></pre>'
+
+
+@pytest.mark.parametrize("text", DOCUMENTS)
+def test_stream_matches_render_for_every_split_point(text):
+    expected = render_markdown(text)
+    assert stream([text]) == expected
+    for index in range(len(text) + 1):
+        assert stream([text[:index], text[index:]]) == expected, index
+
+
+@pytest.mark.parametrize("text", DOCUMENTS)
+def test_stream_matches_render_char_by_char(text):
+    assert stream(list(text)) == render_markdown(text)
+
+
+def test_stream_matches_render_for_random_chunks():
+    rng = random.Random(0)
+    text = "\n".join(DOCUMENTS)
+    expected = render_markdown(text)
+    for _ in range(200):
+        chunks, position = [], 0
+        while position < len(text):
+            size = rng.randint(1, 12)
+            chunks.append(text[position:position + size])
+            position += size
+        assert stream(chunks) == expected
+
+
+def test_pending_length_and_close_reset():
+    renderer = MarkdownRenderer()
+    assert renderer.feed("- item") == ""
+    assert renderer.pending_length == len("- item")
+    renderer.close()
+    assert renderer.pending_length == 0
+    assert renderer.feed("plain\n") == render_markdown("plain\n")
@@ -0,0 +1,169 @@
+"""
+紧凑记录测试：解析、原始数据往返、嵌套字段投影、JSON序列化和内存估算
+"""
+
+import json
+import sys
+import tracemalloc
+
+from src.json_api import dumps, parse_fields, project, project_many
+from src.models import (
+    License, RawStore, Repository, User, json_default, parse_payload, payload_size, raw_many
+)
+
+
+def make_repo(index: int) -> dict:
+    return {
+        "id": index,
+        "node_id": f"R_{index}",
+        "name": f"r{index}",
+        "full_name": f"o/r{index}",
+        "owner": {"login": "o", "id": 1, "node_id": "U_1", "site_admin": False},
+        "description": None,
+        "topics": ["python", "web"],
+        "stargazers_count": index * 10,
+        "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT", "url": "https://x"},
+        "fork": False,
+        "clone_url": f"https://github.com/o/r{index}.git",
+    }
+
+
+def test_record_behaves_like_a_read_only_mapping():
+    repo = Repository.parse(make_repo(1))
+    assert repo["full_name"] == "o/r1"
+    assert repo.get("description") is None
+    assert "description" in repo
+    # 原始数据中不存在的字段和非紧凑字段都不存在
+    assert "homepage" not in repo
+    assert "clone_url" not in repo
+    assert repo.get("clone_url", "x") == "x"
+    assert repo["topics"] == ("python", "web")
+    assert isinstance(repo["owner"], User)
+    assert isinstance(repo["license"], License)
+    assert repo["owner"]["login"] == "o"
+    assert set(repo) == {"id", "name", "full_name", "owner", "description", "topics",
+                         "stargazers_count", "license", "fork"}
+    assert len(repo) == 9
+
+
+def test_to_dict_contains_only_compact_fields():
+    data = Repository.parse(make_repo(1)).to_dict()
+    assert data["topics"] == ["python", "web"]
+    assert data["owner"] == {"login": "o", "id": 1}
+    assert "clone_url" not in data
+    json.dumps(data)
+
+
+def test_raw_round_trips_original_data():
+    items = [make_repo(index) for index in range(5)]
+    records = Repository.parse_many(items)
+    assert [record.raw for record in records] == items
+    assert raw_many(records) == items
+    # 同一响应的记录共享一个RawStore
+    assert len({id(record._raw[0]) for record in records}) == 1
+
+
+def test_parse_many_keeps_none_and_existing_records():
+    existing = Repository.parse(make_repo(9))
+    records = Repository.parse_many([None, make_repo(1), existing])
+    assert records[0] is None
+    assert records[2] is existing
+    assert records[1].raw == make_repo(1)
+    assert Repository.parse(None) is None
+
+
+def test_record_without_raw_falls_back_to_compact_fields():
+    record = User({"login": "u", "followers": 3})
+    assert record.raw == {"login": "u", "followers": 3}
+    assert raw_many([record]) == [{"login": "u", "followers": 3}]
+
+
+def test_raw_store_compresses_and_inflates():
+    data = json.dumps([make_repo(index) for index in range(20)]).encode("utf-8")
+    store = RawStore(data)
+    assert store.inflate() == data
+    assert len(store) < len(data)
+    assert store.share(len(data)) == sys.getsizeof(store._data)
+    assert store.share(len(data) // 2) <= sys.getsizeof(store._data) // 2
+
+
+def test_covers_checks_every_path_segment():
+    assert Repository.covers(parse_fields("full_name,stargazers_count"))
+    assert Repository.covers(parse_fields("owner.login,license.spdx_id"))
+    assert not Repository.covers(None)
+    assert not Repository.covers(parse_fields("clone_url"))
+    assert not Repository.covers(parse_fields("owner.node_id"))
+    assert not Repository.covers(parse_fields("owner"))
+    assert not Repository.covers(parse_fields("full_name.x"))
+    assert not Repository.covers(parse_fields("owner.login.x"))
+
+
+def test_project_reads_nested_and_whole_objects_from_raw():
+    repo = Repository.parse(make_repo(1))
+    assert project(repo, parse_fields("owner.node_id,full_name")) == {
+        "owner": {"node_id": "U_1"}, "full_name": "o/r1"
+    }
+    assert project(repo, parse_fields("owner")) == {"owner": make_repo(1)["owner"]}
+    assert project(repo, parse_fields("owner.login,license.spdx_id")) == {
+        "owner": {"login": "o"}, "license": {"spdx_id": "MIT"}
+    }
+    assert project(repo, None) == make_repo(1)
+
+
+def test_project_many_matches_project():
+    records = Repository.parse_many([make_repo(index) for index in range(3)])
+    for fields in (None, parse_fields("full_name"), parse_fields("owner.node_id,clone_url")):
+        assert project_many(records, fields) == [project(record, fields) for record in records]
+
+
+def test_records_serialize_to_raw_data():
+    repo = Repository.parse(make_repo(1))
+    assert json.loads(json.dumps(repo, default=json_default)) == make_repo(1)
+    assert json.loads(dumps({"items": [repo]})) == {"items": [make_repo(1)]}
+
+
+def test_parse_payload_by_endpoint():
+    search = parse_payload("search/repositories", {"total_count": 1, "items": [make_repo(1)]})
+    assert search["total_count"] == 1
+    assert isinstance(search["items"][0], Repository)
+    assert isinstance(parse_payload("/repos/o/r1", make_repo(1)), Repository)
+    assert isinstance(parse_payload("users/o", {"login": "o"}), User)
+    assert isinstance(parse_payload("search/users", {"items": [{"login": "o"}]})["items"][0], User)
+    issues = [{"id": 1}]
+    assert parse_payload("repos/o/r/issues", issues) is issues
+    assert parse_payload("rate_limit", {"rate": {}}) == {"rate": {}}
+
+
+def test_footprint_counts_fields_and_raw_share():
+    items = [make_repo(index) for index in range(50)]
+    body = json.dumps({"items": items}).encode("utf-8")
+    payload = parse_payload("search/repositories", json.loads(body))
+    record = payload["items"][0]
+
+    store, start, end = record._raw
+    assert record.footprint() > store.share(end - start) > 0
+    assert record.footprint() > User.parse(items[0]["owner"]).footprint()
+
+    size = payload_size(payload, len(body))
+    assert size == (sys.getsizeof(payload) + sys.getsizeof(payload["items"])
+                    + sum(item.footprint() for item in payload["items"]))
+
+
+def test_payload_size_tracks_retained_memory():
+    # 缓存按payload_size计算容量，应当接近解析结果实际占用的内存，而不是响应体大小
+    body = json.dumps({"items": [make_repo(index) for index in range(200)]}).encode("utf-8")
+    tracemalloc.start()
+    try:
+        payload = parse_payload("search/repositories", json.loads(body))
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert 0.5 * retained < payload_size(payload, len(body)) < 1.5 * retained
+
+
+def test_payload_size_falls_back_for_plain_data():
+    assert payload_size({"rate": {}}, 123) == 123
+    assert payload_size([1, 2], 7) == 7
+    assert payload_size({"items": [{"id": 1}]}, 9) == 9
+    record = Repository.parse(make_repo(1))
+    assert payload_size(record, 0) == record.footprint()
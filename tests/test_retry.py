@@ -0,0 +1,73 @@
+"""
+RetryPolicy 测试：指数退避上限、Retry-After、幂等判断和整体截止时间
+"""
+
+import time
+from email.utils import formatdate
+
+import pytest
+
+from src import retry as retry_module
+from src.retry import RetryPolicy, parse_retry_after
+
+
+@pytest.fixture
+def max_jitter(monkeypatch):
+    """random.uniform总是取上限，便于检查退避的最大值"""
+    monkeypatch.setattr(retry_module.random, "uniform", lambda low, high: high)
+
+
+def test_backoff_doubles_up_to_max_delay(max_jitter):
+    policy = RetryPolicy(max_attempts=10, base_delay=0.5, max_delay=3.0)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_backoff_uses_full_jitter(monkeypatch):
+    bounds = []
+    monkeypatch.setattr(retry_module.random, "uniform", lambda low, high: bounds.append((low, high)) or low)
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=10.0)
+    assert policy.backoff(3) == 0
+    assert bounds == [(0, 4.0)]
+
+
+def test_retry_after_takes_precedence_over_backoff(max_jitter):
+    policy = RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=1.0)
+    # Retry-After之外只加不超过base_delay的抖动，不受max_delay限制
+    assert policy.backoff(1, retry_after=30) == 30.5
+
+
+def test_next_delay_stops_after_max_attempts(max_jitter):
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, max_delay=1.0)
+    assert policy.next_delay("GET", 1, None, time_left=60) == 0.1
+    assert policy.next_delay("GET", 2, None, time_left=60) == 0.2
+    assert policy.next_delay("GET", 3, None, time_left=60) is None
+
+
+def test_next_delay_only_retries_idempotent_requests(max_jitter):
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, max_delay=1.0)
+    assert policy.next_delay("post", 1, None, time_left=60) is None
+    assert policy.next_delay("head", 1, None, time_left=60) == 0.1
+    # 只读的GraphQL POST可以显式标记为幂等
+    assert policy.next_delay("POST", 1, None, time_left=60, idempotent=True) == 0.1
+
+
+def test_next_delay_respects_deadline(max_jitter):
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, max_delay=1.0)
+    assert policy.next_delay("GET", 1, retry_after=5, time_left=5) is None
+    assert policy.next_delay("GET", 1, retry_after=5, time_left=6) == 5.1
+
+
+def test_max_attempts_is_at_least_one():
+    assert RetryPolicy(max_attempts=0).max_attempts == 1
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 1.5 ") == 1.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    delay = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+    assert 55 <= delay <= 60
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0.0
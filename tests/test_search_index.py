@@ -0,0 +1,109 @@
+"""
+SearchIndex 测试：查询解析、限定条件、BM25排序、增量更新和持久化
+"""
+
+import asyncio
+
+import pytest
+
+from src.config import config
+from src.search_index import SearchIndex, parse_query, tokenize
+
+
+@pytest.fixture(autouse=True)
+def enable_index(monkeypatch):
+    monkeypatch.setattr(config, "SEARCH_INDEX_ENABLED", True)
+
+
+def repo(full_name: str, stars: int = 0, **fields) -> dict:
+    return {"full_name": full_name, "name": full_name.split("/")[1], "stargazers_count": stars, **fields}
+
+
+def test_tokenize_splits_identifiers_and_cjk():
+    assert tokenize("FastAPI web_framework-for Python 机器") == [
+        "fast", "api", "web", "framework", "for", "python", "机", "器"
+    ]
+
+
+@pytest.mark.parametrize("query", [
+    "flask -django", "flask NOT django", "flask OR django", "(flask)", "flask user:pallets",
+    "flask stars:abc", "flask -language:go",
+])
+def test_parse_query_rejects_unsupported_syntax(query):
+    assert parse_query(query) is None
+
+
+def test_qualifiers_filter_documents():
+    index = SearchIndex(path="", max_docs=100)
+    index.add([
+        repo("a/web-one", 50, language="Python", pushed_at="2026-01-02T00:00:00Z", topics=["web"]),
+        repo("b/web-two", 500, language="Go", pushed_at="2025-01-02T00:00:00Z", topics=["web"]),
+        repo("c/web-three", 5000, language="Python", pushed_at="2026-05-02T00:00:00Z"),
+    ])
+    names = lambda query: [doc["full_name"] for doc in index.search(query, limit=1) or []]
+    assert names("web language:python stars:>100") == ["c/web-three"]
+    assert names("web stars:10..100") == ["a/web-one"]
+    assert names("web pushed:<2026-01-01") == ["b/web-two"]
+    assert names("topic:web language:go") == ["b/web-two"]
+    assert index.search("web stars:>10000", limit=1) is None
+
+
+def test_best_match_ranks_by_field_weighted_bm25():
+    index = SearchIndex(path="", max_docs=100)
+    index.add([
+        repo("a/misc", 900, description="a small flask helper"),
+        repo("b/flask", 1),
+        repo("c/tools", 10, topics=["flask"]),
+        repo("d/other", 5000, description="unrelated"),
+    ])
+    ranked = [doc["full_name"] for doc in index.search("flask", sort=None, limit=3)]
+    assert ranked == ["b/flask", "c/tools", "a/misc"]
+    by_stars = [doc["full_name"] for doc in index.search("flask", sort="stars", limit=3)]
+    assert by_stars == ["a/misc", "c/tools", "b/flask"]
+
+
+def test_too_few_matches_fall_back_to_github():
+    index = SearchIndex(path="", max_docs=100)
+    index.add([repo("a/flask"), repo("b/flask-login")])
+    assert index.search("flask", limit=3) is None
+    assert len(index.search("flask", limit=2)) == 2
+    assert (index.hits, index.misses) == (1, 1)
+
+
+def test_readding_a_repository_replaces_its_postings():
+    index = SearchIndex(path="", max_docs=100)
+    index.add([repo("a/x", description="flask")])
+    index.add([repo("a/x", description="django")])
+    assert index.search("flask", limit=1) is None
+    assert index.search("django", limit=1)[0]["full_name"] == "a/x"
+    assert index.stats()["documents"] == 1
+
+
+def test_oldest_documents_are_evicted_over_capacity():
+    index = SearchIndex(path="", max_docs=2)
+    index.add([repo("a/one", 1), repo("a/two", 2), repo("a/three", 3)])
+    assert [doc["full_name"] for doc in index.search("", limit=2, sort="stars")] == ["a/three", "a/two"]
+    assert index.search("one", limit=1) is None
+    assert index._total_length == sum(index._doc_lengths.values())
+
+
+def test_saved_index_answers_queries_after_restart(tmp_path):
+    path = str(tmp_path / "index.json.gz")
+
+    async def main():
+        index = SearchIndex(path=path, max_docs=100)
+        index.add([repo(f"o/web{i}", i, description="web framework") for i in range(5)])
+        await index.save()
+
+        reloaded = SearchIndex(path=path, max_docs=100)
+        reloaded.search("web", limit=1)
+        # 在事件循环中加载放在线程里执行，save()会等待加载完成
+        await reloaded.save()
+        return reloaded
+
+    reloaded = asyncio.run(main())
+    assert len(reloaded) == 5
+    assert [doc["full_name"] for doc in reloaded.search("web framework", limit=2)] == ["o/web4", "o/web3"]
+
+    synchronous = SearchIndex(path=path, max_docs=100)
+    assert len(synchronous.search("web", sort=None, limit=5)) == 5
@@ -0,0 +1,121 @@
+"""
+SingleFlight 测试：并发合并、异常共享、取消隔离和完成后重新执行
+"""
+
+import asyncio
+
+import pytest
+
+from src.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"value": calls}
+
+        waiters = [asyncio.create_task(flight.do("key", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flight.in_flight() == 1
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+        assert (flight.leaders, flight.coalesced) == (1, 4)
+        assert flight.in_flight() == 0
+        assert flight.stats()["top_keys"] == [{"key": "key", "leaders": 1, "coalesced": 4, "max_waiters": 5}]
+
+    asyncio.run(main())
+
+
+def test_different_keys_run_separately():
+    async def main():
+        flight = SingleFlight()
+
+        async def fetch(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(flight.do("a", lambda: fetch(1)), flight.do("b", lambda: fetch(2)))
+        assert results == [1, 2]
+        assert flight.leaders == 2
+
+    asyncio.run(main())
+
+
+def test_exception_is_delivered_to_every_waiter():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fail():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(*[flight.do("key", fail) for _ in range(3)], return_exceptions=True)
+        assert calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    async def main():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        release.set()
+        assert await second == "done"
+
+    asyncio.run(main())
+
+
+def test_completed_call_is_not_reused():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("key", fetch) == 1
+        assert await flight.do("key", fetch) == 2
+
+    asyncio.run(main())
+
+
+def test_tracked_key_stats_are_bounded():
+    async def main():
+        flight = SingleFlight(max_tracked_keys=3)
+
+        async def fetch():
+            return None
+
+        for index in range(10):
+            await flight.do(f"key{index}", fetch)
+        assert len(flight._key_stats) == 3
+
+    asyncio.run(main())